@@ -0,0 +1,301 @@
+"""
+/api/chat 진입 제어.
+
+한 판매자의 요청이 몰려도 다른 판매자의 요청이 밀리지 않도록 stream_chat 앞에서 동시 처리 수를
+제한한다.
+
+- 전체 동시 처리 수와 판매자별 동시 처리 수 상한
+- 상한을 넘은 요청은 대기열에서 가중 공정 큐잉(WFQ)으로 순서를 정한다. 판매자마다 직전 요청의
+  가상 종료 시각에 1/weight를 더한 태그를 붙이고, 태그가 작은 요청부터 처리한다. 그래서 한 판매자가
+  요청을 여러 개 넣어도 다른 판매자의 요청이 그 사이사이에 처리된다.
+- 대기열(전체/판매자별)이 가득 차면 기다리게 하지 않고 바로 거절(429)한다.
+
+OpenAI rate limit은 응답 헤더(x-ratelimit-*)로 동기화하는 토큰 버킷(OpenAIRateLimiter)으로
+지키며, LLM 요청 직전마다 확인한다.
+"""
+
+import asyncio
+import re
+import time
+import weakref
+from collections import Counter
+from collections.abc import AsyncGenerator, AsyncIterator, Mapping
+
+from app.chat.sse import ChatEvent
+from app.shared.config import settings
+from app.shared.metrics import observe
+
+
+class AdmissionRejected(Exception):
+    """대기열이 가득 차 요청을 받을 수 없다."""
+
+
+class Ticket:
+    """진입 제어를 통과했거나 대기 중인 요청 하나."""
+
+    def __init__(self, controller: "AdmissionController", seller_id: int, finish_tag: float):
+        self.seller_id = seller_id
+        self.finish_tag = finish_tag
+        self.granted = False
+        self.released = False
+        self.enqueued_at = time.perf_counter()
+        self._controller = controller
+        self._changed = asyncio.Event()
+
+    @property
+    def position(self) -> int:
+        """대기열에서의 순번 (1부터). 처리 중이면 0."""
+        return self._controller._position(self)
+
+    async def wait(self) -> AsyncIterator[int]:
+        """처리 차례가 될 때까지 기다리며, 대기 순번이 바뀔 때마다 순번을 내보낸다."""
+        last = None
+        while True:
+            # 상태를 읽기 전에 비워야 yield로 멈춰 있는 동안 온 알림(자리 배정 포함)을 놓치지 않는다
+            self._changed.clear()
+            if self.granted:
+                return
+            position = self.position
+            if position != last:
+                yield position
+                last = position
+                continue
+            await self._changed.wait()
+
+    def release(self) -> None:
+        """처리를 마쳤거나 대기를 포기했다. 여러 번 호출해도 된다."""
+        if not self.released:
+            self.released = True
+            self._controller._release(self)
+
+    def _notify(self) -> None:
+        self._changed.set()
+
+
+class AdmissionController:
+    def __init__(
+        self,
+        max_concurrent: int,
+        max_concurrent_per_seller: int,
+        max_queue: int,
+        max_queue_per_seller: int,
+        weights: Mapping[int, float] | None = None,
+    ):
+        self.max_concurrent = max_concurrent
+        self.max_concurrent_per_seller = max_concurrent_per_seller
+        self.max_queue = max_queue
+        self.max_queue_per_seller = max_queue_per_seller
+        self._weights = dict(weights or {})
+        self._running: Counter[int] = Counter()
+        self._queue: list[Ticket] = []
+        self._virtual_time = 0.0
+        self._last_finish: dict[int, float] = {}
+
+    @property
+    def running(self) -> int:
+        return sum(self._running.values())
+
+    @property
+    def queued(self) -> int:
+        return len(self._queue)
+
+    def enqueue(self, seller_id: int) -> Ticket:
+        """바로 처리할 수 있으면 처리 중 티켓을, 아니면 대기 티켓을 반환한다.
+
+        Raises:
+            AdmissionRejected: 대기열(전체 또는 판매자별)이 가득 찬 경우
+        """
+        if self._has_capacity(seller_id):
+            ticket = Ticket(self, seller_id, self._virtual_time)
+            self._grant(ticket)
+            return ticket
+
+        if len(self._queue) >= self.max_queue:
+            raise AdmissionRejected("요청이 많아 잠시 후 다시 시도해 주세요")
+        if sum(t.seller_id == seller_id for t in self._queue) >= self.max_queue_per_seller:
+            raise AdmissionRejected("처리 중인 요청이 많아 잠시 후 다시 시도해 주세요")
+
+        start = max(self._virtual_time, self._last_finish.get(seller_id, 0.0))
+        finish_tag = start + 1 / self._weights.get(seller_id, 1.0)
+        self._last_finish[seller_id] = finish_tag
+        ticket = Ticket(self, seller_id, finish_tag)
+        self._queue.append(ticket)
+        return ticket
+
+    def _has_capacity(self, seller_id: int) -> bool:
+        return (
+            self.running < self.max_concurrent
+            and self._running[seller_id] < self.max_concurrent_per_seller
+        )
+
+    def _grant(self, ticket: Ticket) -> None:
+        ticket.granted = True
+        self._running[ticket.seller_id] += 1
+
+    def _release(self, ticket: Ticket) -> None:
+        if ticket.granted:
+            self._running[ticket.seller_id] -= 1
+            if not self._running[ticket.seller_id]:
+                del self._running[ticket.seller_id]
+        else:
+            self._queue.remove(ticket)
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        """빈 자리에 태그가 가장 작은 대기 요청부터 넣고, 남은 대기 요청에 순번 변경을 알린다."""
+        while self._queue and self.running < self.max_concurrent:
+            eligible = [t for t in self._queue if self._has_capacity(t.seller_id)]
+            if not eligible:
+                break
+            ticket = min(eligible, key=lambda t: t.finish_tag)
+            self._queue.remove(ticket)
+            self._virtual_time = max(self._virtual_time, ticket.finish_tag)
+            self._grant(ticket)
+            ticket._notify()
+
+        # 가상 시각이 지난 판매자 기록은 더 이상 태그 계산에 영향을 주지 않는다
+        self._last_finish = {
+            seller_id: finish
+            for seller_id, finish in self._last_finish.items()
+            if finish > self._virtual_time
+        }
+        for ticket in self._queue:
+            ticket._notify()
+
+    def _position(self, ticket: Ticket) -> int:
+        if ticket.granted:
+            return 0
+        # 태그가 같으면 먼저 들어온 요청이 앞선다 (_dispatch의 min도 앞쪽을 고른다)
+        index = self._queue.index(ticket)
+        return 1 + sum(
+            t.finish_tag < ticket.finish_tag or (t.finish_tag == ticket.finish_tag and i < index)
+            for i, t in enumerate(self._queue)
+        )
+
+
+def admitted(
+    ticket: Ticket, events: AsyncGenerator[ChatEvent, None]
+) -> AsyncGenerator[ChatEvent, None]:
+    """차례가 올 때까지 queued 이벤트(대기 순번)를 내보낸 뒤 원래 이벤트를 그대로 전달한다."""
+    stream = _admitted(ticket, events)
+    # 응답을 보내기 전에 연결이 끊겨 스트림이 한 번도 실행되지 않아도 자리를 돌려준다
+    weakref.finalize(stream, ticket.release)
+    return stream
+
+
+async def _admitted(
+    ticket: Ticket, events: AsyncGenerator[ChatEvent, None]
+) -> AsyncGenerator[ChatEvent, None]:
+    try:
+        if not ticket.granted:
+            async for position in ticket.wait():
+                yield "queued", str(position)
+            # 대기 시간은 대기한 요청 자신의 컨텍스트에서 기록한다
+            observe("admission_wait", time.perf_counter() - ticket.enqueued_at)
+        async for event in events:
+            yield event
+    finally:
+        ticket.release()
+        await events.aclose()
+
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|s|m|h)")
+_DURATION_UNITS = {"ms": 0.001, "s": 1, "m": 60, "h": 3600}
+
+
+def parse_reset_duration(value: str) -> float | None:
+    """x-ratelimit-reset-* 헤더 값("1s", "6m0s", "20ms")을 초로 바꾼다."""
+    parts = _DURATION_PART.findall(value)
+    if not parts:
+        return None
+    return sum(float(amount) * _DURATION_UNITS[unit] for amount, unit in parts)
+
+
+class TokenBucket:
+    """헤더로 동기화되는 토큰 버킷. 헤더를 받기 전에는 제한하지 않는다."""
+
+    def __init__(self):
+        self.capacity: float | None = None
+        self.level: float | None = None
+        self.rate = 0.0
+        self._updated = time.monotonic()
+
+    def sync(self, limit: int, remaining: int, reset_seconds: float | None) -> None:
+        """limit/remaining은 헤더 값, reset_seconds는 버킷이 다시 가득 찰 때까지 남은 시간."""
+        self.capacity = limit
+        self.level = remaining
+        if reset_seconds:
+            self.rate = (limit - remaining) / reset_seconds
+        else:
+            self.rate = limit / 60
+        self._updated = time.monotonic()
+
+    def delay(self, cost: float) -> float:
+        """cost만큼 꺼낼 수 있을 때까지 기다려야 하는 시간(초)."""
+        if self.level is None:
+            return 0.0
+        self._refill()
+        if self.level >= min(cost, self.capacity):
+            return 0.0
+        if self.rate <= 0:
+            return 1.0
+        return (min(cost, self.capacity) - self.level) / self.rate
+
+    def take(self, cost: float) -> None:
+        if self.level is not None:
+            self._refill()
+            self.level -= cost
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + self.rate * (now - self._updated))
+        self._updated = now
+
+
+class OpenAIRateLimiter:
+    """OpenAI 요청 수/토큰 수 rate limit을 응답 헤더 기준 토큰 버킷으로 지킨다."""
+
+    def __init__(self):
+        self.requests = TokenBucket()
+        self.tokens = TokenBucket()
+
+    def update(self, headers: Mapping[str, str]) -> None:
+        for bucket, kind in ((self.requests, "requests"), (self.tokens, "tokens")):
+            limit = headers.get(f"x-ratelimit-limit-{kind}")
+            remaining = headers.get(f"x-ratelimit-remaining-{kind}")
+            if limit is None or remaining is None:
+                continue
+            reset = parse_reset_duration(headers.get(f"x-ratelimit-reset-{kind}", ""))
+            bucket.sync(int(limit), int(remaining), reset)
+
+    async def acquire(self, estimated_tokens: int) -> None:
+        """요청 1개와 예상 토큰을 꺼낼 수 있을 때까지 기다린다.
+
+        확인과 차감 사이에 await가 없으므로 잠금 없이도 차감은 원자적이다. 기다리는 요청끼리 서로를
+        막지 않아서, 비용이 작은 요청은 큰 요청이 기다리는 동안에도 통과할 수 있다.
+        """
+        start = time.perf_counter()
+        while (delay := max(self.requests.delay(1), self.tokens.delay(estimated_tokens))) > 0:
+            await asyncio.sleep(delay)
+        self.requests.take(1)
+        self.tokens.take(estimated_tokens)
+        if self.requests.level is not None:
+            observe("rate_limit_wait", time.perf_counter() - start)
+
+    def try_acquire(self, estimated_tokens: int) -> bool:
+        """기다리지 않고 꺼낼 수 있을 때만 꺼낸다. 미뤄도 되는 추가 요청(hedge)에 쓴다."""
+        if max(self.requests.delay(1), self.tokens.delay(estimated_tokens)) > 0:
+            return False
+        self.requests.take(1)
+        self.tokens.take(estimated_tokens)
+        return True
+
+
+admission = AdmissionController(
+    max_concurrent=settings.chat_max_concurrent,
+    max_concurrent_per_seller=settings.chat_max_concurrent_per_seller,
+    max_queue=settings.chat_max_queue,
+    max_queue_per_seller=settings.chat_max_queue_per_seller,
+    weights=settings.chat_seller_weights,
+)
+rate_limiter = OpenAIRateLimiter()
@@ -0,0 +1,127 @@
+"""
+첫 질문 답변 캐시.
+
+"PG 심사는 얼마나 걸리나요?"처럼 자주 반복되는 가이드 질문은 매번 LLM → search_guide → LLM을
+거친다. 새 대화의 첫 질문이 이전에 답한 질문과 임베딩 기준으로 충분히 비슷하면 저장된 답변을
+OpenAI 호출 없이 그대로 재생한다. 가이드 검색 결과에 근거한 답변만 저장한다. tool 없이 모델이
+바로 한 답변은 가이드 근거가 없고, 다른 tool(상품 조회/변경)을 쓴 답변은 판매자마다 결과가
+다르므로 저장하지 않는다.
+
+저장은 done 이벤트를 늦추지 않도록 요청 세션과 별개의 세션으로 백그라운드에서 한다. 캐시이므로
+프로세스가 종료되며 저장하지 못한 항목은 버린다.
+
+캐시 항목은 저장 당시 guide_chunks의 상태(guide_version)를 함께 기록한다. 가이드를 다시
+인덱싱하면 청크 ID와 개수가 바뀌므로 이전 항목은 조회되지 않고, 다음 저장 때 지워진다.
+"""
+
+import asyncio
+import logging
+from datetime import timedelta
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.shared.config import settings
+from app.shared.database import AsyncSessionLocal
+from app.shared.embedding import embed_text_async
+from app.guide.model import GuideChunk
+from app.chat.model import CachedAnswer
+
+logger = logging.getLogger(__name__)
+
+# 답변에 포함되어도 캐시할 수 있는 tool (판매자와 무관한 결과만 반환)
+CACHEABLE_TOOLS = {"search_guide"}
+
+# 실행 중인 백그라운드 저장 태스크 (완료 전에 GC되지 않도록 참조를 유지한다)
+_store_tasks: set[asyncio.Task] = set()
+
+
+def _guide_version():
+    """guide_chunks 상태를 나타내는 값 ("최대 ID:개수"). 재인덱싱하면 달라진다."""
+    return select(
+        func.concat(func.coalesce(func.max(GuideChunk.id), 0), ":", func.count(GuideChunk.id))
+    ).scalar_subquery()
+
+
+def is_cacheable(answer: str, tool_calls: list[dict]) -> bool:
+    """가이드 검색을 한 번 이상 거쳤고, 그 밖의 tool은 쓰지 않은 답변인지."""
+    return (
+        bool(answer)
+        and any(call["name"] in CACHEABLE_TOOLS for call in tool_calls)
+        and all(call["name"] in CACHEABLE_TOOLS for call in tool_calls)
+    )
+
+
+async def find_cached_answer(
+    db: AsyncSession, question: str
+) -> tuple[list[float] | None, CachedAnswer | None]:
+    """질문을 임베딩하고 비슷한 질문의 캐시된 답변을 찾는다.
+
+    임베딩은 캐시에 없을 때 store_answer에서 재사용하도록 함께 반환한다.
+    조회에 실패하면 캐시 없이 진행하도록 (None, None)을 반환한다.
+    """
+    try:
+        embedding = await embed_text_async(question)
+        distance = CachedAnswer.embedding.cosine_distance(embedding)
+        cached = (
+            await db.execute(
+                select(CachedAnswer)
+                .where(
+                    CachedAnswer.guide_version == _guide_version(),
+                    CachedAnswer.created_at
+                    >= func.now() - timedelta(hours=settings.answer_cache_ttl_hours),
+                    distance <= 1 - settings.answer_cache_min_similarity,
+                )
+                .order_by(distance)
+                .limit(1)
+            )
+        ).scalar_one_or_none()
+    except Exception as e:
+        logger.warning(f"답변 캐시 조회 실패: {e}")
+        return None, None
+    return embedding, cached
+
+
+async def store_answer(
+    db: AsyncSession,
+    question: str,
+    embedding: list[float],
+    answer: str,
+    tool_calls: list[dict],
+) -> None:
+    """답변을 캐시에 저장하고, 이전 가이드 인덱스로 만든 항목을 정리한다."""
+    try:
+        await db.execute(delete(CachedAnswer).where(CachedAnswer.guide_version != _guide_version()))
+        await db.execute(
+            insert(CachedAnswer).values(
+                question=question,
+                embedding=embedding,
+                answer=answer,
+                tool_calls=tool_calls or None,
+                guide_version=_guide_version(),
+            )
+        )
+        await db.commit()
+    except Exception as e:
+        await db.rollback()
+        logger.warning(f"답변 캐시 저장 실패: {e}")
+
+
+def store_answer_later(
+    question: str,
+    embedding: list[float],
+    answer: str,
+    tool_calls: list[dict],
+    session_factory: async_sessionmaker = AsyncSessionLocal,
+) -> asyncio.Task:
+    """store_answer를 새 세션으로 백그라운드에서 실행한다."""
+
+    async def store() -> None:
+        async with session_factory() as db:
+            await store_answer(db, question, embedding, answer, tool_calls)
+
+    task = asyncio.create_task(store())
+    _store_tasks.add(task)
+    task.add_done_callback(_store_tasks.discard)
+    return task
@@ -0,0 +1,232 @@
+"""
+배치 채팅 작업.
+
+운영자가 여러 지시("X 가격 10% 올려줘" 50건 등)를 한 번에 보낼 때 메시지마다 SSE 연결을 오래 붙잡지
+않도록, /api/chat/batch는 메시지를 chat_batch_items에 저장하고 바로 응답한다. 워커 풀이 항목을 하나씩
+가져와 stream_chat의 agent 루프를 SSE 없이 실행하고, 답변은 메시지마다 새 대화(conversations,
+messages)에 저장된다. 진행 상황은 GET /api/chat/batch/{id}로 확인한다.
+
+- 동시에 실행하는 턴 수는 워커 수(chat_batch_workers)로 제한한다. 대화형 요청의 진입 제어(admission)와
+  별개로 돌고, OpenAI rate limit은 함께 지킨다.
+- 항목은 PENDING을 RUNNING으로 바꾸는 UPDATE로 가져가므로 여러 프로세스가 같은 항목을 두 번 실행하지
+  않는다. 워커 풀을 시작할 때 DB에 남은 PENDING 항목을 다시 큐에 넣는다.
+- 변경 tool이 두 번 실행되지 않도록 RUNNING 항목은 다시 실행하지 않는다. 앱 종료로 중단된 항목은
+  FAILED로 남기고, 프로세스가 강제 종료되면 실행 중이던 항목은 RUNNING으로 남는다.
+"""
+
+import asyncio
+import logging
+from collections.abc import Iterable
+from contextlib import aclosing
+
+import anyio
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session
+
+from app.shared.config import settings
+from app.shared.database import AsyncSessionLocal
+from app.shared.display_id import parse_pk, to_display_id
+from app.chat.model import BatchItemStatus, ChatBatch, ChatBatchItem
+from app.chat.persistence import message_writer
+from app.chat.schema import ChatBatchDetail, ChatBatchItemDetail
+from app.chat.service import stream_chat
+
+logger = logging.getLogger(__name__)
+
+_INTERRUPTED = "앱 종료로 처리가 중단되었습니다"
+
+
+async def create_batch(
+    db: AsyncSession, seller_id: int, messages: list[str]
+) -> tuple[ChatBatch, list[ChatBatchItem]]:
+    """배치와 항목을 저장한다. 처리하려면 항목 ID를 batch_pool.submit()으로 넣는다."""
+    batch = ChatBatch(seller_id=seller_id)
+    db.add(batch)
+    await db.flush()
+    items = [
+        ChatBatchItem(batch_id=batch.id, position=position, message=message)
+        for position, message in enumerate(messages)
+    ]
+    db.add_all(items)
+    await db.commit()
+    await db.refresh(batch)
+    return batch, items
+
+
+def get_batch(db: Session, batch_id: int) -> tuple[ChatBatch, list[ChatBatchItem]] | None:
+    batch = db.get(ChatBatch, batch_id)
+    if batch is None:
+        return None
+    items = (
+        db.query(ChatBatchItem)
+        .filter(ChatBatchItem.batch_id == batch_id)
+        .order_by(ChatBatchItem.position)
+        .all()
+    )
+    return batch, items
+
+
+def batch_detail(batch: ChatBatch, items: list[ChatBatchItem]) -> ChatBatchDetail:
+    counts = {status: 0 for status in BatchItemStatus}
+    for item in items:
+        counts[item.status] += 1
+
+    if counts[BatchItemStatus.PENDING] + counts[BatchItemStatus.RUNNING] == 0:
+        status = "done"
+    elif counts[BatchItemStatus.PENDING] == len(items):
+        status = "pending"
+    else:
+        status = "running"
+
+    return ChatBatchDetail(
+        id=to_display_id("chat_batches", batch.id),
+        status=status,
+        total=len(items),
+        pending=counts[BatchItemStatus.PENDING],
+        running=counts[BatchItemStatus.RUNNING],
+        done=counts[BatchItemStatus.DONE],
+        failed=counts[BatchItemStatus.FAILED],
+        created_at=batch.created_at,
+        items=[
+            ChatBatchItemDetail(
+                position=item.position,
+                message=item.message,
+                status=item.status.value,
+                conversation_id=(
+                    to_display_id("conversations", item.conversation_id)
+                    if item.conversation_id else None
+                ),
+                error=item.error,
+                started_at=item.started_at,
+                finished_at=item.finished_at,
+            )
+            for item in items
+        ],
+    )
+
+
+async def run_item(item_id: int, session_factory: async_sessionmaker = AsyncSessionLocal) -> None:
+    """항목 하나를 가져와 실행한다. 다른 워커가 이미 가져간 항목이면 아무것도 하지 않는다."""
+    async with session_factory() as db:
+        claimed = (
+            await db.execute(
+                update(ChatBatchItem)
+                .where(
+                    ChatBatchItem.id == item_id,
+                    ChatBatchItem.status == BatchItemStatus.PENDING,
+                )
+                .values(status=BatchItemStatus.RUNNING, started_at=func.now())
+                .returning(ChatBatchItem.batch_id, ChatBatchItem.message)
+            )
+        ).one_or_none()
+        if claimed is None:
+            return
+        seller_id = await db.scalar(
+            select(ChatBatch.seller_id).where(ChatBatch.id == claimed.batch_id)
+        )
+        await db.commit()
+
+        # 취소되면 이 값 그대로 중단 처리한다
+        status, conversation_id, error = BatchItemStatus.FAILED, None, _INTERRUPTED
+        try:
+            failure = None
+            events = stream_chat(
+                db, claimed.message, conversation_display_id=None, seller_id=seller_id
+            )
+            async with aclosing(events):
+                async for event_type, data in events:
+                    if event_type == "conversation_id":
+                        conversation_id = parse_pk(data, "conversations")
+                    elif event_type == "error":
+                        failure = data
+            status = BatchItemStatus.FAILED if failure else BatchItemStatus.DONE
+            error = failure
+        except Exception as e:
+            logger.exception(f"배치 항목 처리 실패 (item_id={item_id})")
+            error = str(e)
+        finally:
+            with anyio.CancelScope(shield=True):
+                await _finish(session_factory, item_id, status, conversation_id, error)
+
+
+async def _finish(
+    session_factory: async_sessionmaker,
+    item_id: int,
+    status: BatchItemStatus,
+    conversation_id: int | None,
+    error: str | None,
+) -> None:
+    if status == BatchItemStatus.DONE:
+        # 완료로 보이는 시점에 답변 메시지도 조회되도록 write-behind 큐를 먼저 저장한다.
+        # 실패해도 백그라운드 저장이 다시 시도하므로 완료 처리는 계속한다
+        try:
+            await message_writer.flush()
+        except Exception as e:
+            logger.warning(f"배치 항목 답변 저장 지연 (item_id={item_id}): {e}")
+
+    async with session_factory() as db:
+        await db.execute(
+            update(ChatBatchItem)
+            .where(ChatBatchItem.id == item_id)
+            .values(
+                status=status,
+                conversation_id=conversation_id,
+                error=error,
+                finished_at=func.now(),
+            )
+        )
+        await db.commit()
+
+
+class BatchWorkerPool:
+    """배치 항목 ID 큐와 이를 처리하는 워커 태스크."""
+
+    def __init__(self, workers: int, session_factory: async_sessionmaker = AsyncSessionLocal):
+        self._workers = workers
+        self._session_factory = session_factory
+        self._queue: asyncio.Queue[int] = asyncio.Queue()
+        self._tasks: list[asyncio.Task] = []
+
+    def submit(self, item_ids: Iterable[int]) -> None:
+        for item_id in item_ids:
+            self._queue.put_nowait(item_id)
+
+    async def start(self) -> None:
+        """DB에 남은 PENDING 항목을 큐에 넣고 워커를 시작한다."""
+        if self._tasks:
+            return
+        async with self._session_factory() as db:
+            pending = (
+                await db.execute(
+                    select(ChatBatchItem.id)
+                    .where(ChatBatchItem.status == BatchItemStatus.PENDING)
+                    .order_by(ChatBatchItem.id)
+                )
+            ).scalars().all()
+        self.submit(pending)
+        self._tasks = [asyncio.create_task(self._work()) for _ in range(self._workers)]
+
+    async def stop(self) -> None:
+        """워커를 멈춘다. 실행 중이던 항목은 중단 처리(FAILED)된다."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def join(self) -> None:
+        """큐에 넣은 항목이 모두 처리될 때까지 기다린다."""
+        await self._queue.join()
+
+    async def _work(self) -> None:
+        while True:
+            item_id = await self._queue.get()
+            try:
+                await run_item(item_id, self._session_factory)
+            except Exception:
+                logger.exception(f"배치 항목 완료 처리 실패 (item_id={item_id})")
+            finally:
+                self._queue.task_done()
+
+
+batch_pool = BatchWorkerPool(workers=settings.chat_batch_workers)
@@ -0,0 +1,166 @@
+"""
+대화 히스토리 압축.
+
+OpenAI에 보내는 히스토리를 토큰 예산 안으로 유지한다.
+최근 턴은 원문 그대로 보내고, 예산을 넘는 오래된 턴은 Conversation.summary에 저장된
+누적 요약(rolling summary) 한 개로 대체한다. 요약은 윈도우 시작점이 움직일 때만 다시 만든다.
+"""
+
+import logging
+import math
+from dataclasses import dataclass
+from functools import lru_cache
+
+import tiktoken
+from openai import AsyncOpenAI
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.shared.config import settings
+from app.chat.model import Conversation
+
+logger = logging.getLogger(__name__)
+
+# 메시지 하나당 role/구분자로 추가되는 토큰 수 (OpenAI chat 포맷 기준 근사치)
+_MESSAGE_OVERHEAD_TOKENS = 4
+
+SUMMARY_PROMPT = """다음은 식스샵 프로 판매자와 AI 어시스턴트 '식식이'의 이전 대화입니다.
+이후 대화를 이어가는 데 필요한 정보만 한국어로 간결하게 요약하세요.
+- 판매자가 요청한 작업과 그 결과 (상품명, 상품 ID, 가격, 상태 등 구체적인 값 유지)
+- 안내한 가이드 내용과 출처 URL
+- 아직 처리되지 않았거나 확인을 기다리는 요청
+"""
+
+
+@dataclass
+class HistoryWindow:
+    """LLM에 보낼 히스토리와, 요약 생성에 사용한 토큰 수."""
+
+    messages: list[dict]
+    input_tokens: int = 0
+    output_tokens: int = 0
+    # messages의 예상 토큰 수 (rate limit 확인용)
+    prompt_tokens: int = 0
+
+
+def _encoding_name() -> str:
+    try:
+        return tiktoken.encoding_name_for_model(settings.openai_model)
+    except KeyError:
+        return "o200k_base"
+
+
+@lru_cache(maxsize=1)
+def _get_encoding():
+    try:
+        return tiktoken.get_encoding(_encoding_name())
+    except Exception as e:
+        # 인코딩 파일을 받을 수 없는 환경(오프라인 등)에서는 바이트 기반 근사치를 쓴다
+        logger.warning(f"tiktoken 인코딩 로드 실패, 근사치로 계산합니다: {e}")
+        return None
+
+
+def count_tokens(text: str) -> int:
+    encoding = _get_encoding()
+    if encoding is None:
+        # 한글 한 글자(3바이트) ≈ 1토큰으로 넉넉하게 잡는다
+        return math.ceil(len(text.encode("utf-8")) / 3)
+    return len(encoding.encode(text))
+
+
+def message_tokens(message: dict) -> int:
+    return count_tokens(message.get("content") or "") + _MESSAGE_OVERHEAD_TOKENS
+
+
+def plan_window_start(
+    history: list[dict],
+    summarized_count: int,
+    budget: int,
+    keep_tokens: int,
+    sizes: list[int] | None = None,
+) -> int:
+    """원문으로 보낼 구간의 시작 인덱스를 정한다.
+
+    현재 구간(history[summarized_count:])이 budget 안이면 그대로 둔다.
+    넘으면 keep_tokens 안에 들어오는 가장 이른 user 메시지부터 시작하도록 앞으로 옮긴다.
+    (매 턴 요약을 다시 만들지 않도록 budget보다 작은 keep_tokens까지 한 번에 줄인다)
+    마지막 user 메시지는 크기와 관계없이 항상 원문으로 남긴다.
+    """
+    start = min(summarized_count, len(history))
+    if sizes is None:
+        sizes = [message_tokens(m) for m in history]
+
+    if sum(sizes[start:]) <= budget:
+        return start
+
+    user_indexes = [i for i in range(start, len(history)) if history[i]["role"] == "user"]
+    if not user_indexes:
+        return start
+
+    for i in user_indexes:
+        if sum(sizes[i:]) <= keep_tokens:
+            return i
+    return user_indexes[-1]
+
+
+async def compact_history(
+    db: AsyncSession,
+    conversation: Conversation,
+    history: list[dict],
+    llm: AsyncOpenAI,
+) -> HistoryWindow:
+    """토큰 예산에 맞춘 히스토리를 반환한다. 윈도우가 움직이면 요약을 갱신해 저장한다."""
+    summarized_count = conversation.summary_message_count or 0
+    sizes = [message_tokens(m) for m in history]
+    start = plan_window_start(
+        history,
+        summarized_count,
+        budget=settings.history_token_budget,
+        keep_tokens=settings.history_keep_tokens,
+        sizes=sizes,
+    )
+
+    window = HistoryWindow(messages=history[start:])
+
+    if start > summarized_count:
+        try:
+            summary, usage = await _summarize(
+                llm, conversation.summary, history[summarized_count:start]
+            )
+        except Exception as e:
+            # 요약 실패 시 기존 윈도우를 유지한다 (예산은 넘지만 대화는 계속된다)
+            logger.error(f"대화 요약 실패 (conversation_id={conversation.id}): {e}")
+            start = summarized_count
+            window.messages = history[start:]
+        else:
+            conversation.summary = summary
+            conversation.summary_message_count = start
+            await db.commit()
+            if usage:
+                window.input_tokens = usage.prompt_tokens
+                window.output_tokens = usage.completion_tokens
+
+    if start > 0 and conversation.summary:
+        summary_message = {
+            "role": "system",
+            "content": f"## 이전 대화 요약\n{conversation.summary}",
+        }
+        window.messages = [summary_message] + window.messages
+        window.prompt_tokens += message_tokens(summary_message)
+
+    window.prompt_tokens += sum(sizes[start:])
+    return window
+
+
+async def _summarize(llm: AsyncOpenAI, previous_summary: str | None, messages: list[dict]):
+    transcript = "\n".join(f"{m['role']}: {m['content']}" for m in messages)
+    if previous_summary:
+        transcript = f"[기존 요약]\n{previous_summary}\n\n[이어지는 대화]\n{transcript}"
+
+    response = await llm.chat.completions.create(
+        model=settings.openai_model,
+        messages=[
+            {"role": "system", "content": SUMMARY_PROMPT},
+            {"role": "user", "content": transcript},
+        ],
+    )
+    return response.choices[0].message.content or "", response.usage
@@ -0,0 +1,60 @@
+"""
+클라이언트 연결 종료 감지.
+
+SSE 응답은 다음 프레임을 쓸 때가 되어야 연결이 끊긴 것을 알 수 있어서, tool 실행이나 LLM 응답을
+기다리는 동안 판매자가 탭을 닫아도 OpenAI 스트림과 남은 agent 반복이 계속 돌며 토큰을 쓴다.
+ClientDisconnect는 요청의 연결 상태를 주기적으로 확인하고, sse_stream은 끊김이 감지되면 원본
+스트림을 바로 닫는다. /api/chat에서는 원본이 턴 로그 구독이라서, 재연결 유예(app.chat.resume)가
+지나야 stream_chat이 취소된다. 이때 턴의 ClientDisconnect에 mark()로 취소 시각을 남긴다.
+"""
+
+import asyncio
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+
+# 정상 완료된 턴의 출력 토큰 수. 취소로 아낀 토큰을 추정할 때 평균으로 쓴다
+_recent_output_tokens: deque[int] = deque(maxlen=100)
+
+
+class ClientDisconnect:
+    """연결 종료 감지. is_disconnected 없이 만들면 wait()를 쓰지 않고 mark()로만 기록한다."""
+
+    def __init__(
+        self,
+        is_disconnected: Callable[[], Awaitable[bool]] | None = None,
+        poll_interval_ms: int = 0,
+    ):
+        self._is_disconnected = is_disconnected
+        self._poll_interval = poll_interval_ms / 1000
+        self.detected_at: float | None = None
+
+    async def wait(self) -> None:
+        """연결이 끊길 때까지 기다린다."""
+        while not await self._is_disconnected():
+            await asyncio.sleep(self._poll_interval)
+        self.mark()
+
+    def mark(self) -> None:
+        """끊김을 감지한 시각을 기록한다. 처음 감지한 시각만 남긴다."""
+        if self.detected_at is None:
+            self.detected_at = time.perf_counter()
+
+    def latency_ms(self) -> int | None:
+        """끊김 감지부터 지금까지 걸린 시간(ms). 감지되지 않았으면 None."""
+        if self.detected_at is None:
+            return None
+        return round((time.perf_counter() - self.detected_at) * 1000)
+
+
+def record_output_tokens(tokens: int) -> None:
+    if tokens > 0:
+        _recent_output_tokens.append(tokens)
+
+
+def estimate_tokens_saved(generated_tokens: int) -> int | None:
+    """최근 완료된 턴의 평균 출력 토큰에서 취소 전까지 생성된 토큰을 뺀 값. 기록이 없으면 None."""
+    if not _recent_output_tokens:
+        return None
+    average = sum(_recent_output_tokens) / len(_recent_output_tokens)
+    return max(round(average) - generated_tokens, 0)
@@ -0,0 +1,168 @@
+"""
+LLM 스트리밍 요청 hedging.
+
+gpt-4o-mini의 첫 청크 지연(TTFT)은 꼬리가 길어서, 요청 하나의 첫 청크가 늦으면 SSE 응답 전체가
+멈춘다. 켜 두면 첫 청크가 최근 TTFT의 p90(설정 가능)보다 늦을 때 같은 요청을 한 번 더 보내고,
+먼저 첫 청크를 보낸 스트림을 쓴다.
+
+- 두 번째 요청(hedge)이 지면 바로 닫는다.
+- 원래 요청이 지면 그 요청의 첫 청크가 올 때까지만 열어 두었다가 닫는다. 그래서 hedge로 줄인
+  시간(llm_hedge_gain)을 실제 값으로 기록할 수 있고, 추가 비용은 청크 하나 정도다.
+- hedge 발생 여부는 chat_llm_hedge_total{outcome}으로 센다. hedge를 보내면 llm_hedge 단계에
+  기다린 시간이 남으므로 턴 메타데이터에서도 보인다. rate limit 여유가 없으면 보내지 않는다.
+- TTFT는 내용이 없는 청크를 포함한 첫 청크 기준이다. 예산 계산에는 원래 요청의 TTFT만 쓴다. hedge로 짧아진 값이 섞이면 예산이 점점 줄어든다.
+"""
+
+import asyncio
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Awaitable, Callable
+
+from app.shared.config import settings
+from app.shared.metrics import count_hedge, observe
+
+
+class TtftTracker:
+    """최근 TTFT 표본으로 hedge 예산(초)을 계산한다."""
+
+    def __init__(self, percentile: float, window: int, min_samples: int, min_budget_ms: int):
+        self._percentile = percentile
+        self._min_samples = min_samples
+        self._min_budget = min_budget_ms / 1000
+        self._samples: deque[float] = deque(maxlen=window)
+
+    def add(self, seconds: float) -> None:
+        self._samples.append(seconds)
+
+    def budget(self) -> float | None:
+        """표본이 min_samples보다 적으면 None (hedge하지 않는다)."""
+        if len(self._samples) < self._min_samples:
+            return None
+        ordered = sorted(self._samples)
+        index = min(int(len(ordered) * self._percentile / 100), len(ordered) - 1)
+        return max(ordered[index], self._min_budget)
+
+
+class HedgedStream:
+    """먼저 받은 첫 청크를 내보낸 뒤 나머지 청크를 이어서 내보낸다."""
+
+    def __init__(self, stream, first_chunk, loser: asyncio.Task | None = None):
+        self._stream = stream
+        self._first_chunk = first_chunk
+        self._loser = loser
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self._first_chunk is not None:
+            chunk, self._first_chunk = self._first_chunk, None
+            return chunk
+        return await self._stream.__anext__()
+
+    async def close(self) -> None:
+        if self._loser is not None:
+            self._loser.cancel()
+            await asyncio.wait({self._loser})
+        await self._stream.close()
+
+
+async def _first_chunk(create: Callable[[], Awaitable]) -> tuple[object, object, float]:
+    """요청을 보내고 첫 청크를 받는다. (스트림, 첫 청크, 받은 시각)"""
+    stream = await create()
+    try:
+        chunk = await anext(stream)
+    except BaseException:
+        await stream.close()
+        raise
+    return stream, chunk, time.perf_counter()
+
+
+async def _discard(task: asyncio.Task) -> None:
+    """진 요청을 정리한다. 이미 첫 청크를 받았으면 스트림을 닫는다."""
+    task.cancel()
+    await asyncio.wait({task})
+    if not task.cancelled() and task.exception() is None:
+        stream, _, _ = task.result()
+        await stream.close()
+
+
+async def _watch_primary(primary: asyncio.Task, start: float, won_at: float) -> None:
+    """hedge에 진 원래 요청의 첫 청크를 기다려 줄인 시간을 기록하고 닫는다."""
+    try:
+        stream, _, received_at = await primary
+    except asyncio.CancelledError:
+        await _discard(primary)
+        raise
+    except Exception:
+        return
+    ttft_tracker.add(received_at - start)
+    observe("llm_hedge_gain", received_at - won_at)
+    await stream.close()
+
+
+async def open_stream(
+    create: Callable[[], Awaitable],
+    budget: float | None,
+    can_hedge: Callable[[], bool] = lambda: True,
+) -> HedgedStream:
+    """create()로 스트리밍 요청을 보내고, budget 안에 첫 청크가 없으면 한 번 더 보낸다.
+
+    budget이 None이면 hedge하지 않는다. can_hedge()가 False면(rate limit 여유 없음) 보내지 않는다.
+    """
+    start = time.perf_counter()
+    primary = asyncio.create_task(_first_chunk(create))
+    done, _ = await asyncio.wait({primary}, timeout=budget)
+    if done or not can_hedge():
+        try:
+            stream, chunk, received_at = await primary
+        except asyncio.CancelledError:
+            await _discard(primary)
+            raise
+        ttft_tracker.add(received_at - start)
+        if budget is not None:
+            count_hedge("not_needed" if done else "skipped")
+        return HedgedStream(stream, chunk)
+
+    observe("llm_hedge", budget)
+    hedge = asyncio.create_task(_first_chunk(create))
+    pending = {primary, hedge}
+    winner = None
+    try:
+        while winner is None:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            winner = next((t for t in done if t.exception() is None), None)
+            if winner is None and not pending:
+                # 둘 다 실패하면 원래 요청의 오류를 올린다
+                raise primary.exception()
+    except BaseException:
+        await asyncio.gather(_discard(primary), _discard(hedge))
+        raise
+
+    stream, chunk, received_at = winner.result()
+    if winner is primary:
+        count_hedge("primary")
+        ttft_tracker.add(received_at - start)
+        await _discard(hedge)
+        return HedgedStream(stream, chunk)
+
+    count_hedge("hedge")
+    loser = asyncio.create_task(_watch_primary(primary, start, received_at))
+    return HedgedStream(stream, chunk, loser=loser)
+
+
+async def hedged_stream(
+    create: Callable[[], Awaitable], can_hedge: Callable[[], bool] = lambda: True
+) -> AsyncIterator:
+    """설정에 따라 hedge하며 스트리밍 요청을 보낸다. 꺼져 있으면 create()를 그대로 반환한다."""
+    if not settings.llm_hedge_enabled:
+        return await create()
+    return await open_stream(create, ttft_tracker.budget(), can_hedge)
+
+
+ttft_tracker = TtftTracker(
+    percentile=settings.llm_hedge_percentile,
+    window=settings.llm_hedge_window,
+    min_samples=settings.llm_hedge_min_samples,
+    min_budget_ms=settings.llm_hedge_min_budget_ms,
+)
@@ -1,81 +1,176 @@
+import base64
+import binascii
+from datetime import datetime
+
+from sqlalchemy import case, func, literal, select, tuple_
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Session
 
+from app.shared.config import settings
 from app.shared.display_id import to_display_id
 from app.seller.model import Seller
-from app.chat.model import Conversation, Message, MessageRole
-from app.chat.schema import ConversationSummary, MessageDetail, MessageMetadata
+from app.chat.model import Conversation, ConversationStats, Message, MessageRole
+from app.chat.prompt_version import get_prompt_version
+from app.chat.schema import (
+    ConversationPage,
+    ConversationSummary,
+    MessageDetail,
+    MessageMetadata,
+    MessagePage,
+    MessageSummary,
+    MessageSummaryMetadata,
+)
+
+
+def encode_cursor(timestamp: datetime, pk: int) -> str:
+    """목록 마지막 행의 (시각, id)를 다음 페이지 커서 문자열로 만든다.
+
+    대화 목록은 (updated_at, id), 메시지 목록은 (created_at, id)를 쓴다.
+    """
+    raw = f"{timestamp.isoformat()}|{pk}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """encode_cursor의 역변환. 형식이 맞지 않으면 ValueError."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        timestamp, _, pk = raw.partition("|")
+        return datetime.fromisoformat(timestamp), int(pk)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValueError(f"잘못된 커서: {cursor}")
 
 
 def get_conversations(
-    db: Session, seller_id: int | None = None
-) -> list[ConversationSummary]:
+    db: Session,
+    seller_id: int | None = None,
+    limit: int = settings.conversation_page_size,
+    cursor: tuple[datetime, int] | None = None,
+) -> ConversationPage:
+    """최근 수정순 대화 목록을 (updated_at, id) 키셋으로 한 페이지씩 조회한다.
+
+    메시지 수, 첫 질문, 토큰 합계는 conversation_stats에서 읽으므로 메시지 수와 관계없이 페이지
+    크기만큼만 읽는다.
+    """
     query = (
-        db.query(Conversation, Seller.nickname, Seller.id)
+        select(
+            Conversation,
+            Seller.nickname,
+            ConversationStats.message_count,
+            ConversationStats.input_tokens,
+            ConversationStats.output_tokens,
+            ConversationStats.first_message,
+        )
         .outerjoin(Seller, Conversation.seller_id == Seller.id)
+        .outerjoin(ConversationStats, ConversationStats.conversation_id == Conversation.id)
+        .order_by(Conversation.updated_at.desc(), Conversation.id.desc())
     )
     if seller_id is not None:
-        query = query.filter(Conversation.seller_id == seller_id)
-    rows = query.order_by(Conversation.updated_at.desc()).all()
-
-    results = []
-    for conv, seller_nickname, seller_pk in rows:
-        messages = (
-            db.query(Message)
-            .filter(Message.conversation_id == conv.id)
-            .order_by(Message.created_at)
-            .all()
-        )
+        query = query.where(Conversation.seller_id == seller_id)
+    if cursor is not None:
+        query = query.where(tuple_(Conversation.updated_at, Conversation.id) < tuple_(*cursor))
+    # 다음 페이지가 있는지 알기 위해 하나 더 읽는다
+    rows = db.execute(query.limit(limit + 1)).all()
 
-        first_user_message = next(
-            (m for m in messages if m.role == MessageRole.USER), None
-        )
-        first_message = first_user_message.content[:50] if first_user_message else ""
-
-        total_tokens = 0
-        for m in messages:
-            if m.metadata_ and m.role == MessageRole.ASSISTANT:
-                input_t = m.metadata_.get("input_tokens") or 0
-                output_t = m.metadata_.get("output_tokens") or 0
-                total_tokens += input_t + output_t
-
-        results.append(
-            ConversationSummary(
-                id=to_display_id("conversations", conv.id),
-                first_message=first_message,
-                message_count=len(messages),
-                total_tokens=total_tokens,
-                created_at=conv.created_at,
-                updated_at=conv.updated_at,
-                seller_id=to_display_id("sellers", seller_pk) if seller_pk else None,
-                seller_nickname=seller_nickname,
-            )
+    items = [
+        ConversationSummary(
+            id=to_display_id("conversations", conv.id),
+            first_message=first_message or "",
+            message_count=message_count or 0,
+            total_tokens=(input_tokens or 0) + (output_tokens or 0),
+            created_at=conv.created_at,
+            updated_at=conv.updated_at,
+            seller_id=to_display_id("sellers", conv.seller_id) if conv.seller_id else None,
+            seller_nickname=nickname,
         )
+        for conv, nickname, message_count, input_tokens, output_tokens, first_message
+        in rows[:limit]
+    ]
+    next_cursor = None
+    if len(rows) > limit:
+        last = rows[limit - 1].Conversation
+        next_cursor = encode_cursor(last.updated_at, last.id)
+    return ConversationPage(items=items, next_cursor=next_cursor)
 
-    return results
 
+def get_messages(
+    db: Session,
+    conversation_id: int,
+    limit: int = settings.message_page_size,
+    cursor: tuple[datetime, int] | None = None,
+) -> MessagePage:
+    """대화 메시지를 오래된 순으로 (created_at, id) 키셋으로 한 페이지씩 조회한다.
 
-def get_messages(db: Session, conversation_id: int) -> list[MessageDetail]:
-    messages = (
-        db.query(Message)
-        .filter(Message.conversation_id == conversation_id)
-        .order_by(Message.created_at)
-        .all()
+    tool 호출 인자와 결과는 메시지마다 수십 KB까지 커지므로 metadata에서 tool_calls를 빼고
+    tool 이름만 DB에서 뽑아 온다. 전체 metadata는 get_message로 메시지 하나씩 조회한다.
+    """
+    metadata = Message.metadata_
+    query = (
+        select(
+            Message.id,
+            Message.role,
+            Message.content,
+            Message.created_at,
+            # metadata가 JSON null인 메시지(user)는 키를 뺄 수 없다
+            case(
+                (
+                    func.jsonb_typeof(metadata) == "object",
+                    metadata.op("-", return_type=JSONB)(literal("tool_calls")),
+                ),
+            ).label("metadata"),
+            func.jsonb_path_query_array(metadata, "$.tool_calls[*].name").label("tool_names"),
+        )
+        .where(Message.conversation_id == conversation_id)
+        .order_by(Message.created_at, Message.id)
     )
+    if cursor is not None:
+        query = query.where(tuple_(Message.created_at, Message.id) > tuple_(*cursor))
+    # 다음 페이지가 있는지 알기 위해 하나 더 읽는다
+    rows = db.execute(query.limit(limit + 1)).all()
 
-    results = []
-    for m in messages:
-        metadata = None
-        if m.metadata_ and m.role == MessageRole.ASSISTANT:
-            metadata = MessageMetadata(**m.metadata_)
-
-        results.append(
-            MessageDetail(
-                id=to_display_id("messages", m.id),
-                role=m.role.value,
-                content=m.content,
-                created_at=m.created_at,
-                metadata=metadata,
+    items = []
+    for row in rows[:limit]:
+        summary = None
+        if row.metadata and row.role == MessageRole.ASSISTANT:
+            summary = MessageSummaryMetadata(**row.metadata, tool_names=row.tool_names or None)
+        items.append(
+            MessageSummary(
+                id=to_display_id("messages", row.id),
+                role=row.role.value,
+                content=row.content,
+                created_at=row.created_at,
+                metadata=summary,
             )
         )
+    next_cursor = None
+    if len(rows) > limit:
+        last = rows[limit - 1]
+        next_cursor = encode_cursor(last.created_at, last.id)
+    return MessagePage(items=items, next_cursor=next_cursor)
+
 
-    return results
+def get_message(db: Session, conversation_id: int, message_id: int) -> MessageDetail | None:
+    """메시지 하나를 tool 호출 결과와 시스템 프롬프트 원문까지 포함해 조회한다."""
+    message = db.get(Message, message_id)
+    if message is None or message.conversation_id != conversation_id:
+        return None
+
+    metadata = None
+    system_prompt = None
+    if message.metadata_ and message.role == MessageRole.ASSISTANT:
+        tool_calls = message.metadata_.get("tool_calls") or []
+        metadata = MessageMetadata(
+            **message.metadata_, tool_names=[c["name"] for c in tool_calls] or None
+        )
+        if metadata.system_prompt_id:
+            prompt = get_prompt_version(db, metadata.system_prompt_id)
+            system_prompt = prompt.content if prompt else None
+
+    return MessageDetail(
+        id=to_display_id("messages", message.id),
+        role=message.role.value,
+        content=message.content,
+        created_at=message.created_at,
+        metadata=metadata,
+        system_prompt=system_prompt,
+    )
@@ -0,0 +1,96 @@
+"""
+대화 히스토리 프로세스 내 캐시.
+
+매 턴마다 전체 메시지를 DB에서 다시 읽지 않도록, 대화별 히스토리(OpenAI 메시지 형식)를
+메모리에 유지하고 queue_message로 새 메시지를 넣을 때마다 뒤에 이어 붙인다.
+캐시는 프로세스 단위이므로 기본값은 꺼져 있다(HISTORY_CACHE_ENABLED=false). 단일 워커이거나
+한 대화의 요청이 항상 같은 프로세스로 가도록 라우팅하는 배포에서만 켠다.
+"""
+
+from collections import OrderedDict
+
+from app.shared.config import settings
+
+# 메시지 dict 하나당 대략적인 고정 오버헤드 (role 문자열, dict 구조 등)
+_MESSAGE_OVERHEAD_BYTES = 64
+
+
+def _message_size(message: dict) -> int:
+    return len(message["content"].encode("utf-8")) + _MESSAGE_OVERHEAD_BYTES
+
+
+class ConversationHistoryCache:
+    """대화 ID별 히스토리를 보관하는 LRU 캐시. 항목 수와 전체 바이트 크기로 제한한다."""
+
+    def __init__(self, max_entries: int, max_bytes: int):
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._entries: OrderedDict[int, list[dict]] = OrderedDict()
+        self._sizes: dict[int, int] = {}
+        self._total_bytes = 0
+
+    def get(self, conversation_id: int) -> list[dict] | None:
+        history = self._entries.get(conversation_id)
+        if history is None:
+            return None
+
+        self._entries.move_to_end(conversation_id)
+        return list(history)
+
+    def put(self, conversation_id: int, history: list[dict]) -> None:
+        self.invalidate(conversation_id)
+
+        size = sum(_message_size(m) for m in history)
+        if size > self._max_bytes:
+            return
+
+        self._entries[conversation_id] = list(history)
+        self._sizes[conversation_id] = size
+        self._total_bytes += size
+        self._evict()
+
+    def append(self, conversation_id: int, message: dict) -> None:
+        """캐시된 대화에만 메시지를 추가한다. 캐시에 없으면 다음 조회 시 DB에서 읽는다."""
+        history = self._entries.get(conversation_id)
+        if history is None:
+            return
+
+        history.append(message)
+        size = _message_size(message)
+        self._sizes[conversation_id] += size
+        self._total_bytes += size
+        self._entries.move_to_end(conversation_id)
+
+        if self._sizes[conversation_id] > self._max_bytes:
+            self.invalidate(conversation_id)
+            return
+        self._evict()
+
+    def invalidate(self, conversation_id: int) -> None:
+        if self._entries.pop(conversation_id, None) is not None:
+            self._total_bytes -= self._sizes.pop(conversation_id)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._sizes.clear()
+        self._total_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total_bytes
+
+    def _evict(self) -> None:
+        while self._entries and (
+            len(self._entries) > self._max_entries or self._total_bytes > self._max_bytes
+        ):
+            conversation_id, _ = self._entries.popitem(last=False)
+            self._total_bytes -= self._sizes.pop(conversation_id)
+
+
+history_cache = ConversationHistoryCache(
+    max_entries=settings.history_cache_max_entries,
+    max_bytes=settings.history_cache_max_bytes,
+)
@@ -1,10 +1,14 @@
 import enum
 from datetime import datetime
 
-from sqlalchemy import Integer, Text, Enum, DateTime, ForeignKey, func
+from pgvector.sqlalchemy import Vector
+from sqlalchemy import (
+    BigInteger, Boolean, Integer, String, Text, Enum, DateTime, ForeignKey, Index, func,
+)
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.dialects.postgresql import JSONB
 
+from app.shared.config import settings
 from app.shared.database import Base
 
 
@@ -21,6 +25,41 @@ class Conversation(Base):
     updated_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
     )
+    # 토큰 예산 밖으로 밀려난 오래된 턴의 누적 요약과, 요약에 포함된 메시지 수
+    summary: Mapped[str | None] = mapped_column(Text, nullable=True)
+    summary_message_count: Mapped[int] = mapped_column(
+        Integer, default=0, server_default="0"
+    )
+
+
+# 판매자별 최근 수정순 대화 목록 (app.migrations.r0004)
+Index(
+    "ix_conversations_seller_id_updated_at",
+    Conversation.seller_id,
+    Conversation.updated_at.desc(),
+)
+
+
+class ConversationStats(Base):
+    """대화별 메시지 집계. 메시지를 저장하는 트랜잭션에서 함께 갱신한다 (app.chat.stats)."""
+
+    __tablename__ = "conversation_stats"
+
+    conversation_id: Mapped[int] = mapped_column(
+        ForeignKey("conversations.id"), primary_key=True
+    )
+    message_count: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    # assistant 메시지 metadata의 토큰 수 합계
+    input_tokens: Mapped[int] = mapped_column(BigInteger, default=0, server_default="0")
+    output_tokens: Mapped[int] = mapped_column(BigInteger, default=0, server_default="0")
+    # 첫 user 메시지 앞부분 (목록 미리보기)
+    first_message: Mapped[str | None] = mapped_column(Text, nullable=True)
+    last_message_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    # 오류로 끝난/연결 종료로 중단된 assistant 메시지 수
+    error_count: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    aborted_count: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
 
 
 class MessageRole(str, enum.Enum):
@@ -41,6 +80,86 @@ class Message(Base):
     metadata_: Mapped[dict | None] = mapped_column(
         "metadata", JSONB, nullable=True
     )
+    # assistant 메시지 metadata에서 집계에 쓰는 값을 컬럼으로 꺼내 둔다 (저장 시 채움)
+    input_tokens: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    output_tokens: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    response_time_ms: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    model: Mapped[str | None] = mapped_column(String(100), nullable=True)
+    is_error: Mapped[bool] = mapped_column(Boolean, default=False, server_default="false")
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now()
     )
+
+
+# 대화 메시지 목록 키셋 조회 (app.migrations.r0003)
+Index("ix_messages_conversation_id_created_at", Message.conversation_id, Message.created_at)
+
+
+class PromptVersion(Base):
+    """시스템 프롬프트 원문. 내용의 SHA-256 해시를 키로 한 번만 저장하고 메시지는 해시만 참조한다."""
+
+    __tablename__ = "prompt_versions"
+
+    id: Mapped[str] = mapped_column(String(64), primary_key=True)
+    content: Mapped[str] = mapped_column(Text)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
+
+
+class CachedAnswer(Base):
+    """첫 질문에 대한 가이드 답변 캐시. 질문 임베딩이 충분히 비슷하면 답변을 재사용한다."""
+
+    __tablename__ = "answer_cache"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    question: Mapped[str] = mapped_column(Text)
+    embedding: Mapped[list[float]] = mapped_column(
+        Vector(settings.openai_embedding_dimension)
+    )
+    answer: Mapped[str] = mapped_column(Text)
+    tool_calls: Mapped[list | None] = mapped_column(JSONB, nullable=True)
+    # 답변을 만들 때의 guide_chunks 상태. 재인덱싱되면 값이 달라져 더 이상 조회되지 않는다
+    guide_version: Mapped[str] = mapped_column(String(64), index=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
+
+
+class BatchItemStatus(str, enum.Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+
+class ChatBatch(Base):
+    """/api/chat/batch로 한 번에 받은 메시지 묶음. 메시지마다 새 대화에서 답변한다."""
+
+    __tablename__ = "chat_batches"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    seller_id: Mapped[int] = mapped_column(Integer, ForeignKey("sellers.id"))
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
+
+
+class ChatBatchItem(Base):
+    __tablename__ = "chat_batch_items"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    batch_id: Mapped[int] = mapped_column(ForeignKey("chat_batches.id"), index=True)
+    # 요청 목록에서의 순서 (0부터)
+    position: Mapped[int] = mapped_column(Integer)
+    message: Mapped[str] = mapped_column(Text)
+    status: Mapped[BatchItemStatus] = mapped_column(
+        Enum(BatchItemStatus), default=BatchItemStatus.PENDING, index=True
+    )
+    # 답변이 저장된 대화. 처리를 시작하기 전에는 None
+    conversation_id: Mapped[int | None] = mapped_column(
+        ForeignKey("conversations.id"), nullable=True
+    )
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    started_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
@@ -0,0 +1,219 @@
+"""
+채팅 메시지 write-behind 저장.
+
+stream_chat은 메시지를 큐에 넣기만 하고 바로 다음 이벤트를 보낸다. 백그라운드 태스크가
+여러 요청의 메시지를 모아 INSERT, conversations.updated_at 갱신, 대화별 집계(conversation_stats)
+갱신을 한 트랜잭션으로 저장한다.
+연결 끊김 같은 일시적인 오류로 실패한 메시지는 큐에 남아 있다가 백오프 후 다시 시도되고,
+그 밖의 오류로 저장할 수 없는 메시지는 로그를 남기고 버려서 뒤의 메시지를 막지 않게 한다.
+앱 종료 시(lifespan) 남은 메시지를 모두 저장한다. 큐는 프로세스 메모리에 있으므로 프로세스가
+강제 종료되면 아직 저장하지 못한 메시지는 유실될 수 있고, DB가 오래 멈춰 큐가 상한에 닿으면
+새 메시지는 로그만 남기고 버린다.
+"""
+
+import asyncio
+import logging
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from itertools import islice
+
+from sqlalchemy import func, update
+from sqlalchemy.exc import DBAPIError, InterfaceError, OperationalError
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.shared.config import settings
+from app.shared.database import AsyncSessionLocal
+from app.chat.model import Conversation, Message, MessageRole
+from app.chat.stats import record_messages
+
+logger = logging.getLogger(__name__)
+
+# 종료 시 남은 메시지 저장 재시도 횟수
+_SHUTDOWN_FLUSH_ATTEMPTS = 3
+
+
+def metadata_columns(metadata: dict | None) -> dict:
+    """metadata에서 messages의 집계용 컬럼(토큰 수, 응답 시간, 모델, 오류 여부) 값을 꺼낸다."""
+    metadata = metadata or {}
+    return {
+        "input_tokens": metadata.get("input_tokens"),
+        "output_tokens": metadata.get("output_tokens"),
+        "response_time_ms": metadata.get("response_time_ms"),
+        "model": metadata.get("model"),
+        "is_error": bool(metadata.get("error")),
+    }
+
+
+@dataclass
+class PendingMessage:
+    conversation_id: int
+    role: MessageRole
+    content: str
+    metadata: dict | None = None
+    # 배치로 한 번에 INSERT해도 대화 내 순서가 유지되도록 큐에 넣은 시각을 저장한다
+    created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+
+
+def _is_transient(error: Exception) -> bool:
+    """연결 끊김 등 다시 시도하면 성공할 수 있는 오류인지."""
+    if isinstance(error, DBAPIError):
+        return error.connection_invalidated or isinstance(
+            error, (OperationalError, InterfaceError)
+        )
+    # 연결을 맺는 단계의 오류는 DBAPIError로 감싸지지 않고 그대로 올라온다
+    return isinstance(error, (OSError, asyncio.TimeoutError))
+
+
+class MessageWriter:
+    """메시지를 모아 주기적으로 저장하는 write-behind 큐."""
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker = AsyncSessionLocal,
+        flush_interval_ms: int = 50,
+        batch_size: int = 500,
+        retry_max_ms: int = 5000,
+        max_pending: int = 10_000,
+    ):
+        self._session_factory = session_factory
+        self._flush_interval = flush_interval_ms / 1000
+        self._batch_size = batch_size
+        self._retry_max = retry_max_ms / 1000
+        self._max_pending = max_pending
+        self._queue: deque[PendingMessage] = deque()
+        self._lock = asyncio.Lock()
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    def enqueue(self, message: PendingMessage) -> None:
+        if len(self._queue) >= self._max_pending:
+            # flush는 큐 앞쪽부터 저장 후 빼므로, 상한을 넘으면 새로 들어온 메시지를 버린다
+            logger.error(
+                f"저장 대기 메시지가 {self._max_pending}건을 넘어 버립니다 "
+                f"(conversation_id={message.conversation_id})"
+            )
+            return
+        self._queue.append(message)
+        self._wakeup.set()
+
+    def pending(self, conversation_id: int) -> list[PendingMessage]:
+        """아직 저장되지 않은 해당 대화의 메시지 (큐에 넣은 순서)."""
+        return [m for m in self._queue if m.conversation_id == conversation_id]
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+    @asynccontextmanager
+    async def consistent_read(self):
+        """진행 중인 flush가 끝난 뒤 DB와 pending()을 함께 읽도록 flush를 잠시 막는다.
+
+        flush는 커밋이 끝난 뒤에 큐에서 메시지를 빼므로, 이 구간 안에서 읽으면
+        같은 메시지가 DB와 큐 양쪽에서 보이거나 어느 쪽에서도 안 보이는 일이 없다.
+        """
+        async with self._lock:
+            yield
+
+    async def flush(self) -> None:
+        """큐의 메시지를 모두 저장한다. 일시적인 DB 오류는 그대로 올리고 메시지는 큐에 남긴다."""
+        while self._queue:
+            async with self._lock:
+                batch = list(islice(self._queue, self._batch_size))
+                try:
+                    await self._write(batch)
+                except Exception as e:
+                    if _is_transient(e):
+                        raise
+                    logger.error(f"메시지 배치 저장 실패, 한 건씩 다시 저장합니다: {e}")
+                    await self._write_one_by_one(batch)
+                else:
+                    self._discard(len(batch))
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """백그라운드 태스크를 멈추고 남은 메시지를 저장한다."""
+        if self._task is not None:
+            # 저장 도중에 취소되지 않도록 lock을 잡은 상태에서 취소한다
+            async with self._lock:
+                self._task.cancel()
+            await asyncio.wait({self._task})
+            self._task = None
+
+        delay = self._flush_interval
+        for attempt in range(1, _SHUTDOWN_FLUSH_ATTEMPTS + 1):
+            try:
+                await self.flush()
+                return
+            except Exception as e:
+                logger.warning(f"종료 전 메시지 저장 실패 ({attempt}/{_SHUTDOWN_FLUSH_ATTEMPTS}): {e}")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self._retry_max)
+        logger.error(f"저장하지 못한 메시지 {len(self._queue)}건을 남기고 종료합니다")
+
+    async def _run(self) -> None:
+        delay = self._flush_interval
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            # 짧게 기다려 여러 요청의 메시지를 한 트랜잭션으로 모은다
+            await asyncio.sleep(self._flush_interval)
+            try:
+                await self.flush()
+                delay = self._flush_interval
+            except Exception as e:
+                logger.warning(f"메시지 저장 실패, {delay:.2f}초 후 재시도합니다 (대기 {len(self._queue)}건): {e}")
+                self._wakeup.set()
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self._retry_max)
+
+    async def _write(self, batch: list[PendingMessage]) -> None:
+        async with self._session_factory() as db:
+            messages = [
+                Message(
+                    conversation_id=m.conversation_id,
+                    role=m.role,
+                    content=m.content,
+                    metadata_=m.metadata,
+                    created_at=m.created_at,
+                    **metadata_columns(m.metadata),
+                )
+                for m in batch
+            ]
+            db.add_all(messages)
+            await record_messages(db, messages)
+            conversation_ids = {m.conversation_id for m in batch}
+            await db.execute(
+                update(Conversation)
+                .where(Conversation.id.in_(conversation_ids))
+                .values(updated_at=func.now())
+            )
+            await db.commit()
+
+    async def _write_one_by_one(self, batch: list[PendingMessage]) -> None:
+        # 존재하지 않는 대화, 직렬화할 수 없는 metadata 등 다시 시도해도 실패할 메시지만 골라 버린다
+        for message in batch:
+            try:
+                await self._write([message])
+            except Exception as e:
+                if _is_transient(e):
+                    raise
+                logger.error(
+                    f"메시지를 저장할 수 없어 버립니다 (conversation_id={message.conversation_id}): {e}"
+                )
+            self._discard(1)
+
+    def _discard(self, count: int) -> None:
+        for _ in range(count):
+            self._queue.popleft()
+
+
+message_writer = MessageWriter(
+    flush_interval_ms=settings.message_flush_interval_ms,
+    batch_size=settings.message_flush_batch_size,
+    retry_max_ms=settings.message_flush_retry_max_ms,
+    max_pending=settings.message_queue_max_pending,
+)
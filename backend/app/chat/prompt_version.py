@@ -0,0 +1,37 @@
+import hashlib
+
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.chat.model import PromptVersion
+
+# 이 프로세스에서 이미 저장을 확인한 프롬프트 해시
+_registered: set[str] = set()
+
+
+def prompt_hash(content: str) -> str:
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+async def ensure_prompt_version(db: AsyncSession, content: str) -> str:
+    """프롬프트가 prompt_versions에 저장되어 있도록 보장하고 해시를 반환한다.
+
+    프로세스당 프롬프트별로 한 번만 DB에 쓴다.
+    """
+    prompt_id = prompt_hash(content)
+    if prompt_id in _registered:
+        return prompt_id
+
+    await db.execute(
+        insert(PromptVersion)
+        .values(id=prompt_id, content=content)
+        .on_conflict_do_nothing(index_elements=[PromptVersion.id])
+    )
+    await db.commit()
+    _registered.add(prompt_id)
+    return prompt_id
+
+
+def get_prompt_version(db: Session, prompt_id: str) -> PromptVersion | None:
+    return db.get(PromptVersion, prompt_id)
@@ -0,0 +1,255 @@
+"""
+끊긴 채팅 스트림 이어 받기.
+
+모바일에서 답변 도중 연결이 끊기면 프론트엔드는 /api/chat을 새로 요청해야 했고, 그러면 agent 루프가
+처음부터 다시 돌며 토큰을 또 쓴다. 그래서 턴의 이벤트는 연결과 분리된 태스크에서 받아 턴 로그에
+순번과 함께 쌓고, 응답은 로그를 구독해서 보낸다. SSE id는 "<턴 ID>:<순번>"이다. 같은 요청을
+Last-Event-ID 헤더와 함께 다시 보내면 놓친 이벤트를 재생한 뒤 진행 중인 턴에 이어 붙는다.
+
+- 구독자가 모두 끊긴 뒤 sse_resume_grace_ms 안에 다시 붙지 않으면 턴을 취소한다. 취소 처리는 연결
+  종료로 중단될 때와 같다. 판매자가 직접 멈춘 턴은 DELETE /api/chat/streams/{턴 ID}로 바로 취소한다.
+- 턴 로그가 sse_resume_turn_max_bytes를 넘으면 앞에서부터 버린다. 버린 이벤트가 필요한 재연결은
+  이어 받을 수 없다.
+- 끝난 턴의 로그는 sse_resume_ttl_seconds 뒤에 지운다. 전체 크기가 sse_resume_max_bytes를 넘으면
+  끝난 로그부터, 그다음 오래된 로그 순서로 지운다. 지워진 진행 중 턴도 이미 붙은 구독자에게는
+  끝까지 이벤트를 보낸다.
+
+로그는 프로세스 단위이므로, 여러 워커로 배포할 때는 재연결이 같은 프로세스로 가야 이어 받을 수 있다.
+"""
+
+import asyncio
+import itertools
+import logging
+import time
+import uuid
+import weakref
+from collections import OrderedDict, deque
+from collections.abc import AsyncGenerator, Callable
+
+import anyio
+
+from app.chat.disconnect import ClientDisconnect
+from app.chat.sse import ChatEvent
+from app.shared.config import settings
+
+logger = logging.getLogger(__name__)
+
+# (event_type, data, SSE id)
+SequencedEvent = tuple[str, str, str]
+
+# 이벤트 하나당 대략적인 고정 오버헤드 (튜플, 순번, 이벤트 타입 문자열 등)
+_EVENT_OVERHEAD_BYTES = 64
+
+_LOST_EVENTS_MESSAGE = "스트림을 이어 받을 수 없습니다. 대화를 다시 불러와 주세요."
+
+
+def _event_size(data: str) -> int:
+    return len(data.encode("utf-8")) + _EVENT_OVERHEAD_BYTES
+
+
+def parse_event_id(event_id: str) -> tuple[str, int] | None:
+    """SSE id("<턴 ID>:<순번>")를 나눈다. 형식이 맞지 않으면 None."""
+    turn_id, _, seq = event_id.strip().rpartition(":")
+    if not turn_id or not seq.isdigit():
+        return None
+    return turn_id, int(seq)
+
+
+class TurnLog:
+    """한 턴의 이벤트 로그. 턴 태스크가 쌓고, 응답마다 subscribe()로 따라 읽는다."""
+
+    def __init__(self, turn_id: str, seller_id: int, max_bytes: int, grace_seconds: float):
+        self.turn_id = turn_id
+        self.seller_id = seller_id
+        self.disconnect = ClientDisconnect()
+        self.task: asyncio.Task | None = None
+        self.finished_at: float | None = None
+        self.last_seq = 0
+        self.size = 0
+        self._max_bytes = max_bytes
+        self._grace_seconds = grace_seconds
+        self._events: deque[tuple[int, str, str]] = deque()
+        self._changed = asyncio.Event()
+        self._subscribers = 0
+        self._grace: asyncio.TimerHandle | None = None
+
+    @property
+    def finished(self) -> bool:
+        return self.finished_at is not None
+
+    def append(self, event_type: str, data: str) -> int:
+        """이벤트를 쌓고 로그 크기 변화량(바이트)을 반환한다."""
+        before = self.size
+        self.last_seq += 1
+        self._events.append((self.last_seq, event_type, data))
+        self.size += _event_size(data)
+        while self.size > self._max_bytes and len(self._events) > 1:
+            _, _, dropped = self._events.popleft()
+            self.size -= _event_size(dropped)
+        self._notify()
+        return self.size - before
+
+    def finish(self) -> None:
+        self.finished_at = time.monotonic()
+        if self._grace is not None:
+            self._grace.cancel()
+        self._notify()
+
+    def can_resume(self, after: int) -> bool:
+        """after 다음 이벤트부터 로그에 모두 남아 있는지."""
+        first = self._events[0][0] if self._events else self.last_seq + 1
+        return first <= after + 1 and after <= self.last_seq
+
+    def subscribe(self, after: int = 0) -> AsyncGenerator[SequencedEvent, None]:
+        """after 다음 이벤트부터 턴이 끝날 때까지 내보낸다."""
+        self._subscribers += 1
+        if self._grace is not None:
+            self._grace.cancel()
+            self._grace = None
+
+        detached = False
+
+        def detach() -> None:
+            nonlocal detached
+            if not detached:
+                detached = True
+                self._detach()
+
+        stream = self._follow(after, detach)
+        # 응답이 스트림을 한 번도 읽지 않고 끝나도 구독을 해제한다
+        weakref.finalize(stream, detach)
+        return stream
+
+    def cancel(self) -> None:
+        """턴을 중단한다. 중단 메타데이터의 취소 지연은 이 시점부터 잰다."""
+        if self.task is not None and not self.task.done():
+            self.disconnect.mark()
+            self.task.cancel()
+
+    async def _follow(
+        self, after: int, detach: Callable[[], None]
+    ) -> AsyncGenerator[SequencedEvent, None]:
+        try:
+            while True:
+                changed = self._changed
+                if not self.can_resume(after):
+                    # 읽는 속도가 너무 느려 아직 보내지 않은 이벤트가 버려진 경우
+                    yield "error", _LOST_EVENTS_MESSAGE, f"{self.turn_id}:{self.last_seq}"
+                    return
+                start = after + 1 - self._events[0][0] if self._events else 0
+                for seq, event_type, data in list(itertools.islice(self._events, start, None)):
+                    yield event_type, data, f"{self.turn_id}:{seq}"
+                    after = seq
+                if self.finished and after >= self.last_seq:
+                    return
+                await changed.wait()
+        finally:
+            detach()
+
+    def _notify(self) -> None:
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    def _detach(self) -> None:
+        self._subscribers -= 1
+        if self._subscribers > 0 or self.task is None or self.task.done():
+            return
+        self._grace = self.task.get_loop().call_later(self._grace_seconds, self.cancel)
+
+
+class TurnLogRegistry:
+    """턴 ID별 로그. 끝난 로그는 TTL 뒤에, 전체 크기를 넘으면 오래된 것부터 지운다."""
+
+    def __init__(self, ttl_seconds: int, max_bytes: int, turn_max_bytes: int, grace_ms: int):
+        self._ttl = ttl_seconds
+        self._max_bytes = max_bytes
+        self._turn_max_bytes = turn_max_bytes
+        self._grace_seconds = grace_ms / 1000
+        self._logs: OrderedDict[str, TurnLog] = OrderedDict()
+        self._total_bytes = 0
+
+    def start(
+        self, seller_id: int, make_events: Callable[[ClientDisconnect], AsyncGenerator]
+    ) -> TurnLog:
+        """턴을 연결과 별개의 태스크로 시작한다.
+
+        make_events는 턴의 ClientDisconnect를 받아 (event_type, data) 스트림을 만든다. 턴이 취소되면
+        이 객체에 취소 시각이 기록된다.
+        """
+        self._expire()
+        log = TurnLog(uuid.uuid4().hex, seller_id, self._turn_max_bytes, self._grace_seconds)
+        log.task = asyncio.create_task(self._produce(log, make_events(log.disconnect)))
+        # 시작 전에 취소된 태스크는 _produce의 finally를 거치지 않는다
+        log.task.add_done_callback(lambda _: log.finished or log.finish())
+        self._logs[log.turn_id] = log
+        return log
+
+    def get(self, turn_id: str, seller_id: int) -> TurnLog | None:
+        """판매자 자신의 턴 로그만 반환한다."""
+        self._expire()
+        log = self._logs.get(turn_id)
+        if log is None or log.seller_id != seller_id:
+            return None
+        return log
+
+    def clear(self) -> None:
+        for log in self._logs.values():
+            log.cancel()
+        self._logs.clear()
+        self._total_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._logs)
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total_bytes
+
+    async def _produce(self, log: TurnLog, events: AsyncGenerator[ChatEvent, None]) -> None:
+        try:
+            async for event_type, data in events:
+                grown = log.append(event_type, data)
+                if self._logs.get(log.turn_id) is log:
+                    self._total_bytes += grown
+                    self._evict()
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logger.exception("채팅 턴 처리 실패")
+            log.append("error", str(e))
+        finally:
+            # 취소된 상태에서도 원본 스트림 정리(중단 메시지 저장)는 끝까지 기다린다
+            with anyio.CancelScope(shield=True):
+                await events.aclose()
+            log.finish()
+
+    def _expire(self) -> None:
+        deadline = time.monotonic() - self._ttl
+        expired = [
+            turn_id for turn_id, log in self._logs.items()
+            if log.finished and log.finished_at < deadline
+        ]
+        for turn_id in expired:
+            self._remove(turn_id)
+
+    def _evict(self) -> None:
+        if self._total_bytes <= self._max_bytes:
+            return
+        finished = [turn_id for turn_id, log in self._logs.items() if log.finished]
+        running = [turn_id for turn_id, log in self._logs.items() if not log.finished]
+        for turn_id in finished + running:
+            if self._total_bytes <= self._max_bytes:
+                return
+            self._remove(turn_id)
+
+    def _remove(self, turn_id: str) -> None:
+        log = self._logs.pop(turn_id)
+        self._total_bytes -= log.size
+
+
+turn_logs = TurnLogRegistry(
+    ttl_seconds=settings.sse_resume_ttl_seconds,
+    max_bytes=settings.sse_resume_max_bytes,
+    turn_max_bytes=settings.sse_resume_turn_max_bytes,
+    grace_ms=settings.sse_resume_grace_ms,
+)
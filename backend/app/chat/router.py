@@ -1,88 +1,297 @@
-from fastapi import APIRouter, Depends, HTTPException
+from collections.abc import AsyncGenerator
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response
 from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.shared.database import get_db
+from app.shared.config import settings
+from app.shared.database import AsyncSessionLocal, get_async_db, get_db
 from app.shared.display_id import parse_pk
 from app.shared.schema import ErrorResponse
 from app.shared.auth import require_seller
 from app.seller.model import Seller
 from app.chat.model import Conversation
-from app.chat.schema import ChatRequest, ConversationSummary, MessageDetail
+from app.chat.schema import (
+    ChatBatchDetail,
+    ChatBatchRequest,
+    ChatRequest,
+    ConversationPage,
+    MessageDetail,
+    MessagePage,
+    PromptVersionDetail,
+)
+from app.chat.batch import batch_detail, batch_pool, create_batch, get_batch
+from app.chat.admission import AdmissionRejected, Ticket, admission, admitted
+from app.chat.disconnect import ClientDisconnect
+from app.chat.resume import parse_event_id, turn_logs
 from app.chat.service import stream_chat
-from app.chat.history import get_conversations, get_messages
+from app.chat.sse import ChatEvent, StreamEvent, sse_stream
+from app.chat.history import decode_cursor, get_conversations, get_message, get_messages
+from app.chat.prompt_version import get_prompt_version
 
 router = APIRouter()
 
 
-@router.post("/api/chat")
+@router.post(
+    "/api/chat",
+    responses={
+        400: {"description": "Invalid Last-Event-ID", "model": ErrorResponse},
+        410: {"description": "Stream can no longer be resumed", "model": ErrorResponse},
+        429: {"description": "Too many chat requests", "model": ErrorResponse},
+    },
+)
 async def chat(
     request: ChatRequest,
+    http_request: Request,
+    seller: Seller = Depends(require_seller),
+    last_event_id: str | None = Header(default=None),
+):
+    """채팅 응답 SSE 스트림. Last-Event-ID가 있으면 새 턴을 시작하지 않고 그 턴을 이어 받는다."""
+    if last_event_id:
+        parsed = parse_event_id(last_event_id)
+        if parsed is None:
+            raise HTTPException(status_code=400, detail="Invalid Last-Event-ID")
+        turn_id, seq = parsed
+        log = turn_logs.get(turn_id, seller.id)
+        if log is None or not log.can_resume(seq):
+            raise HTTPException(status_code=410, detail="Stream can no longer be resumed")
+        return _sse_response(log.subscribe(after=seq), http_request)
+
+    try:
+        ticket = admission.enqueue(seller.id)
+    except AdmissionRejected as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "1"})
+
+    log = turn_logs.start(
+        seller.id, lambda disconnect: _turn_events(request, seller.id, ticket, disconnect)
+    )
+    return _sse_response(log.subscribe(), http_request)
+
+
+@router.delete(
+    "/api/chat/streams/{stream_id}",
+    status_code=204,
+    responses={404: {"description": "Stream not found", "model": ErrorResponse}},
+)
+async def cancel_chat_stream(stream_id: str, seller: Seller = Depends(require_seller)):
+    """판매자가 멈춘 턴을 재연결 유예 없이 바로 중단한다."""
+    log = turn_logs.get(stream_id, seller.id)
+    if log is None:
+        raise HTTPException(status_code=404, detail="Stream not found")
+    log.cancel()
+    return Response(status_code=204)
+
+
+@router.post("/api/chat/batch", response_model=ChatBatchDetail, status_code=202)
+async def create_chat_batch(
+    request: ChatBatchRequest,
+    db: AsyncSession = Depends(get_async_db),
+    seller: Seller = Depends(require_seller),
+):
+    """메시지 목록을 배치로 접수한다. 워커가 메시지마다 새 대화에서 처리한다."""
+    batch, items = await create_batch(db, seller.id, request.messages)
+    batch_pool.submit(item.id for item in items)
+    return batch_detail(batch, items)
+
+
+@router.get(
+    "/api/chat/batch/{batch_id}",
+    response_model=ChatBatchDetail,
+    responses={
+        403: {"description": "Forbidden", "model": ErrorResponse},
+        404: {"description": "Batch not found", "model": ErrorResponse},
+    },
+)
+def get_chat_batch(
+    batch_id: str,
     db: Session = Depends(get_db),
     seller: Seller = Depends(require_seller),
 ):
+    found = get_batch(db, parse_pk(batch_id, "chat_batches"))
+
+    if not found:
+        raise HTTPException(status_code=404, detail="Batch not found")
+    batch, items = found
+    if batch.seller_id != seller.id:
+        raise HTTPException(status_code=403, detail="Forbidden")
+
+    return batch_detail(batch, items)
+
+
+async def _turn_events(
+    request: ChatRequest, seller_id: int, ticket: Ticket, disconnect: ClientDisconnect
+) -> AsyncGenerator[ChatEvent, None]:
+    """턴 태스크에서 실행할 이벤트 스트림. 응답 연결이 먼저 끝나도 턴은 이어지므로 세션을 따로 연다."""
+    async with AsyncSessionLocal() as db:
+        events = admitted(
+            ticket,
+            stream_chat(
+                db,
+                request.message,
+                conversation_display_id=request.conversation_id,
+                seller_id=seller_id,
+                disconnect=disconnect,
+            ),
+        )
+        try:
+            async for event in events:
+                yield event
+        finally:
+            await events.aclose()
+
+
+def _sse_response(
+    events: AsyncGenerator[StreamEvent, None], http_request: Request
+) -> StreamingResponse:
+    disconnect = ClientDisconnect(
+        http_request.is_disconnected, settings.disconnect_poll_interval_ms
+    )
     return StreamingResponse(
-        stream_chat(
-            db,
-            request.message,
-            conversation_display_id=request.conversation_id,
-            seller_id=seller.id,
+        sse_stream(
+            events,
+            interval_ms=settings.sse_coalesce_interval_ms,
+            max_bytes=settings.sse_coalesce_max_bytes,
+            disconnect=disconnect,
         ),
         media_type="text/event-stream",
     )
 
 
-@router.get("/api/conversations", response_model=list[ConversationSummary])
+MAX_CONVERSATION_PAGE_SIZE = 200
+MAX_MESSAGE_PAGE_SIZE = 200
+
+_INVALID_CURSOR = {400: {"description": "Invalid cursor", "model": ErrorResponse}}
+
+
+def _page_cursor(cursor: str | None):
+    if cursor is None:
+        return None
+    try:
+        return decode_cursor(cursor)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+@router.get("/api/conversations", response_model=ConversationPage, responses=_INVALID_CURSOR)
 def list_conversations(
     seller_id: str | None = None,
+    cursor: str | None = None,
+    limit: int = Query(settings.conversation_page_size, ge=1, le=MAX_CONVERSATION_PAGE_SIZE),
     db: Session = Depends(get_db),
 ):
     seller_pk = parse_pk(seller_id, "sellers") if seller_id else None
-    return get_conversations(db, seller_id=seller_pk)
+    return get_conversations(
+        db, seller_id=seller_pk, limit=limit, cursor=_page_cursor(cursor)
+    )
 
 
-@router.get(
-    "/api/conversations/{conversation_id}/messages",
-    response_model=list[MessageDetail],
-    responses={404: {"description": "Conversation not found", "model": ErrorResponse}},
-)
-def list_messages(conversation_id: str, db: Session = Depends(get_db)):
+_CONVERSATION_NOT_FOUND = {404: {"description": "Conversation not found", "model": ErrorResponse}}
+_MESSAGE_NOT_FOUND = {
+    404: {"description": "Conversation or message not found", "model": ErrorResponse},
+}
+_FORBIDDEN = {403: {"description": "Forbidden", "model": ErrorResponse}}
+
+
+def _get_conversation(db: Session, conversation_id: str, seller: Seller | None = None) -> int:
+    """대화를 확인하고 PK를 반환한다. seller를 주면 그 판매자의 대화만 허용한다."""
     pk = parse_pk(conversation_id, "conversations")
     conversation = db.get(Conversation, pk)
 
     if not conversation:
         raise HTTPException(status_code=404, detail="Conversation not found")
+    if seller is not None and conversation.seller_id != seller.id:
+        raise HTTPException(status_code=403, detail="Forbidden")
+
+    return pk
+
+
+def _message_detail(db: Session, conversation_pk: int, message_id: str) -> MessageDetail:
+    message = get_message(db, conversation_pk, parse_pk(message_id, "messages"))
+
+    if not message:
+        raise HTTPException(status_code=404, detail="Message not found")
+
+    return message
+
+
+@router.get(
+    "/api/conversations/{conversation_id}/messages",
+    response_model=MessagePage,
+    responses={**_INVALID_CURSOR, **_CONVERSATION_NOT_FOUND},
+)
+def list_messages(
+    conversation_id: str,
+    cursor: str | None = None,
+    limit: int = Query(settings.message_page_size, ge=1, le=MAX_MESSAGE_PAGE_SIZE),
+    db: Session = Depends(get_db),
+):
+    pk = _get_conversation(db, conversation_id)
+    return get_messages(db, pk, limit=limit, cursor=_page_cursor(cursor))
 
-    return get_messages(db, pk)
 
+@router.get(
+    "/api/conversations/{conversation_id}/messages/{message_id}",
+    response_model=MessageDetail,
+    responses=_MESSAGE_NOT_FOUND,
+)
+def get_message_detail(conversation_id: str, message_id: str, db: Session = Depends(get_db)):
+    pk = _get_conversation(db, conversation_id)
+    return _message_detail(db, pk, message_id)
 
-@router.get("/api/my/conversations", response_model=list[ConversationSummary])
+
+@router.get("/api/my/conversations", response_model=ConversationPage, responses=_INVALID_CURSOR)
 def list_my_conversations(
+    cursor: str | None = None,
+    limit: int = Query(settings.conversation_page_size, ge=1, le=MAX_CONVERSATION_PAGE_SIZE),
     db: Session = Depends(get_db),
     seller: Seller = Depends(require_seller),
 ):
-    return get_conversations(db, seller_id=seller.id)
+    return get_conversations(
+        db, seller_id=seller.id, limit=limit, cursor=_page_cursor(cursor)
+    )
 
 
 @router.get(
     "/api/my/conversations/{conversation_id}/messages",
-    response_model=list[MessageDetail],
-    responses={
-        403: {"description": "Forbidden", "model": ErrorResponse},
-        404: {"description": "Conversation not found", "model": ErrorResponse},
-    },
+    response_model=MessagePage,
+    responses={**_INVALID_CURSOR, **_FORBIDDEN, **_CONVERSATION_NOT_FOUND},
 )
 def list_my_messages(
     conversation_id: str,
+    cursor: str | None = None,
+    limit: int = Query(settings.message_page_size, ge=1, le=MAX_MESSAGE_PAGE_SIZE),
     db: Session = Depends(get_db),
     seller: Seller = Depends(require_seller),
 ):
-    pk = parse_pk(conversation_id, "conversations")
-    conversation = db.get(Conversation, pk)
+    pk = _get_conversation(db, conversation_id, seller)
+    return get_messages(db, pk, limit=limit, cursor=_page_cursor(cursor))
 
-    if not conversation:
-        raise HTTPException(status_code=404, detail="Conversation not found")
-    if conversation.seller_id != seller.id:
-        raise HTTPException(status_code=403, detail="Forbidden")
 
-    return get_messages(db, pk)
+@router.get(
+    "/api/my/conversations/{conversation_id}/messages/{message_id}",
+    response_model=MessageDetail,
+    responses={**_FORBIDDEN, **_MESSAGE_NOT_FOUND},
+)
+def get_my_message_detail(
+    conversation_id: str,
+    message_id: str,
+    db: Session = Depends(get_db),
+    seller: Seller = Depends(require_seller),
+):
+    pk = _get_conversation(db, conversation_id, seller)
+    return _message_detail(db, pk, message_id)
+
+
+@router.get(
+    "/api/prompt-versions/{prompt_id}",
+    response_model=PromptVersionDetail,
+    responses={404: {"description": "Prompt version not found", "model": ErrorResponse}},
+)
+def get_prompt(prompt_id: str, db: Session = Depends(get_db)):
+    prompt = get_prompt_version(db, prompt_id)
+
+    if not prompt:
+        raise HTTPException(status_code=404, detail="Prompt version not found")
+
+    return PromptVersionDetail(id=prompt.id, content=prompt.content, created_at=prompt.created_at)
@@ -1,6 +1,8 @@
 from datetime import datetime
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+
+from app.shared.config import settings
 
 
 class ChatRequest(BaseModel):
@@ -8,29 +10,93 @@ class ChatRequest(BaseModel):
     conversation_id: str | None = None
 
 
+class ChatBatchRequest(BaseModel):
+    # 메시지마다 새 대화에서 답변한다
+    messages: list[str] = Field(min_length=1, max_length=settings.chat_batch_max_messages)
+
+
+class ChatBatchItemDetail(BaseModel):
+    position: int
+    message: str
+    # pending | running | done | failed
+    status: str
+    conversation_id: str | None = None
+    error: str | None = None
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+
+
+class ChatBatchDetail(BaseModel):
+    id: str
+    # pending(시작 전) | running | done(모든 항목 완료 또는 실패)
+    status: str
+    total: int
+    pending: int
+    running: int
+    done: int
+    failed: int
+    created_at: datetime
+    items: list[ChatBatchItemDetail]
+
+
 class ToolCallDetail(BaseModel):
     name: str
     arguments: dict
     result: dict
 
 
-class MessageMetadata(BaseModel):
+class MessageSummaryMetadata(BaseModel):
     model: str | None = None
     input_tokens: int | None = None
     output_tokens: int | None = None
     response_time_ms: int | None = None
-    system_prompt: str | None = None
+    system_prompt_id: str | None = None
     error: str | None = None
     aborted: bool | None = None
+    answer_cache_id: int | None = None
+    # 단계별 소요 시간 (ms). 키: llm_ttft, llm_iteration, tool.<이름>, embedding, vector_query, db_commit
+    stage_timings_ms: dict[str, list[int]] | None = None
+    # LLM 요청에 포함한 tool 도메인 (None이면 전체 tool)
+    tool_domains: list[str] | None = None
+    # 클라이언트 연결 종료로 취소된 경우: 끊김 감지부터 정리까지 걸린 시간, 절약한 출력 토큰 추정치
+    cancel_latency_ms: int | None = None
+    tokens_saved_estimate: int | None = None
+    # 호출한 tool 이름 (순서대로). 인자와 결과는 메시지 상세에서 조회한다
+    tool_names: list[str] | None = None
+
+
+class MessageMetadata(MessageSummaryMetadata):
     tool_calls: list[ToolCallDetail] | None = None
 
 
+class PromptVersionDetail(BaseModel):
+    id: str
+    content: str
+    created_at: datetime
+
+
+class MessageSummary(BaseModel):
+    id: str
+    role: str
+    content: str
+    created_at: datetime
+    metadata: MessageSummaryMetadata | None = None
+
+
+class MessagePage(BaseModel):
+    items: list[MessageSummary]
+    # 다음 페이지를 조회할 cursor. 마지막 페이지면 None
+    next_cursor: str | None = None
+
+
 class MessageDetail(BaseModel):
     id: str
     role: str
     content: str
     created_at: datetime
     metadata: MessageMetadata | None = None
+    # metadata.system_prompt_id의 프롬프트 원문
+    system_prompt: str | None = None
 
 
 class ConversationSummary(BaseModel):
@@ -42,3 +108,9 @@ class ConversationSummary(BaseModel):
     updated_at: datetime
     seller_id: str | None = None
     seller_nickname: str | None = None
+
+
+class ConversationPage(BaseModel):
+    items: list[ConversationSummary]
+    # 다음 페이지를 조회할 cursor. 마지막 페이지면 None
+    next_cursor: str | None = None
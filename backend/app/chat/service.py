@@ -1,18 +1,42 @@
+import asyncio
 import json
 import time
 from collections.abc import AsyncGenerator
 
-from openai import AsyncOpenAI
-from sqlalchemy import func
-from sqlalchemy.orm import Session
+import httpx
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.shared.config import settings
 from app.shared.display_id import parse_pk, to_display_id
-from app.chat.model import Conversation, Message, MessageRole
-from app.chat.tools.definitions import TOOL_DEFINITIONS
-from app.chat.tools.executor import ToolContext, execute_tool
-
-client = AsyncOpenAI(api_key=settings.openai_api_key)
+from app.shared.metrics import observe, start_turn
+from app.chat.answer_cache import find_cached_answer, is_cacheable, store_answer_later
+from app.chat.admission import rate_limiter
+from app.chat.compaction import compact_history, count_tokens, message_tokens
+from app.chat.disconnect import ClientDisconnect, estimate_tokens_saved, record_output_tokens
+from app.chat.hedging import hedged_stream
+from app.chat.history_cache import history_cache
+from app.chat.model import CachedAnswer, Conversation, Message, MessageRole
+from app.chat.persistence import PendingMessage, message_writer
+from app.chat.prompt_version import ensure_prompt_version, prompt_hash
+from app.chat.sse import ChatEvent
+from app.chat.tools.assembler import ToolCallAssembler
+from app.chat.tools.executor import MUTATING_TOOLS, ToolResultCache
+from app.chat.tools.runner import ToolCall, ToolRunner
+from app.chat.tools.selection import select_tools
+
+
+async def _sync_rate_limit(response: httpx.Response) -> None:
+    rate_limiter.update(response.headers)
+
+
+# 응답마다 rate limit 헤더로 토큰 버킷을 맞춘다
+client = AsyncOpenAI(
+    api_key=settings.openai_api_key,
+    base_url=settings.openai_base_url,
+    http_client=DefaultAsyncHttpxClient(event_hooks={"response": [_sync_rate_limit]}),
+)
 
 SYSTEM_PROMPT = """당신의 이름은 '식식이'이고, '식스샵 프로' 쇼핑몰 솔루션의 판매자를 돕는 AI 어시스턴트입니다.
 
@@ -57,80 +81,108 @@ SYSTEM_PROMPT = """당신의 이름은 '식식이'이고, '식스샵 프로' 쇼
 - 삭제 요청만 사용자에게 한 번 확인한 뒤 실행하세요.
 """
 
+# 메시지 metadata에는 프롬프트 원문 대신 prompt_versions의 해시만 저장한다
+SYSTEM_PROMPT_ID = prompt_hash(SYSTEM_PROMPT)
+SYSTEM_PROMPT_TOKENS = message_tokens({"content": SYSTEM_PROMPT})
+
 
-def create_or_get_conversation(
-    db: Session, conversation_id: int | None, seller_id: int | None = None
+async def create_or_get_conversation(
+    db: AsyncSession, conversation_id: int | None, seller_id: int | None = None
 ) -> Conversation:
     if conversation_id:
-        conversation = db.get(Conversation, conversation_id)
+        conversation = await db.get(Conversation, conversation_id)
         if conversation:
             return conversation
 
     conversation = Conversation(seller_id=seller_id)
     db.add(conversation)
-    db.commit()
-    db.refresh(conversation)
+    await db.commit()
+    await db.refresh(conversation)
     return conversation
 
 
-def save_message(
-    db: Session,
+def queue_message(
     conversation_id: int,
     role: MessageRole,
     content: str,
     metadata: dict | None = None,
-) -> Message:
-    message = Message(
-        conversation_id=conversation_id,
-        role=role,
-        content=content,
-        metadata_=metadata,
-    )
-    db.add(message)
-
-    conversation = db.get(Conversation, conversation_id)
-    if conversation:
-        conversation.updated_at = func.now()
-
-    db.commit()
-    return message
-
+) -> None:
+    """커밋을 기다리지 않고 write-behind 큐에 넣는다. 히스토리 캐시에는 바로 반영된다."""
+    message_writer.enqueue(PendingMessage(conversation_id, role, content, metadata))
+    _append_to_history_cache(conversation_id, role, content, metadata)
+
+
+def _append_to_history_cache(
+    conversation_id: int, role: MessageRole, content: str, metadata: dict | None
+) -> None:
+    if settings.history_cache_enabled and not _is_aborted(metadata):
+        history_cache.append(conversation_id, {"role": role.value, "content": content})
+
+
+async def get_conversation_history(db: AsyncSession, conversation_id: int) -> list[dict]:
+    """OpenAI 메시지 형식의 대화 히스토리. 캐시에 없을 때만 DB에서 읽는다."""
+    if settings.history_cache_enabled:
+        cached = history_cache.get(conversation_id)
+        if cached is not None:
+            return cached
+
+    # 아직 저장되지 않은 write-behind 큐의 메시지를 DB 결과 뒤에 이어 붙인다
+    async with message_writer.consistent_read():
+        messages = (
+            await db.execute(
+                select(Message)
+                .where(Message.conversation_id == conversation_id)
+                .order_by(Message.created_at)
+            )
+        ).scalars().all()
+        pending = message_writer.pending(conversation_id)
 
-def get_conversation_history(db: Session, conversation_id: int) -> list[dict]:
-    messages = (
-        db.query(Message)
-        .filter(Message.conversation_id == conversation_id)
-        .order_by(Message.created_at)
-        .all()
-    )
-    return [
+    history = [
         {"role": m.role.value, "content": m.content}
         for m in messages
-        if not (m.metadata_ and m.metadata_.get("aborted"))
+        if not _is_aborted(m.metadata_)
+    ] + [
+        {"role": m.role.value, "content": m.content}
+        for m in pending
+        if not _is_aborted(m.metadata)
     ]
 
-
-def _sse_event(event_type: str, data: str) -> str:
-    payload = json.dumps({"type": event_type, "data": data}, ensure_ascii=False)
-    return f"data: {payload}\n\n"
+    if settings.history_cache_enabled:
+        history_cache.put(conversation_id, history)
+    return history
+
+
+async def get_previous_tool_domains(db: AsyncSession, conversation_id: int) -> list[str]:
+    """직전 assistant 답변에 보낸 tool 도메인. 전체 tool을 보냈거나 답변이 없으면 빈 목록."""
+    async with message_writer.consistent_read():
+        pending = [
+            m.metadata for m in message_writer.pending(conversation_id)
+            if m.role == MessageRole.ASSISTANT
+        ]
+        if pending:
+            metadata = pending[-1]
+        else:
+            metadata = (
+                await db.execute(
+                    select(Message.metadata_)
+                    .where(
+                        Message.conversation_id == conversation_id,
+                        Message.role == MessageRole.ASSISTANT,
+                    )
+                    .order_by(Message.created_at.desc())
+                    .limit(1)
+                )
+            ).scalar_one_or_none()
+    return (metadata or {}).get("tool_domains") or []
+
+
+def _is_aborted(metadata: dict | None) -> bool:
+    return bool(metadata and metadata.get("aborted"))
 
 
 MAX_TOOL_ITERATIONS = 5
 
 
-def _accumulate_tool_call_chunk(tool_calls_chunks: dict, tc) -> None:
-    """스트리밍 tool_call 청크를 누적한다."""
-    idx = tc.index
-    if idx not in tool_calls_chunks:
-        tool_calls_chunks[idx] = {"id": "", "name": "", "arguments": ""}
-    if tc.id:
-        tool_calls_chunks[idx]["id"] = tc.id
-    if tc.function and tc.function.name:
-        tool_calls_chunks[idx]["name"] += tc.function.name
-    if tc.function and tc.function.arguments:
-        tool_calls_chunks[idx]["arguments"] += tc.function.arguments
-
-
 def _build_metadata(
     start_time: float,
     total_input_tokens: int,
@@ -138,138 +190,264 @@ def _build_metadata(
     tool_calls: list,
     error: str | None = None,
     aborted: bool = False,
+    stage_timings: dict[str, list[int]] | None = None,
+    tool_domains: list[str] | None = None,
 ) -> dict:
     metadata = {
         "model": settings.openai_model,
         "input_tokens": total_input_tokens or None,
         "output_tokens": total_output_tokens or None,
         "response_time_ms": int((time.time() - start_time) * 1000),
-        "system_prompt": SYSTEM_PROMPT,
+        "system_prompt_id": SYSTEM_PROMPT_ID,
         "error": error,
         "tool_calls": tool_calls or None,
+        # 턴 기록은 같은 dict에 계속 쌓이므로 목록까지 복사해 저장 시점 값을 고정한다
+        "stage_timings_ms": (
+            {stage: list(ms) for stage, ms in stage_timings.items()} if stage_timings else None
+        ),
+        "tool_domains": tool_domains or None,
     }
     if aborted:
         metadata["aborted"] = True
     return metadata
 
 
+def _tool_call_metadata(call: ToolCall) -> dict:
+    metadata = {"name": call.name, "arguments": call.arguments, "result": call.result}
+    if call.status != "done":
+        # 오류/중단으로 결과를 받지 못한 호출. running은 시작된 변경 tool이 끝까지 실행 중이라는 뜻
+        metadata["status"] = call.status
+    return metadata
+
+
+def _with_in_flight(recorded: list[dict], runner: ToolRunner | None) -> list[dict]:
+    """오류/중단 시점에 진행 중이던 iteration에서 실행을 요청한 tool call까지 더한다."""
+    if runner is None:
+        return recorded
+    return recorded + [_tool_call_metadata(call) for call in runner.ordered_calls()]
+
+
+async def _replay_cached_answer(
+    conversation_id: int, cached: CachedAnswer
+) -> AsyncGenerator[ChatEvent, None]:
+    """캐시된 답변을 OpenAI 호출 없이 원래 응답과 같은 이벤트 순서로 내보낸다."""
+    start_time = time.time()
+    for call in cached.tool_calls or []:
+        yield "tool_call", call["name"]
+        yield "tool_result", call["name"]
+    yield "content", cached.answer
+
+    metadata = _build_metadata(start_time, 0, 0, cached.tool_calls)
+    metadata["answer_cache_id"] = cached.id
+    queue_message(conversation_id, MessageRole.ASSISTANT, cached.answer, metadata)
+    yield "done", ""
+
+
 async def stream_chat(
-    db: Session, message: str, conversation_display_id: str | None, seller_id: int | None = None
-) -> AsyncGenerator[str, None]:
+    db: AsyncSession,
+    message: str,
+    conversation_display_id: str | None,
+    seller_id: int | None = None,
+    disconnect: ClientDisconnect | None = None,
+) -> AsyncGenerator[ChatEvent, None]:
+    """채팅 응답을 (event_type, data) 이벤트로 내보낸다. SSE 인코딩은 app.chat.sse에서 한다.
+
+    클라이언트 연결이 끊겨 취소되면 OpenAI 스트림과 실행 중인 tool을 정리하고, 취소 지연과
+    절약한 토큰 추정치를 aborted 메시지 메타데이터에 남긴다.
+    """
+    timings = start_turn()
     pk = parse_pk(conversation_display_id, "conversations") if conversation_display_id else None
-    conversation = create_or_get_conversation(db, pk, seller_id=seller_id)
-    save_message(db, conversation.id, MessageRole.USER, message)
-
-    yield _sse_event("conversation_id", to_display_id("conversations", conversation.id))
+    conversation = await create_or_get_conversation(db, pk, seller_id=seller_id)
+    queue_message(conversation.id, MessageRole.USER, message)
+    await ensure_prompt_version(db, SYSTEM_PROMPT)
+
+    yield "conversation_id", to_display_id("conversations", conversation.id)
+
+    history = await get_conversation_history(db, conversation.id)
+
+    # 새 대화의 첫 질문이면 비슷한 질문에 대한 이전 답변을 재사용한다
+    question_embedding = None
+    if settings.answer_cache_enabled and len(history) == 1:
+        question_embedding, cached = await find_cached_answer(db, message)
+        if cached:
+            async for event in _replay_cached_answer(conversation.id, cached):
+                yield event
+            return
+
+    # 이어지는 턴은 직전 턴에 보낸 tool 도메인을 유지한다
+    follow_up = len(history) > 1
+    previous_domains = await get_previous_tool_domains(db, conversation.id) if follow_up else []
+    # tool 선택은 DB를 쓰지 않으므로 히스토리 압축과 함께 진행한다. 첫 턴에 임베딩 요청이
+    # 필요할 수 있지만 tool_selection_timeout_ms를 넘기면 전체 tool로 진행한다
+    window, selection = await asyncio.gather(
+        compact_history(db, conversation, history, llm=client),
+        select_tools(
+            message,
+            embedding=question_embedding,
+            follow_up=follow_up,
+            previous_domains=previous_domains,
+        ),
+    )
+    # LLM 스트림을 받는 동안 요청 세션이 커넥션을 붙잡지 않도록 읽기 트랜잭션을 끝낸다.
+    # tool은 호출마다 자기 세션을 쓴다
+    await db.commit()
 
-    history = get_conversation_history(db, conversation.id)
-    openai_messages = [{"role": "system", "content": SYSTEM_PROMPT}] + history
+    openai_messages = [{"role": "system", "content": SYSTEM_PROMPT}] + window.messages
+    # 매 iteration 전체를 다시 세지 않고, 새로 붙는 메시지만 더해 간다
+    prompt_tokens = SYSTEM_PROMPT_TOKENS + window.prompt_tokens
 
     full_response = ""
-    total_input_tokens = 0
-    total_output_tokens = 0
+    total_input_tokens = window.input_tokens
+    total_output_tokens = window.output_tokens
     all_tool_calls_metadata = []
+    iteration_content = ""
+    usage = None
     start_time = time.time()
     is_done = False
+    # 실행을 요청했지만 아직 all_tool_calls_metadata에 기록하지 않은 iteration의 runner
+    in_flight: ToolRunner | None = None
+    # 같은 턴에서 반복되는 조회 tool 호출은 DB/임베딩 요청 없이 이전 결과를 쓴다
+    tool_cache = ToolResultCache()
 
     try:
         for _iteration in range(MAX_TOOL_ITERATIONS):
-            stream = await client.chat.completions.create(
-                model=settings.openai_model,
-                messages=openai_messages,
-                tools=TOOL_DEFINITIONS,
-                stream=True,
-                stream_options={"include_usage": True},
+            await rate_limiter.acquire(prompt_tokens)
+            iteration_start = time.perf_counter()
+            first_token_seen = False
+            stream = await hedged_stream(
+                lambda: client.chat.completions.create(
+                    model=settings.openai_model,
+                    messages=openai_messages,
+                    tools=selection.tools,
+                    stream=True,
+                    stream_options={"include_usage": True},
+                ),
+                can_hedge=lambda: rate_limiter.try_acquire(prompt_tokens),
             )
 
-            tool_calls_chunks = {}
+            assembler = ToolCallAssembler()
+            runner = in_flight = ToolRunner(seller_id, cache=tool_cache)
+            held: list[ToolCall] = []
             iteration_content = ""
             usage = None
 
-            async for chunk in stream:
-                if chunk.usage:
-                    usage = chunk.usage
-
-                if not chunk.choices:
-                    continue
-
-                delta = chunk.choices[0].delta
-
-                if delta.content:
-                    iteration_content += delta.content
-                    full_response += delta.content
-                    yield _sse_event("content", delta.content)
-
-                if delta.tool_calls:
-                    for tc in delta.tool_calls:
-                        _accumulate_tool_call_chunk(tool_calls_chunks, tc)
-
-            if usage:
-                total_input_tokens += usage.prompt_tokens
-                total_output_tokens += usage.completion_tokens
-
-            # tool call이 없으면 텍스트 응답 완료 → 루프 종료
-            if not tool_calls_chunks:
-                break
-
-            # tool 실행 후 messages에 추가하여 다음 iteration 준비
+            try:
+                async for chunk in stream:
+                    if chunk.usage:
+                        usage = chunk.usage
+
+                    if not chunk.choices:
+                        continue
+
+                    choice = chunk.choices[0]
+                    delta = choice.delta
+
+                    if not first_token_seen and (delta.content or delta.tool_calls):
+                        first_token_seen = True
+                        observe("llm_ttft", time.perf_counter() - iteration_start)
+
+                    if delta.content:
+                        iteration_content += delta.content
+                        full_response += delta.content
+                        yield "content", delta.content
+
+                    # 인자가 완성된 조회 tool은 나머지 응답을 받는 동안 바로 실행한다.
+                    # 변경 tool과 그 뒤의 tool은 응답이 끝난 뒤(finish_reason)에 실행해서,
+                    # 응답이 도중에 끊기면 DB를 바꾸지 않는다
+                    if delta.tool_calls:
+                        for tc in delta.tool_calls:
+                            for call in assembler.add(tc):
+                                if held or call.name in MUTATING_TOOLS:
+                                    held.append(call)
+                                else:
+                                    runner.submit(call)
+
+                    if choice.finish_reason:
+                        for call in [*held, *assembler.finish()]:
+                            runner.submit(call)
+                        held = []
+
+                for call in [*held, *assembler.finish()]:
+                    runner.submit(call)
+                observe("llm_iteration", time.perf_counter() - iteration_start)
+
+                if usage:
+                    total_input_tokens += usage.prompt_tokens
+                    total_output_tokens += usage.completion_tokens
+
+                # tool call이 없으면 텍스트 응답 완료 → 루프 종료
+                if not assembler:
+                    break
+
+                async for event_type, call in runner.events():
+                    yield event_type, call.name
+            finally:
+                runner.cancel()
+                # 취소된 경우 HTTP 연결을 닫아 OpenAI 쪽 생성도 멈추게 한다
+                await stream.close()
+
+            # tool 결과를 messages에 추가하여 다음 iteration 준비
             assistant_tool_calls = []
             tool_results = []
 
-            for idx in sorted(tool_calls_chunks.keys()):
-                tc_data = tool_calls_chunks[idx]
-                arguments = json.loads(tc_data["arguments"])
-
-                yield _sse_event("tool_call", tc_data["name"])
-                ctx = ToolContext(db=db, seller_id=seller_id)
-                result = execute_tool(ctx, tc_data["name"], arguments)
-                yield _sse_event("tool_result", tc_data["name"])
-
+            for call in runner.ordered_calls():
                 assistant_tool_calls.append({
-                    "id": tc_data["id"],
+                    "id": call.id,
                     "type": "function",
                     "function": {
-                        "name": tc_data["name"],
-                        "arguments": tc_data["arguments"],
+                        "name": call.name,
+                        "arguments": call.raw_arguments,
                     },
                 })
 
                 tool_results.append({
-                    "tool_call_id": tc_data["id"],
+                    "tool_call_id": call.id,
                     "role": "tool",
-                    "content": json.dumps(result, ensure_ascii=False),
+                    "content": json.dumps(call.result, ensure_ascii=False),
                 })
 
-                all_tool_calls_metadata.append({
-                    "name": tc_data["name"],
-                    "arguments": arguments,
-                    "result": result,
-                })
+                all_tool_calls_metadata.append(_tool_call_metadata(call))
 
             assistant_msg = {"role": "assistant", "tool_calls": assistant_tool_calls}
             if iteration_content:
                 assistant_msg["content"] = iteration_content
             openai_messages.append(assistant_msg)
             openai_messages.extend(tool_results)
+            prompt_tokens += sum(message_tokens(m) for m in [assistant_msg, *tool_results])
+            in_flight = None
 
         metadata = _build_metadata(
-            start_time, total_input_tokens, total_output_tokens, all_tool_calls_metadata
+            start_time, total_input_tokens, total_output_tokens, all_tool_calls_metadata,
+            stage_timings=timings, tool_domains=selection.domains,
         )
-        save_message(db, conversation.id, MessageRole.ASSISTANT, full_response, metadata)
+        queue_message(conversation.id, MessageRole.ASSISTANT, full_response, metadata)
         is_done = True
-        yield _sse_event("done", "")
+        record_output_tokens(total_output_tokens - window.output_tokens)
+        if question_embedding is not None and is_cacheable(full_response, all_tool_calls_metadata):
+            # done 이벤트를 기다리게 하지 않도록 요청과 별개로 저장한다
+            store_answer_later(message, question_embedding, full_response, all_tool_calls_metadata)
+        yield "done", ""
     except Exception as e:
         metadata = _build_metadata(
-            start_time, total_input_tokens, total_output_tokens, all_tool_calls_metadata,
-            error=str(e),
+            start_time, total_input_tokens, total_output_tokens,
+            _with_in_flight(all_tool_calls_metadata, in_flight),
+            error=str(e), stage_timings=timings, tool_domains=selection.domains,
         )
-        save_message(db, conversation.id, MessageRole.ASSISTANT, full_response, metadata)
+        queue_message(conversation.id, MessageRole.ASSISTANT, full_response, metadata)
         is_done = True
-        yield _sse_event("error", str(e))
+        yield "error", str(e)
     finally:
         if not is_done:
             metadata = _build_metadata(
-                start_time, total_input_tokens, total_output_tokens, all_tool_calls_metadata,
-                aborted=True,
+                start_time, total_input_tokens, total_output_tokens,
+                _with_in_flight(all_tool_calls_metadata, in_flight),
+                aborted=True, stage_timings=timings, tool_domains=selection.domains,
             )
-            save_message(db, conversation.id, MessageRole.ASSISTANT, full_response, metadata)
+            if disconnect is not None:
+                generated = total_output_tokens - window.output_tokens
+                if usage is None:
+                    # usage를 받기 전에 끊긴 반복은 스트리밍된 텍스트로 출력 토큰을 추정한다
+                    generated += count_tokens(iteration_content)
+                metadata["cancel_latency_ms"] = disconnect.latency_ms()
+                metadata["tokens_saved_estimate"] = estimate_tokens_saved(generated)
+            queue_message(conversation.id, MessageRole.ASSISTANT, full_response, metadata)
@@ -0,0 +1,136 @@
+"""
+채팅 스트림의 SSE 인코딩.
+
+stream_chat은 (event_type, data) 튜플을 내보내고, 여기서 SSE 프레임 문자열로 바꾼다.
+OpenAI content delta는 보통 한두 글자라 그대로 보내면 프레임마다 json.dumps와 TCP write가
+한 번씩 생긴다. coalesce 모드에서는 content를 모아 두었다가 interval_ms 또는 max_bytes 중
+먼저 도달하는 시점에 하나의 content 이벤트로 합쳐 보낸다. 그 외 이벤트(tool_call, done,
+error 등)는 버퍼를 먼저 비운 뒤 즉시 보내므로 순서는 그대로 유지된다.
+
+이벤트에 세 번째 값(SSE id)이 있으면 프레임에 id 필드를 붙인다. 합친 content 프레임에는 마지막으로
+합친 이벤트의 id를 붙이므로, 재연결한 클라이언트가 보낸 Last-Event-ID 다음 이벤트부터 이어 받는다.
+
+disconnect가 주어지면 이벤트를 기다리는 동안에도 클라이언트 연결을 감시하다가, 끊기는 즉시
+원본 스트림을 취소한다.
+"""
+
+import asyncio
+import contextvars
+import json
+from collections.abc import AsyncGenerator, AsyncIterator
+
+import anyio
+
+from app.chat.disconnect import ClientDisconnect
+
+ChatEvent = tuple[str, str]
+# (event_type, data) 또는 (event_type, data, SSE id)
+StreamEvent = tuple[str, str] | tuple[str, str, str]
+
+_CONTENT = "content"
+
+
+def sse_event(event_type: str, data: str, event_id: str | None = None) -> str:
+    payload = json.dumps({"type": event_type, "data": data}, ensure_ascii=False)
+    if event_id is None:
+        return f"data: {payload}\n\n"
+    return f"id: {event_id}\ndata: {payload}\n\n"
+
+
+async def _next_event(events: AsyncGenerator[StreamEvent, None]) -> StreamEvent:
+    return await anext(events)
+
+
+async def sse_stream(
+    events: AsyncGenerator[StreamEvent, None],
+    interval_ms: int,
+    max_bytes: int,
+    disconnect: ClientDisconnect | None = None,
+) -> AsyncIterator[str]:
+    """이벤트 스트림을 SSE 프레임으로 변환한다. interval_ms가 0 이하면 합치지 않는다."""
+    if interval_ms <= 0 and disconnect is None:
+        try:
+            async for event_type, data, *event_id in events:
+                yield sse_event(event_type, data, *event_id)
+        finally:
+            await events.aclose()
+        return
+
+    loop = asyncio.get_running_loop()
+    # 매 이벤트를 별도 태스크에서 받아도 원본 제너레이터가 같은 contextvar 컨텍스트에서 실행되도록 한다
+    context = contextvars.copy_context()
+    interval = interval_ms / 1000
+    buffer: list[str] = []
+    buffer_id: str | None = None
+    buffered_bytes = 0
+    deadline: float | None = None
+    pending: asyncio.Future | None = None
+    watcher = asyncio.create_task(disconnect.wait()) if disconnect else None
+
+    def flush() -> str | None:
+        nonlocal buffered_bytes, deadline
+        if not buffer:
+            return None
+        frame = sse_event(_CONTENT, "".join(buffer), buffer_id)
+        buffer.clear()
+        buffered_bytes = 0
+        deadline = None
+        return frame
+
+    try:
+        while True:
+            if pending is None:
+                pending = asyncio.create_task(_next_event(events), context=context)
+
+            timeout = None if deadline is None else max(deadline - loop.time(), 0)
+            waiting = {pending} if watcher is None else {pending, watcher}
+            done, _ = await asyncio.wait(
+                waiting, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+            )
+            if watcher in done:
+                break
+            if pending not in done:
+                # 다음 delta가 늦어지면 모아 둔 content를 먼저 보낸다
+                yield flush()
+                continue
+
+            finished, pending = pending, None
+            try:
+                event_type, data, *event_id = finished.result()
+            except StopAsyncIteration:
+                break
+
+            if event_type == _CONTENT and interval_ms > 0:
+                buffer.append(data)
+                buffer_id = event_id[0] if event_id else None
+                buffered_bytes += len(data.encode("utf-8"))
+                if deadline is None:
+                    deadline = loop.time() + interval
+                if buffered_bytes >= max_bytes:
+                    yield flush()
+                continue
+
+            frame = flush()
+            if frame:
+                yield frame
+            yield sse_event(event_type, data, *event_id)
+
+        if watcher is None or not watcher.done():
+            frame = flush()
+            if frame:
+                yield frame
+    except asyncio.CancelledError:
+        # 서버가 연결 종료를 먼저 알아채 응답 태스크를 취소한 경우
+        if disconnect:
+            disconnect.mark()
+        raise
+    finally:
+        # 응답 태스크가 취소된 상태에서도 원본 스트림 정리는 끝까지 기다린다
+        with anyio.CancelScope(shield=True):
+            if watcher is not None:
+                watcher.cancel()
+            if pending is not None:
+                # 클라이언트가 끊기면 진행 중인 다음 이벤트 대기를 취소하고 원본 스트림을 정리한다
+                pending.cancel()
+                await asyncio.wait({pending})
+            await events.aclose()
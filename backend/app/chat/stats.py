@@ -0,0 +1,124 @@
+"""
+대화별 메시지 집계 (conversation_stats).
+
+대화 목록과 판매자 상세는 대화마다 메시지 수, 토큰 합계, 첫 질문을 보여 준다. 볼 때마다 messages를
+다시 집계하면 로그가 쌓일수록 느려지므로, 메시지를 저장하는 트랜잭션에서 저장한 만큼 더해 둔다.
+
+- record_messages: write-behind 저장(app.chat.persistence)이 배치를 INSERT하는 세션에서 호출한다.
+- backfill_stats: 이미 저장된 messages로 다시 계산해 덮어쓴다 (scripts.backfill_conversation_stats).
+
+토큰 수와 오류 수는 messages의 집계용 컬럼(input_tokens, output_tokens, is_error)으로, 중단 수는
+assistant 메시지 metadata의 aborted로 센다.
+"""
+
+from sqlalchemy import case, func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.chat.model import ConversationStats, Message, MessageRole
+
+# 첫 user 메시지 미리보기 글자 수
+FIRST_MESSAGE_CHARS = 50
+
+
+def _deltas(messages: list[Message]) -> list[dict]:
+    """메시지 배치를 대화별 증가분으로 묶는다. 잠금 순서가 일정하도록 대화 ID 순으로 반환한다."""
+    deltas: dict[int, dict] = {}
+    for m in messages:
+        delta = deltas.setdefault(m.conversation_id, {
+            "conversation_id": m.conversation_id,
+            "message_count": 0,
+            "input_tokens": 0,
+            "output_tokens": 0,
+            "first_message": None,
+            "last_message_at": m.created_at,
+            "error_count": 0,
+            "aborted_count": 0,
+        })
+        delta["message_count"] += 1
+        delta["last_message_at"] = max(delta["last_message_at"], m.created_at)
+        if m.role == MessageRole.USER:
+            if delta["first_message"] is None:
+                delta["first_message"] = m.content[:FIRST_MESSAGE_CHARS]
+        elif m.role == MessageRole.ASSISTANT:
+            delta["input_tokens"] += m.input_tokens or 0
+            delta["output_tokens"] += m.output_tokens or 0
+            delta["error_count"] += bool(m.is_error)
+            delta["aborted_count"] += bool(m.metadata_ and m.metadata_.get("aborted"))
+    return [deltas[conversation_id] for conversation_id in sorted(deltas)]
+
+
+async def record_messages(db: AsyncSession, messages: list[Message]) -> None:
+    """저장하는 메시지만큼 대화별 집계를 더한다. 커밋은 메시지 INSERT와 함께 호출한 쪽에서 한다."""
+    if not messages:
+        return
+    stmt = insert(ConversationStats).values(_deltas(messages))
+    excluded = stmt.excluded
+    await db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[ConversationStats.conversation_id],
+            set_={
+                "message_count": ConversationStats.message_count + excluded.message_count,
+                "input_tokens": ConversationStats.input_tokens + excluded.input_tokens,
+                "output_tokens": ConversationStats.output_tokens + excluded.output_tokens,
+                "first_message": func.coalesce(
+                    ConversationStats.first_message, excluded.first_message
+                ),
+                "last_message_at": func.greatest(
+                    ConversationStats.last_message_at, excluded.last_message_at
+                ),
+                "error_count": ConversationStats.error_count + excluded.error_count,
+                "aborted_count": ConversationStats.aborted_count + excluded.aborted_count,
+            },
+        )
+    )
+
+
+def backfill_stats(db: Session, conversation_ids: list[int]) -> None:
+    """conversation_ids의 집계를 messages로 다시 계산해 덮어쓴다. 메시지가 없는 대화는 건너뛴다."""
+    is_assistant = Message.role == MessageRole.ASSISTANT
+
+    def assistant_sum(value):
+        return func.coalesce(func.sum(case((is_assistant, value), else_=0)), 0)
+
+    first = (
+        select(
+            Message.conversation_id,
+            func.left(Message.content, FIRST_MESSAGE_CHARS).label("content"),
+        )
+        .distinct(Message.conversation_id)
+        .where(Message.conversation_id.in_(conversation_ids), Message.role == MessageRole.USER)
+        .order_by(Message.conversation_id, Message.created_at, Message.id)
+        .subquery()
+    )
+    totals = (
+        select(
+            Message.conversation_id,
+            func.count().label("message_count"),
+            assistant_sum(func.coalesce(Message.input_tokens, 0)).label("input_tokens"),
+            assistant_sum(func.coalesce(Message.output_tokens, 0)).label("output_tokens"),
+            func.max(Message.created_at).label("last_message_at"),
+            assistant_sum(case((Message.is_error, 1))).label("error_count"),
+            assistant_sum(case((Message.metadata_["aborted"].as_boolean().is_(True), 1)))
+            .label("aborted_count"),
+        )
+        .where(Message.conversation_id.in_(conversation_ids))
+        .group_by(Message.conversation_id)
+        .subquery()
+    )
+    columns = [
+        "conversation_id", "message_count", "input_tokens", "output_tokens",
+        "first_message", "last_message_at", "error_count", "aborted_count",
+    ]
+    rows = select(
+        *(first.c.content if column == "first_message" else totals.c[column] for column in columns)
+    ).outerjoin(first, first.c.conversation_id == totals.c.conversation_id)
+
+    stmt = insert(ConversationStats).from_select(columns, rows)
+    db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[ConversationStats.conversation_id],
+            set_={column: stmt.excluded[column] for column in columns[1:]},
+        )
+    )
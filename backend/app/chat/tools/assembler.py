@@ -0,0 +1,59 @@
+import json
+
+from app.chat.tools.runner import ToolCall
+
+
+class ToolCallAssembler:
+    """스트리밍 tool_call 청크를 누적하고, 인자가 완성된 call을 바로 돌려준다.
+
+    OpenAI는 tool call을 index 순서대로 하나씩 스트리밍하므로, 다음 index의 청크가 오거나
+    스트림이 그 call을 끝내면(finish_reason 또는 스트림 종료) 앞선 call의 인자는 완성된 것이다.
+    완성된 call을 바로 ToolRunner에 넘기면 나머지 응답을 받는 동안 tool이 실행된다.
+    """
+
+    def __init__(self):
+        self._chunks: dict[int, dict] = {}
+        self._completed: set[int] = set()
+        self._current: int | None = None
+
+    def add(self, tc) -> list[ToolCall]:
+        """청크를 누적하고, 이 청크로 인해 완성된 call 목록을 반환한다."""
+        completed = []
+        if self._current is not None and tc.index != self._current:
+            completed = self._complete(self._current)
+        self._current = tc.index
+
+        chunk = self._chunks.setdefault(tc.index, {"id": "", "name": "", "arguments": ""})
+        if tc.id:
+            chunk["id"] = tc.id
+        if tc.function and tc.function.name:
+            chunk["name"] += tc.function.name
+        if tc.function and tc.function.arguments:
+            chunk["arguments"] += tc.function.arguments
+        return completed
+
+    def finish(self) -> list[ToolCall]:
+        """스트림이 끝났을 때 아직 완성 처리되지 않은 call을 모두 반환한다."""
+        completed = []
+        for index in sorted(self._chunks):
+            completed += self._complete(index)
+        return completed
+
+    def __bool__(self) -> bool:
+        return bool(self._chunks)
+
+    def _complete(self, index: int) -> list[ToolCall]:
+        if index in self._completed:
+            return []
+        self._completed.add(index)
+
+        chunk = self._chunks[index]
+        return [
+            ToolCall(
+                index=index,
+                id=chunk["id"],
+                name=chunk["name"],
+                arguments=json.loads(chunk["arguments"]),
+                raw_arguments=chunk["arguments"],
+            )
+        ]
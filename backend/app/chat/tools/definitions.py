@@ -41,7 +41,7 @@ TOOL_DEFINITIONS = [
         "type": "function",
         "function": {
             "name": "list_products",
-            "description": "등록된 상품 목록을 조회한다. 특정 상품을 찾을 때는 name으로 검색한다.",
+            "description": "등록된 상품 목록을 최신순으로 조회한다. 특정 상품을 찾을 때는 name으로 검색한다. 결과는 columns/rows 표 형식이며, total은 조건에 맞는 전체 상품 수다. more(남은 상품 수)가 있으면 next_cursor를 cursor로 넘겨 이어서 조회한다.",
             "parameters": {
                 "type": "object",
                 "properties": {
@@ -54,6 +54,10 @@ TOOL_DEFINITIONS = [
                         "type": "string",
                         "description": "상품명 검색 키워드 (부분 일치)",
                     },
+                    "cursor": {
+                        "type": "string",
+                        "description": "이전 조회 결과의 next_cursor (다음 페이지 조회 시에만)",
+                    },
                 },
             },
         },
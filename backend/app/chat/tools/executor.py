@@ -1,76 +1,158 @@
+import json
 from dataclasses import dataclass
 
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.shared.config import settings
 from app.shared.display_id import parse_pk, to_display_id
-from app.guide.service import search_guide
-from app.product.service import create_product, delete_product, list_products, update_product
+from app.shared.metrics import measure_tool
+from app.guide.service import search_guide_async
+from app.product.service import (
+    ProductPage,
+    create_product_async,
+    delete_product_async,
+    list_products_page_async,
+    update_product_async,
+)
+
+# DB 상태를 변경하는 tool. 조회 tool과 순서가 섞이지 않도록 실행 순서를 보장해야 한다.
+MUTATING_TOOLS = {"create_product", "update_product", "delete_product"}
+
+# tool 결과에 넣는 상품 필드. 모델 답변에 필요 없는 생성/수정 시각은 뺀다
+PRODUCT_COLUMNS = ["id", "name", "price", "status"]
+
+
+class ToolResultCache:
+    """한 채팅 턴 안에서 같은 인자로 반복 호출된 조회 tool의 결과를 재사용한다.
+
+    키는 tool 이름 + 정규화한 인자(None 값 제거, 키 정렬)이다.
+    변경 tool이 실행되면 조회 결과가 달라질 수 있으므로 저장된 결과를 모두 버린다.
+    턴(= 판매자 한 명의 요청) 단위로 만들어 쓰고 버린다.
+    """
+
+    def __init__(self):
+        self._results: dict[tuple[str, str], dict] = {}
+
+    def get(self, tool_name: str, arguments: dict) -> dict | None:
+        return self._results.get(self._key(tool_name, arguments))
+
+    def record(self, tool_name: str, arguments: dict, result: dict) -> None:
+        if tool_name in MUTATING_TOOLS:
+            self._results.clear()
+        elif "error" not in result:
+            self._results[self._key(tool_name, arguments)] = result
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+    @staticmethod
+    def _key(tool_name: str, arguments: dict) -> tuple[str, str]:
+        canonical = {k: v for k, v in arguments.items() if v is not None}
+        return tool_name, json.dumps(canonical, sort_keys=True, ensure_ascii=False)
 
 
 @dataclass
 class ToolContext:
-    db: Session
+    db: AsyncSession
     seller_id: int
+    cache: ToolResultCache | None = None
 
 
-def execute_tool(ctx: ToolContext, tool_name: str, arguments: dict) -> dict:
+async def execute_tool(ctx: ToolContext, tool_name: str, arguments: dict) -> dict:
     """tool_name에 해당하는 함수를 실행하고 결과를 dict로 반환한다."""
     handler = _TOOL_HANDLERS.get(tool_name)
 
     if handler is None:
         return {"error": f"알 수 없는 tool: {tool_name}"}
 
+    cached = ctx.cache.get(tool_name, arguments) if ctx.cache is not None else None
+    if cached is not None:
+        return cached
+
     try:
-        return handler(ctx, arguments)
+        with measure_tool(tool_name):
+            result = await handler(ctx, arguments)
     except ValueError as e:
-        return {"error": str(e)}
+        result = {"error": str(e)}
 
+    if ctx.cache is not None:
+        ctx.cache.record(tool_name, arguments, result)
+    return result
 
-def _handle_search_guide(ctx: ToolContext, arguments: dict) -> dict:
-    query = arguments["query"]
-    results = search_guide(ctx.db, query)
-    return {"results": results, "total": len(results)}
+
+async def _handle_search_guide(ctx: ToolContext, arguments: dict) -> dict:
+    results = await search_guide_async(ctx.db, arguments["query"])
+    return _search_guide_result(results)
 
 
-def _handle_create_product(ctx: ToolContext, arguments: dict) -> dict:
-    product = create_product(
+async def _handle_create_product(ctx: ToolContext, arguments: dict) -> dict:
+    product = await create_product_async(
         ctx.db, seller_id=ctx.seller_id, name=arguments["name"], price=arguments["price"]
     )
     return _product_to_dict(product)
 
 
-def _handle_list_products(ctx: ToolContext, arguments: dict) -> dict:
-    status = arguments.get("status")
-    name = arguments.get("name")
-    products = list_products(ctx.db, seller_id=ctx.seller_id, status=status, name=name)
+async def _handle_list_products(ctx: ToolContext, arguments: dict) -> dict:
+    page = await list_products_page_async(ctx.db, **_list_products_args(ctx, arguments))
+    return _list_products_result(page)
+
+
+def _list_products_args(ctx: ToolContext, arguments: dict) -> dict:
+    cursor = arguments.get("cursor")
     return {
-        "products": [_product_to_dict(p) for p in products],
-        "total": len(products),
+        "seller_id": ctx.seller_id,
+        "limit": settings.tool_result_page_size,
+        "status": arguments.get("status"),
+        "name": arguments.get("name"),
+        "before_id": parse_pk(cursor, "products") if cursor else None,
     }
 
 
-def _handle_update_product(ctx: ToolContext, arguments: dict) -> dict:
+async def _handle_update_product(ctx: ToolContext, arguments: dict) -> dict:
     product_id = parse_pk(arguments["id"], "products")
     fields = {k: v for k, v in arguments.items() if k != "id"}
-    product = update_product(ctx.db, seller_id=ctx.seller_id, product_id=product_id, **fields)
+    product = await update_product_async(
+        ctx.db, seller_id=ctx.seller_id, product_id=product_id, **fields
+    )
     return _product_to_dict(product)
 
 
-def _handle_delete_product(ctx: ToolContext, arguments: dict) -> dict:
+async def _handle_delete_product(ctx: ToolContext, arguments: dict) -> dict:
     product_id = parse_pk(arguments["id"], "products")
-    product = delete_product(ctx.db, seller_id=ctx.seller_id, product_id=product_id)
+    product = await delete_product_async(ctx.db, seller_id=ctx.seller_id, product_id=product_id)
     return _product_to_dict(product)
 
 
-def _product_to_dict(product) -> dict:
-    return {
-        "id": to_display_id("products", product.id),
-        "name": product.name,
-        "price": product.price,
-        "status": product.status.value,
-        "created_at": product.created_at.isoformat(),
-        "updated_at": product.updated_at.isoformat(),
+def _search_guide_result(results: list[dict]) -> dict:
+    return {"results": results, "total": len(results)}
+
+
+def _list_products_result(page: ProductPage) -> dict:
+    """상품 목록을 헤더(columns) + 값 행(rows) 형태로 만든다.
+
+    다음 iteration마다 모델에게 다시 전달되므로 한 번에 page_size개까지만 담는다.
+    total은 어느 페이지에서든 조건에 맞는 전체 상품 수이고, 이 페이지 뒤에 남은 상품이 있으면
+    그 개수(more)와 이어서 조회할 cursor를 함께 준다.
+    """
+    result = {
+        "columns": PRODUCT_COLUMNS,
+        "rows": [_product_row(p) for p in page.products],
+        "total": page.total,
     }
+    if page.remaining > 0:
+        result["more"] = page.remaining
+        result["next_cursor"] = to_display_id("products", page.products[-1].id)
+    return result
+
+
+def _product_row(product) -> list:
+    return [
+        to_display_id("products", product.id), product.name, product.price, product.status.value
+    ]
+
+
+def _product_to_dict(product) -> dict:
+    return dict(zip(PRODUCT_COLUMNS, _product_row(product)))
 
 
 _TOOL_HANDLERS = {
@@ -0,0 +1,129 @@
+import asyncio
+import weakref
+from collections.abc import AsyncGenerator, Callable
+from dataclasses import dataclass
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.shared.config import settings
+from app.shared.database import AsyncSessionLocal
+from app.chat.tools.executor import (
+    MUTATING_TOOLS,
+    ToolContext,
+    ToolResultCache,
+    execute_tool,
+)
+
+
+# 이벤트 루프별 tool 실행 슬롯. 서버는 루프가 하나이므로 프로세스 전체에서 공유된다
+_worker_slots: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _tool_workers() -> asyncio.Semaphore:
+    loop = asyncio.get_running_loop()
+    workers = _worker_slots.get(loop)
+    if workers is None:
+        workers = _worker_slots[loop] = asyncio.Semaphore(settings.tool_max_workers)
+    return workers
+
+
+@dataclass
+class ToolCall:
+    """LLM이 요청한 tool call 한 건과 실행 결과."""
+
+    index: int
+    id: str
+    name: str
+    arguments: dict
+    raw_arguments: str
+    result: dict | None = None
+    # pending → running → done. 실행 전이나 조회 중에 취소되면 cancelled, 예외가 나면 failed
+    status: str = "pending"
+
+
+class ToolRunner:
+    """한 iteration의 tool call들을 병렬 실행한다.
+
+    - 조회 tool끼리는 동시에 실행된다.
+    - 변경 tool(create/update/delete)은 앞서 요청된 tool이 모두 끝난 뒤 실행되고,
+      뒤에 요청된 tool은 그 변경이 끝난 뒤 실행된다. (순차 실행과 같은 결과 보장)
+    - 동시에 실행되는 tool은 프로세스 전체(모든 채팅 요청 합산)에서 settings.tool_max_workers개로
+      제한하고, tool마다 별도의 DB 세션을 사용한다.
+    - cancel()은 아직 시작하지 않은 tool과 조회 tool만 취소한다. 이미 시작한 변경 tool은 커밋
+      도중에 끊기지 않도록 끝까지 실행된다.
+    - cache를 넘기면 같은 턴의 이전 iteration에서 실행한 조회 결과를 재사용한다.
+    """
+
+    def __init__(
+        self,
+        seller_id: int | None,
+        session_factory: Callable[[], AsyncSession] = AsyncSessionLocal,
+        cache: ToolResultCache | None = None,
+    ):
+        self._seller_id = seller_id
+        self._session_factory = session_factory
+        self._cache = cache
+        self._workers = _tool_workers()
+        self._events: asyncio.Queue = asyncio.Queue()
+        self._tasks: list[asyncio.Task] = []
+        self._since_barrier: list[asyncio.Task] = []
+        self._barrier: asyncio.Task | None = None
+        self.calls: list[ToolCall] = []
+
+    def submit(self, call: ToolCall) -> None:
+        """tool 실행을 예약한다. 결과는 call.result에 채워진다."""
+        if call.name in MUTATING_TOOLS:
+            deps = self._since_barrier + ([self._barrier] if self._barrier else [])
+        else:
+            deps = [self._barrier] if self._barrier else []
+
+        task = asyncio.create_task(self._run(call, deps))
+
+        if call.name in MUTATING_TOOLS:
+            self._barrier = task
+            self._since_barrier = []
+        else:
+            self._since_barrier.append(task)
+
+        self._tasks.append(task)
+        self.calls.append(call)
+
+    async def events(self) -> AsyncGenerator[tuple[str, ToolCall], None]:
+        """("tool_call" | "tool_result", call) 이벤트를 발생 순서대로 내보낸다."""
+        remaining = len(self._tasks)
+        while remaining:
+            kind, payload = await self._events.get()
+            if kind == "error":
+                raise payload
+            if kind == "tool_result":
+                remaining -= 1
+            yield kind, payload
+
+    def ordered_calls(self) -> list[ToolCall]:
+        """LLM에 돌려줄 순서(tool call index 순)로 정렬된 call 목록."""
+        return sorted(self.calls, key=lambda c: c.index)
+
+    def cancel(self) -> None:
+        for call, task in zip(self.calls, self._tasks):
+            if task.done() or (call.name in MUTATING_TOOLS and call.status == "running"):
+                continue
+            task.cancel()
+            call.status = "cancelled"
+
+    async def _run(self, call: ToolCall, deps: list[asyncio.Task]) -> None:
+        try:
+            if deps:
+                await asyncio.wait(deps)
+            async with self._workers:
+                call.status = "running"
+                self._events.put_nowait(("tool_call", call))
+                async with self._session_factory() as db:
+                    ctx = ToolContext(db=db, seller_id=self._seller_id, cache=self._cache)
+                    call.result = await execute_tool(ctx, call.name, call.arguments)
+            call.status = "done"
+            self._events.put_nowait(("tool_result", call))
+        except Exception as e:
+            call.status = "failed"
+            self._events.put_nowait(("error", e))
@@ -0,0 +1,159 @@
+"""
+LLM 요청에 포함할 tool 스키마 선택.
+
+tool 스키마는 매 LLM 요청의 입력 토큰에 들어가므로, 사용자 메시지가 어느 도메인에 대한 것인지
+로컬에서 먼저 분류해 관련 도메인의 tool만 보낸다. 키워드 규칙으로 먼저 판단하고, 규칙에 걸리지
+않으면 라벨링된 예시 문장과의 임베딩 유사도로 판단한다. 어느 쪽으로도 확신할 수 없으면 전체
+tool을 보낸다. 새 도메인의 tool을 추가할 때는 TOOL_DOMAINS, 키워드, 예시를 함께 추가한다.
+
+이어지는 턴은 메시지만으로 도메인을 알기 어렵다("응, 그렇게 해줘", "네"). 그래서 직전 턴에 보낸
+도메인을 함께 포함하고, 짧거나 앞 내용을 가리키는 메시지, 키워드에 걸리지 않는 메시지에는 전체
+tool을 보낸다. 임베딩 분류는 첫 턴에만 쓰며, 첫 토큰을 늦추지 않도록 시간 상한을 둔다.
+"""
+
+import asyncio
+import logging
+import math
+from dataclasses import dataclass
+
+from app.chat.tools.definitions import TOOL_DEFINITIONS
+from app.shared.config import settings
+from app.shared.embedding import embed_text_async, embed_texts_async
+
+logger = logging.getLogger(__name__)
+
+TOOL_DOMAINS: dict[str, frozenset[str]] = {
+    "guide": frozenset({"search_guide"}),
+    "product": frozenset({"create_product", "list_products", "update_product", "delete_product"}),
+}
+
+_KEYWORDS: dict[str, tuple[str, ...]] = {
+    "guide": (
+        "가이드", "방법", "어떻게", "설정", "연동", "도메인", "디자인", "배송", "결제", "쿠폰",
+        "회원", "메뉴", "기능",
+    ),
+    # "회원 전용 에코백 있어?"처럼 상품명을 묻는 질문은 가이드 키워드가 섞여도 상품 조회가 필요하다
+    "product": (
+        "상품", "가격", "재고", "품절", "판매중", "판매 중", "숨김", "숨겨", "있어", "있나요",
+        "있는지", "삭제", "지워",
+    ),
+}
+
+# 앞 턴의 내용을 가리키는 표현. 이런 메시지는 앞 턴의 tool이 다시 필요할 수 있다
+_ANAPHORA = (
+    "그거", "그것", "그걸", "이거", "이것", "이걸", "저거", "그렇게", "그대로", "그럼", "아까", "방금",
+    "위에", "위의",
+)
+# 이 글자 수 이하의 이어지는 메시지("네", "응 해줘")는 메시지만으로 도메인을 판단하지 않는다
+_SHORT_MESSAGE_CHARS = 10
+
+_EXAMPLES: list[tuple[str, str]] = [
+    ("쇼핑몰 배송비는 어디서 바꾸나요?", "guide"),
+    ("카드 결제를 추가하고 싶어요", "guide"),
+    ("회원 등급별 할인 적용이 되나요?", "guide"),
+    ("사이트 메인 화면을 꾸미고 싶어요", "guide"),
+    ("스마트스토어랑 같이 쓸 수 있어요?", "guide"),
+    ("주문 취소는 어떻게 처리해요?", "guide"),
+    ("지금 팔고 있는 거 보여줘", "product"),
+    ("티셔츠 25000원으로 바꿔줘", "product"),
+    ("새 제품 하나 올려줘", "product"),
+    ("안 팔리는 거 지워줘", "product"),
+    ("후드티 이름을 바꿔줘", "product"),
+    ("등록된 물건 몇 개야?", "product"),
+]
+
+# 예시 문장 임베딩. 첫 분류 때 한 번만 계산한다
+_example_embeddings: list[list[float]] | None = None
+
+
+@dataclass
+class ToolSelection:
+    domains: list[str]
+    tools: list[dict]
+
+
+def classify_by_keywords(message: str) -> set[str]:
+    return {domain for domain, words in _KEYWORDS.items() if any(w in message for w in words)}
+
+
+async def classify_by_examples(message: str, embedding: list[float] | None = None) -> set[str]:
+    """예시 문장과의 유사도로 도메인을 고른다. 최고 유사도가 기준 미만이면 빈 집합.
+
+    1위 도메인과 유사도 차이가 margin 이내인 도메인은 함께 고른다.
+    """
+    global _example_embeddings
+    if _example_embeddings is None:
+        _example_embeddings = await embed_texts_async([text for text, _ in _EXAMPLES])
+    if embedding is None:
+        embedding = await embed_text_async(message)
+
+    best: dict[str, float] = {}
+    for (_, domain), example in zip(_EXAMPLES, _example_embeddings):
+        best[domain] = max(best.get(domain, -1.0), _cosine_similarity(embedding, example))
+
+    top = max(best.values())
+    if top < settings.tool_selection_min_similarity:
+        return set()
+    return {d for d, score in best.items() if top - score <= settings.tool_selection_margin}
+
+
+def is_contextual(message: str) -> bool:
+    """앞 턴 없이는 의도를 알 수 없는 메시지인지 (짧은 대답, 지시 표현)."""
+    text = message.strip()
+    return len(text) <= _SHORT_MESSAGE_CHARS or any(word in text for word in _ANAPHORA)
+
+
+async def select_tools(
+    message: str,
+    embedding: list[float] | None = None,
+    follow_up: bool = False,
+    previous_domains: list[str] | None = None,
+) -> ToolSelection:
+    """메시지에 필요한 tool 스키마를 고른다. domains가 비어 있으면 전체 tool을 보낸 것이다.
+
+    follow_up은 대화의 두 번째 이후 턴인지, previous_domains는 직전 턴에 보낸 도메인이다.
+    """
+    if not settings.tool_selection_enabled:
+        return _all_tools()
+
+    if follow_up and is_contextual(message):
+        return _all_tools()
+
+    domains = classify_by_keywords(message)
+    if not domains:
+        if follow_up:
+            return _all_tools()
+        try:
+            domains = await asyncio.wait_for(
+                classify_by_examples(message, embedding),
+                timeout=settings.tool_selection_timeout_ms / 1000,
+            )
+        except Exception as e:
+            logger.warning(f"tool 도메인 분류 실패, 전체 tool 사용: {e!r}")
+            domains = set()
+
+    domains |= set(previous_domains or ())
+    if not domains or domains == TOOL_DOMAINS.keys():
+        return _all_tools()
+    return ToolSelection(domains=sorted(domains), tools=tools_for(domains))
+
+
+def _all_tools() -> ToolSelection:
+    return ToolSelection(domains=[], tools=TOOL_DEFINITIONS)
+
+
+def tools_for(domains: set[str]) -> list[dict]:
+    """선택한 도메인의 tool과 어느 도메인에도 속하지 않은 tool을 정의 순서대로 반환한다."""
+    all_domain_tools = frozenset().union(*TOOL_DOMAINS.values())
+    selected = frozenset().union(*(TOOL_DOMAINS[d] for d in domains))
+    return [
+        tool for tool in TOOL_DEFINITIONS
+        if tool["function"]["name"] in selected
+        or tool["function"]["name"] not in all_domain_tools
+    ]
+
+
+def _cosine_similarity(a: list[float], b: list[float]) -> float:
+    dot = sum(x * y for x, y in zip(a, b))
+    norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+    return dot / norm if norm else 0.0
@@ -3,12 +3,14 @@ from dataclasses import dataclass, field
 
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.guide.model import GuideChunk, GuideDocument
 from app.shared.crawling import ContentFormat, get_parser
 from app.shared.crawling.crawler import crawl_site
-from app.shared.embedding import embed_text, embed_texts
+from app.shared.embedding import embed_text, embed_text_async, embed_texts
+from app.shared.metrics import measure
 
 logger = logging.getLogger(__name__)
 
@@ -166,8 +168,21 @@ def crawl_guide_site(
 def search_guide(db: Session, query: str, top_k: int = 3) -> list[dict]:
     """사용자 질문과 유사한 가이드 청크를 검색한다."""
     query_vector = embed_text(query)
+    with measure("vector_query"):
+        results = db.execute(_similar_chunks_query(query_vector, top_k)).all()
+    return _to_search_results(results)
 
-    results = db.execute(
+
+async def search_guide_async(db: AsyncSession, query: str, top_k: int = 3) -> list[dict]:
+    """search_guide의 비동기 버전. 채팅 agent loop에서 사용한다."""
+    query_vector = await embed_text_async(query)
+    with measure("vector_query"):
+        results = (await db.execute(_similar_chunks_query(query_vector, top_k))).all()
+    return _to_search_results(results)
+
+
+def _similar_chunks_query(query_vector: list[float], top_k: int):
+    return (
         select(
             GuideChunk,
             GuideDocument,
@@ -176,8 +191,10 @@ def search_guide(db: Session, query: str, top_k: int = 3) -> list[dict]:
         .join(GuideDocument, GuideChunk.document_id == GuideDocument.id)
         .order_by("distance")
         .limit(top_k)
-    ).all()
+    )
+
 
+def _to_search_results(results) -> list[dict]:
     return [
         {
             "title": doc.title,
@@ -1,29 +1,37 @@
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI, Depends
+from fastapi import FastAPI, Depends, Response
 from fastapi.middleware.cors import CORSMiddleware
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 from sqlalchemy import text
 from sqlalchemy.orm import Session
 
 from app.shared.config import APP_NAME, settings
 from app.shared.schema import ErrorResponse
-from app.shared.database import Base, engine, get_db
+from app.shared.database import async_engine, engine, get_db
+from app.shared.migration import check_revision
 from app.seller.model import Seller  # noqa: F401
 from app.product.model import Product  # noqa: F401
 from app.chat.model import Conversation, Message  # noqa: F401
 from app.guide.model import GuideDocument, GuideChunk  # noqa: F401
 from app.seller.router import router as seller_router
 from app.chat.router import router as chat_router
+from app.chat.batch import batch_pool
+from app.chat.persistence import message_writer
 from app.product.router import router as products_router
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    with engine.connect() as conn:
-        conn.execute(text("CREATE EXTENSION IF NOT EXISTS vector"))
-        conn.commit()
-    Base.metadata.create_all(bind=engine)
+    # 스키마 변경은 배포 단계의 scripts.migrate가 한다. 여기서는 revision만 확인한다
+    check_revision(engine)
+    message_writer.start()
+    await batch_pool.start()
     yield
+    # 배치 워커를 멈추고, 중단 메시지까지 큐에 남은 메시지를 저장한 뒤 연결을 정리한다
+    await batch_pool.stop()
+    await message_writer.stop()
+    await async_engine.dispose()
 
 
 app = FastAPI(
@@ -50,6 +58,12 @@ def read_root():
     return {"message": APP_NAME, "status": "ok"}
 
 
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    """Prometheus 수집용 지표."""
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
+
 @app.get("/health")
 def health_check():
     return {"status": "healthy"}
@@ -0,0 +1,14 @@
+"""pgvector 확장 + 모델 기준 테이블 생성 (없는 테이블만)."""
+
+from sqlalchemy import Connection, text
+
+from app.shared.database import Base
+import app.seller.model  # noqa: F401 — create_all 대상 등록
+import app.product.model  # noqa: F401
+import app.chat.model  # noqa: F401
+import app.guide.model  # noqa: F401
+
+
+def upgrade(conn: Connection) -> None:
+    conn.execute(text("CREATE EXTENSION IF NOT EXISTS vector"))
+    Base.metadata.create_all(bind=conn)
@@ -0,0 +1,104 @@
+"""
+revision 관리 이전에 scripts/migrate_*.py로 하던 변경을 한 번에 적용한다.
+
+create_all은 이미 있는 테이블에 컬럼을 추가하지 않으므로, 예전 DB에 빠져 있을 수 있는 컬럼을
+추가하고 예전 형식의 데이터를 옮긴다. 새 DB에서는 아무 것도 바꾸지 않는다.
+"""
+
+from sqlalchemy import Connection, select, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.seller.model import Seller
+from app.chat.model import Conversation, ConversationStats
+from app.chat.stats import backfill_stats
+
+# app.chat.prompt_version.prompt_hash와 같은 값 (UTF-8 SHA-256 hex)
+_HASH_SQL = "encode(sha256(convert_to(metadata->>'system_prompt', 'UTF8')), 'hex')"
+
+
+def upgrade(conn: Connection) -> None:
+    _add_seller(conn)
+    conn.execute(text(
+        "ALTER TABLE products ADD COLUMN IF NOT EXISTS is_deleted BOOLEAN NOT NULL DEFAULT FALSE"
+    ))
+    conn.execute(text("ALTER TABLE conversations ADD COLUMN IF NOT EXISTS summary TEXT"))
+    conn.execute(text(
+        "ALTER TABLE conversations "
+        "ADD COLUMN IF NOT EXISTS summary_message_count INTEGER NOT NULL DEFAULT 0"
+    ))
+    _hash_system_prompts(conn)
+    _add_message_columns(conn)
+    _backfill_conversation_stats(conn)
+
+
+def _add_seller(conn: Connection) -> None:
+    """conversations.seller_id 추가 + 판매자가 없는 기존 대화에 기본 판매자 할당."""
+    conn.execute(text(
+        "ALTER TABLE conversations "
+        "ADD COLUMN IF NOT EXISTS seller_id INTEGER REFERENCES sellers(id)"
+    ))
+    if conn.execute(text("SELECT 1 FROM conversations WHERE seller_id IS NULL LIMIT 1")).first():
+        stmt = insert(Seller).values(nickname="초기-판매자-0")
+        seller_id = conn.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[Seller.nickname], set_={"nickname": stmt.excluded.nickname}
+            ).returning(Seller.id)
+        ).scalar()
+        conn.execute(
+            text("UPDATE conversations SET seller_id = :sid WHERE seller_id IS NULL"),
+            {"sid": seller_id},
+        )
+
+
+def _hash_system_prompts(conn: Connection) -> None:
+    """messages.metadata의 system_prompt 원문을 prompt_versions 해시 참조로 바꾼다."""
+    conn.execute(text(f"""
+        INSERT INTO prompt_versions (id, content)
+        SELECT DISTINCT {_HASH_SQL}, metadata->>'system_prompt'
+        FROM messages
+        WHERE metadata->>'system_prompt' IS NOT NULL
+        ON CONFLICT (id) DO NOTHING
+    """))
+    conn.execute(text(f"""
+        UPDATE messages
+        SET metadata = (metadata - 'system_prompt') || CASE
+            WHEN metadata->>'system_prompt' IS NULL THEN '{{}}'::jsonb
+            ELSE jsonb_build_object('system_prompt_id', {_HASH_SQL})
+        END
+        WHERE metadata ? 'system_prompt'
+    """))
+
+
+def _add_message_columns(conn: Connection) -> None:
+    """messages 집계용 컬럼 추가 + metadata(JSONB)에서 채우기."""
+    conn.execute(text("""
+        ALTER TABLE messages
+            ADD COLUMN IF NOT EXISTS input_tokens INTEGER,
+            ADD COLUMN IF NOT EXISTS output_tokens INTEGER,
+            ADD COLUMN IF NOT EXISTS response_time_ms INTEGER,
+            ADD COLUMN IF NOT EXISTS model VARCHAR(100),
+            ADD COLUMN IF NOT EXISTS is_error BOOLEAN NOT NULL DEFAULT false
+    """))
+    conn.execute(text("""
+        UPDATE messages
+        SET input_tokens = (metadata->>'input_tokens')::int,
+            output_tokens = (metadata->>'output_tokens')::int,
+            response_time_ms = (metadata->>'response_time_ms')::int,
+            model = metadata->>'model',
+            is_error = coalesce(metadata->>'error', '') <> ''
+        WHERE jsonb_typeof(metadata) = 'object' AND model IS NULL
+    """))
+
+
+def _backfill_conversation_stats(conn: Connection) -> None:
+    """집계 행이 없는 대화의 conversation_stats를 messages로 채운다."""
+    conversation_ids = conn.execute(
+        select(Conversation.id).where(
+            ~select(ConversationStats.conversation_id)
+            .where(ConversationStats.conversation_id == Conversation.id)
+            .exists()
+        )
+    ).scalars().all()
+    if conversation_ids:
+        backfill_stats(Session(bind=conn), conversation_ids)
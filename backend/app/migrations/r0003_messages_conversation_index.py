@@ -0,0 +1,13 @@
+"""대화 메시지 목록 (conversation_id, created_at) 키셋 조회용 인덱스."""
+
+from sqlalchemy import Connection
+
+from app.shared.migration import create_index_concurrently
+
+TRANSACTIONAL = False
+
+
+def upgrade(conn: Connection) -> None:
+    create_index_concurrently(
+        conn, "ix_messages_conversation_id_created_at", "messages (conversation_id, created_at)"
+    )
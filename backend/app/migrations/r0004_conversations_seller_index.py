@@ -0,0 +1,15 @@
+"""판매자별 최근 수정순 대화 목록용 인덱스."""
+
+from sqlalchemy import Connection
+
+from app.shared.migration import create_index_concurrently
+
+TRANSACTIONAL = False
+
+
+def upgrade(conn: Connection) -> None:
+    create_index_concurrently(
+        conn,
+        "ix_conversations_seller_id_updated_at",
+        "conversations (seller_id, updated_at DESC)",
+    )
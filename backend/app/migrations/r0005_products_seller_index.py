@@ -0,0 +1,15 @@
+"""판매자별 삭제되지 않은 상품 목록(최신순)용 부분 인덱스."""
+
+from sqlalchemy import Connection
+
+from app.shared.migration import create_index_concurrently
+
+TRANSACTIONAL = False
+
+
+def upgrade(conn: Connection) -> None:
+    create_index_concurrently(
+        conn,
+        "ix_products_seller_id_id_active",
+        "products (seller_id, id DESC) WHERE NOT is_deleted",
+    )
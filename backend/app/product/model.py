@@ -1,7 +1,7 @@
 import enum
 from datetime import datetime
 
-from sqlalchemy import Boolean, Integer, Enum, DateTime, String, ForeignKey, func
+from sqlalchemy import Boolean, Integer, Enum, DateTime, String, ForeignKey, Index, func
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.shared.database import Base
@@ -29,3 +29,12 @@ class Product(Base):
     updated_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
     )
+
+
+# 판매자별 삭제되지 않은 상품 목록, 최신순 (app.migrations.r0005)
+Index(
+    "ix_products_seller_id_id_active",
+    Product.seller_id,
+    Product.id.desc(),
+    postgresql_where=~Product.is_deleted,
+)
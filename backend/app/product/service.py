@@ -1,3 +1,7 @@
+from dataclasses import dataclass
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.product.model import Product, ProductStatus
@@ -5,6 +9,15 @@ from app.product.model import Product, ProductStatus
 _UPDATABLE_FIELDS = {"name", "price", "status"}
 
 
+@dataclass
+class ProductPage:
+    products: list[Product]
+    # 커서와 관계없이 조건에 맞는 전체 상품 수
+    total: int
+    # 이 페이지 뒤에 남은 상품 수
+    remaining: int
+
+
 def _validate_price(price: int) -> None:
     if price < 0:
         raise ValueError("가격은 0원 이상이어야 합니다")
@@ -24,24 +37,42 @@ def create_product(db: Session, seller_id: int, name: str, price: int) -> Produc
     return product
 
 
+async def create_product_async(
+    db: AsyncSession, seller_id: int, name: str, price: int
+) -> Product:
+    """create_product의 비동기 버전."""
+    _validate_price(price)
+    product = Product(
+        name=name,
+        price=price,
+        seller_id=seller_id,
+    )
+    db.add(product)
+    await db.commit()
+    await db.refresh(product)
+    return product
+
+
 def update_product(db: Session, seller_id: int, product_id: int, **fields) -> Product:
     """상품 정보를 수정한다. name, price, status만 변경 가능."""
     product = _get_product_or_raise(db, seller_id, product_id)
-
-    for key, value in fields.items():
-        if key not in _UPDATABLE_FIELDS:
-            raise ValueError(f"수정할 수 없는 필드: {key}")
-        if key == "price":
-            _validate_price(value)
-        if key == "status":
-            value = ProductStatus(value)
-        setattr(product, key, value)
-
+    _apply_updates(product, fields)
     db.commit()
     db.refresh(product)
     return product
 
 
+async def update_product_async(
+    db: AsyncSession, seller_id: int, product_id: int, **fields
+) -> Product:
+    """update_product의 비동기 버전."""
+    product = await _get_product_or_raise_async(db, seller_id, product_id)
+    _apply_updates(product, fields)
+    await db.commit()
+    await db.refresh(product)
+    return product
+
+
 def delete_product(db: Session, seller_id: int, product_id: int) -> Product:
     """상품을 삭제한다. (soft delete: is_deleted = True)"""
     product = _get_product_or_raise(db, seller_id, product_id)
@@ -51,6 +82,15 @@ def delete_product(db: Session, seller_id: int, product_id: int) -> Product:
     return product
 
 
+async def delete_product_async(db: AsyncSession, seller_id: int, product_id: int) -> Product:
+    """delete_product의 비동기 버전."""
+    product = await _get_product_or_raise_async(db, seller_id, product_id)
+    product.is_deleted = True
+    await db.commit()
+    await db.refresh(product)
+    return product
+
+
 def list_products(
     db: Session,
     seller_id: int | None = None,
@@ -58,33 +98,95 @@ def list_products(
     name: str | None = None,
 ) -> list[Product]:
     """상품 목록을 조회한다. 삭제된 상품은 제외."""
-    query = db.query(Product).filter(Product.is_deleted == False)  # noqa: E712
+    query = _list_products_query(seller_id=seller_id, status=status, name=name)
+    return list(db.execute(query).scalars().all())
+
+
+async def list_products_page_async(
+    db: AsyncSession,
+    seller_id: int,
+    limit: int,
+    status: str | None = None,
+    name: str | None = None,
+    before_id: int | None = None,
+) -> ProductPage:
+    """before_id보다 오래된 상품을 최신순으로 최대 limit개 조회한다."""
+    query = _list_products_query(seller_id=seller_id, status=status, name=name)
+    total = select(func.count()).select_from(query.order_by(None).subquery())
+
+    page = query if before_id is None else query.where(Product.id < before_id)
+    # 두 개수 모두 LIMIT 적용 전에 계산되므로 페이지와 한 쿼리로 함께 구한다
+    rows = (
+        await db.execute(
+            page.add_columns(
+                total.scalar_subquery().label("total"),
+                func.count().over().label("matched"),
+            ).limit(limit)
+        )
+    ).all()
+
+    if not rows:
+        # 커서 뒤가 비어 있으면(그 사이 삭제 등) 전체 개수만 따로 센다
+        count = 0 if before_id is None else (await db.execute(total)).scalar_one()
+        return ProductPage(products=[], total=count, remaining=0)
+    products = [row.Product for row in rows]
+    return ProductPage(
+        products=products, total=rows[0].total, remaining=rows[0].matched - len(products)
+    )
+
+
+def _list_products_query(
+    seller_id: int | None, status: str | None, name: str | None
+):
+    query = select(Product).where(Product.is_deleted == False)  # noqa: E712
 
     if seller_id is not None:
-        query = query.filter(Product.seller_id == seller_id)
+        query = query.where(Product.seller_id == seller_id)
 
     if status is not None:
-        query = query.filter(Product.status == ProductStatus(status))
+        query = query.where(Product.status == ProductStatus(status))
 
     if name is not None:
-        query = query.filter(Product.name.ilike(f"%{name}%"))
+        query = query.where(Product.name.ilike(f"%{name}%"))
 
-    return query.order_by(Product.id.desc()).all()
+    return query.order_by(Product.id.desc())
+
+
+def _apply_updates(product: Product, fields: dict) -> None:
+    for key, value in fields.items():
+        if key not in _UPDATABLE_FIELDS:
+            raise ValueError(f"수정할 수 없는 필드: {key}")
+        if key == "price":
+            _validate_price(value)
+        if key == "status":
+            value = ProductStatus(value)
+        setattr(product, key, value)
 
 
 def _get_product_or_raise(db: Session, seller_id: int, product_id: int) -> Product:
     """seller_id에 속한 삭제되지 않은 상품을 조회한다. 없으면 ValueError."""
-    product = (
-        db.query(Product)
-        .filter(
-            Product.id == product_id,
-            Product.seller_id == seller_id,
-            Product.is_deleted == False,  # noqa: E712
-        )
-        .first()
-    )
+    product = db.execute(_product_query(seller_id, product_id)).scalar_one_or_none()
 
     if product is None:
         raise ValueError(f"상품을 찾을 수 없습니다 (id={product_id})")
 
     return product
+
+
+async def _get_product_or_raise_async(
+    db: AsyncSession, seller_id: int, product_id: int
+) -> Product:
+    product = (await db.execute(_product_query(seller_id, product_id))).scalar_one_or_none()
+
+    if product is None:
+        raise ValueError(f"상품을 찾을 수 없습니다 (id={product_id})")
+
+    return product
+
+
+def _product_query(seller_id: int, product_id: int):
+    return select(Product).where(
+        Product.id == product_id,
+        Product.seller_id == seller_id,
+        Product.is_deleted == False,  # noqa: E712
+    )
@@ -3,7 +3,7 @@ import random
 from sqlalchemy import func
 from sqlalchemy.orm import Session
 
-from app.chat.model import Conversation, Message, MessageRole
+from app.chat.model import Conversation, ConversationStats
 from app.seller.model import Seller
 from app.shared.display_id import to_display_id
 
@@ -61,33 +61,19 @@ def get_seller_detail(db: Session, seller_pk: int) -> dict | None:
 
     stats = (
         db.query(
-            func.count(func.distinct(Conversation.id)).label("total_conversations"),
-            func.count(Message.id).label("total_messages"),
+            func.count(Conversation.id).label("total_conversations"),
+            func.coalesce(func.sum(ConversationStats.message_count), 0).label("total_messages"),
+            func.coalesce(
+                func.sum(ConversationStats.input_tokens + ConversationStats.output_tokens), 0
+            ).label("total_tokens"),
             func.max(Conversation.updated_at).label("last_active_at"),
         )
         .select_from(Conversation)
-        .outerjoin(Message, Message.conversation_id == Conversation.id)
+        .outerjoin(ConversationStats, ConversationStats.conversation_id == Conversation.id)
         .filter(Conversation.seller_id == seller_pk)
         .one()
     )
 
-    token_rows = (
-        db.query(Message.metadata_)
-        .join(Conversation, Message.conversation_id == Conversation.id)
-        .filter(
-            Conversation.seller_id == seller_pk,
-            Message.role == MessageRole.ASSISTANT,
-            Message.metadata_.isnot(None),
-        )
-        .all()
-    )
-    total_tokens = 0
-    for (metadata,) in token_rows:
-        if metadata:
-            total_tokens += (metadata.get("input_tokens") or 0) + (
-                metadata.get("output_tokens") or 0
-            )
-
     return {
         "id": to_display_id("sellers", seller.id),
         "nickname": seller.nickname,
@@ -95,5 +81,5 @@ def get_seller_detail(db: Session, seller_pk: int) -> dict | None:
         "last_active_at": stats.last_active_at,
         "total_conversations": stats.total_conversations,
         "total_messages": stats.total_messages,
-        "total_tokens": total_tokens,
+        "total_tokens": int(stats.total_tokens),
     }
@@ -16,9 +16,73 @@ class Settings(BaseSettings):
         return v
     cors_origins: str = "http://localhost:5173"
     openai_api_key: str
+    # OpenAI API 주소. 부하 테스트 시 로컬 mock 서버(scripts.mock_openai)를 가리키게 한다
+    openai_base_url: str | None = None
     openai_model: str = "gpt-4o-mini"
     openai_embedding_model: str = "text-embedding-3-small"
     openai_embedding_dimension: int = 1536
+    tool_max_workers: int = 4
+    # 프로세스 내 히스토리 캐시. 한 대화의 모든 요청이 같은 프로세스로 가는 배포(단일 워커 또는
+    # 대화 단위 sticky 라우팅)에서만 켠다. 여러 워커가 나눠 받으면 다른 워커의 메시지를 놓친다
+    history_cache_enabled: bool = False
+    history_cache_max_entries: int = 1000
+    history_cache_max_bytes: int = 32 * 1024 * 1024
+    history_token_budget: int = 6000
+    history_keep_tokens: int = 3000
+    # content delta를 모아 보내는 간격/크기 (interval 0이면 delta마다 바로 전송)
+    sse_coalesce_interval_ms: int = 30
+    sse_coalesce_max_bytes: int = 1024
+    # 채팅 메시지 write-behind 저장 주기/배치 크기/재시도 최대 간격
+    message_flush_interval_ms: int = 50
+    message_flush_batch_size: int = 500
+    message_flush_retry_max_ms: int = 5000
+    # DB 장애가 길어질 때 메모리에 쌓아 둘 저장 대기 메시지 수 상한
+    message_queue_max_pending: int = 10_000
+    # 첫 질문 답변 캐시 (질문 임베딩 코사인 유사도 기준, 기본 꺼짐)
+    answer_cache_enabled: bool = False
+    answer_cache_min_similarity: float = 0.95
+    answer_cache_ttl_hours: int = 24 * 7
+    # 메시지 도메인에 맞는 tool만 LLM 요청에 포함 (예시 문장 유사도 기준/공동 선택 허용 차이)
+    tool_selection_enabled: bool = True
+    tool_selection_min_similarity: float = 0.4
+    tool_selection_margin: float = 0.05
+    # 예시 문장 분류(임베딩 요청) 시간 상한. 넘으면 전체 tool을 보낸다
+    tool_selection_timeout_ms: int = 300
+    # LLM 첫 청크가 최근 TTFT의 llm_hedge_percentile 분위보다 늦으면 같은 요청을 한 번 더 보낸다.
+    # 요청 수와 입력 토큰 비용이 늘어나므로 기본은 꺼 둔다
+    llm_hedge_enabled: bool = False
+    llm_hedge_percentile: float = 90
+    llm_hedge_window: int = 200
+    llm_hedge_min_samples: int = 20
+    llm_hedge_min_budget_ms: int = 500
+    # /api/chat 동시 처리 상한(전체/판매자별), 대기열 크기(전체/판매자별), 판매자별 가중치
+    chat_max_concurrent: int = 32
+    chat_max_concurrent_per_seller: int = 2
+    chat_max_queue: int = 100
+    chat_max_queue_per_seller: int = 4
+    chat_seller_weights: dict[int, float] = {}
+    # /api/chat/batch 워커 수(동시에 실행하는 배치 턴 수)와 요청당 최대 메시지 수
+    chat_batch_workers: int = 4
+    chat_batch_max_messages: int = 100
+    # 대화 목록(/api/conversations, /api/my/conversations) 한 페이지 기본 크기
+    conversation_page_size: int = 50
+    # 대화 메시지 목록(/api/conversations/{id}/messages) 한 페이지 기본 크기
+    message_page_size: int = 100
+    # list_products tool 결과 한 번에 담는 최대 상품 수
+    tool_result_page_size: int = 50
+    # 스트리밍 중 클라이언트 연결 종료 확인 주기
+    disconnect_poll_interval_ms: int = 200
+    # 끊긴 SSE 스트림 이어 받기 (Last-Event-ID). 구독자가 모두 끊긴 턴을 취소하기 전 유예 시간,
+    # 끝난 턴 로그 보관 시간, 전체/턴별 로그 크기 상한
+    sse_resume_grace_ms: int = 10_000
+    sse_resume_ttl_seconds: int = 300
+    sse_resume_max_bytes: int = 32 * 1024 * 1024
+    sse_resume_turn_max_bytes: int = 512 * 1024
+
+    @property
+    def async_database_url(self) -> str:
+        """asyncpg 드라이버용 DB URL (채팅 스트리밍 경로의 비동기 세션에서 사용)."""
+        return self.database_url.replace("postgresql://", "postgresql+asyncpg://", 1)
 
     model_config = SettingsConfigDict(
         env_file=".env",
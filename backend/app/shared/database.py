@@ -1,16 +1,43 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, DeclarativeBase
+import time
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker, DeclarativeBase
 
 from app.shared.config import settings
+from app.shared.metrics import observe
 
 engine = create_engine(settings.database_url)
 SessionLocal = sessionmaker(bind=engine)
 
+# 채팅 스트리밍(async generator) 경로에서 이벤트 루프를 막지 않도록 asyncpg 세션을 사용한다.
+# 풀은 동시 채팅 상한(chat_max_concurrent)만큼의 요청 세션에 tool 실행 세션과 백그라운드 저장
+# (write-behind, 답변 캐시) 몫을 더한 크기로 잡아, 진입 제어를 통과한 요청이 커넥션을 기다리지 않게 한다
+async_engine = create_async_engine(
+    settings.async_database_url,
+    pool_size=settings.chat_max_concurrent,
+    max_overflow=settings.tool_max_workers + 4,
+)
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, expire_on_commit=False)
+
 
 class Base(DeclarativeBase):
     pass
 
 
+# 커밋(flush 포함) 소요 시간을 기록한다. AsyncSession도 내부적으로 Session을 사용하므로 함께 측정된다
+@event.listens_for(Session, "before_commit")
+def _start_commit_timer(session: Session) -> None:
+    session.info["commit_started_at"] = time.perf_counter()
+
+
+@event.listens_for(Session, "after_commit")
+def _observe_commit(session: Session) -> None:
+    started_at = session.info.pop("commit_started_at", None)
+    if started_at is not None:
+        observe("db_commit", time.perf_counter() - started_at)
+
+
 def get_db():
     """FastAPI 의존성 주입용 DB 세션"""
     db = SessionLocal()
@@ -18,3 +45,9 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    """FastAPI 의존성 주입용 비동기 DB 세션"""
+    async with AsyncSessionLocal() as db:
+        yield db
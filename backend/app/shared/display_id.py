@@ -6,6 +6,7 @@
 """
 
 PREFIXES = {
+    "chat_batches": "BAT",
     "conversations": "CON",
     "messages": "MSG",
     "products": "PRD",
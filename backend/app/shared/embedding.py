@@ -1,23 +1,47 @@
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
 
 from app.shared.config import settings
+from app.shared.metrics import measure
 
-client = OpenAI(api_key=settings.openai_api_key)
+client = OpenAI(api_key=settings.openai_api_key, base_url=settings.openai_base_url)
+async_client = AsyncOpenAI(api_key=settings.openai_api_key, base_url=settings.openai_base_url)
 
 
 def embed_text(text: str) -> list[float]:
     """텍스트를 임베딩 벡터로 변환한다."""
-    response = client.embeddings.create(
-        model=settings.openai_embedding_model,
-        input=text,
-    )
+    with measure("embedding"):
+        response = client.embeddings.create(
+            model=settings.openai_embedding_model,
+            input=text,
+        )
+    return response.data[0].embedding
+
+
+async def embed_text_async(text: str) -> list[float]:
+    """embed_text의 비동기 버전. 채팅 스트리밍 경로에서 사용한다."""
+    with measure("embedding"):
+        response = await async_client.embeddings.create(
+            model=settings.openai_embedding_model,
+            input=text,
+        )
     return response.data[0].embedding
 
 
 def embed_texts(texts: list[str]) -> list[list[float]]:
     """여러 텍스트를 배치로 임베딩한다."""
-    response = client.embeddings.create(
-        model=settings.openai_embedding_model,
-        input=texts,
-    )
+    with measure("embedding"):
+        response = client.embeddings.create(
+            model=settings.openai_embedding_model,
+            input=texts,
+        )
+    return [item.embedding for item in response.data]
+
+
+async def embed_texts_async(texts: list[str]) -> list[list[float]]:
+    """embed_texts의 비동기 버전."""
+    with measure("embedding"):
+        response = await async_client.embeddings.create(
+            model=settings.openai_embedding_model,
+            input=texts,
+        )
     return [item.embedding for item in response.data]
@@ -0,0 +1,94 @@
+"""
+단계별 지연 시간 측정.
+
+각 단계의 소요 시간을 Prometheus 히스토그램(/metrics)에 기록하고, 채팅 턴이 진행 중이면
+해당 턴의 단계별 기록(ms)에도 추가한다. 턴 기록은 contextvar로 전달되므로 tool 실행 태스크처럼
+턴 안에서 만들어진 태스크에서 측정한 값도 같은 턴에 모인다.
+
+단계:
+- llm_ttft: LLM 요청부터 첫 응답 청크까지
+- llm_iteration: LLM 요청 한 번(스트림 종료까지)
+- tool.<이름>: tool 실행
+- embedding: 임베딩 API 호출
+- vector_query: 가이드 벡터 검색 쿼리
+- db_commit: DB 커밋
+- llm_hedge: 두 번째 요청(hedge)을 보내기 전까지 기다린 시간 (hedge 예산)
+- llm_hedge_gain: hedge가 이겼을 때 원래 요청의 첫 청크보다 앞당긴 시간
+
+hedge 결과는 chat_llm_hedge_total{outcome}으로 센다 (app.chat.hedging).
+"""
+
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from prometheus_client import Counter, Histogram
+
+_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+STAGE_SECONDS = Histogram(
+    "chat_stage_duration_seconds",
+    "채팅 처리 단계별 소요 시간",
+    ["stage"],
+    buckets=_BUCKETS,
+)
+TOOL_SECONDS = Histogram(
+    "chat_tool_duration_seconds",
+    "tool 실행 시간",
+    ["tool"],
+    buckets=_BUCKETS,
+)
+
+HEDGE_TOTAL = Counter(
+    "chat_llm_hedge_total",
+    "hedge 예산을 적용한 LLM 요청 수 (outcome: not_needed, skipped, primary, hedge)",
+    ["outcome"],
+)
+
+_turn_timings: ContextVar[dict[str, list[int]] | None] = ContextVar("turn_timings", default=None)
+
+
+def start_turn() -> dict[str, list[int]]:
+    """현재 컨텍스트에서 새 턴 기록을 시작하고, 단계별 소요 시간(ms) 목록 dict를 반환한다."""
+    timings: dict[str, list[int]] = {}
+    _turn_timings.set(timings)
+    return timings
+
+
+def observe(stage: str, seconds: float) -> None:
+    STAGE_SECONDS.labels(stage=stage).observe(seconds)
+    _record(stage, seconds)
+
+
+def observe_tool(tool_name: str, seconds: float) -> None:
+    TOOL_SECONDS.labels(tool=tool_name).observe(seconds)
+    _record(f"tool.{tool_name}", seconds)
+
+
+def count_hedge(outcome: str) -> None:
+    HEDGE_TOTAL.labels(outcome=outcome).inc()
+
+
+@contextmanager
+def measure(stage: str) -> Iterator[None]:
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(stage, time.perf_counter() - start)
+
+
+@contextmanager
+def measure_tool(tool_name: str) -> Iterator[None]:
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe_tool(tool_name, time.perf_counter() - start)
+
+
+def _record(key: str, seconds: float) -> None:
+    timings = _turn_timings.get()
+    if timings is not None:
+        timings.setdefault(key, []).append(round(seconds * 1000))
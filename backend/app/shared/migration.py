@@ -0,0 +1,143 @@
+"""
+DB 스키마 revision 관리.
+
+revision은 app/migrations/의 r<번호>_<이름>.py 모듈이고, 번호는 1부터 빠짐없이 이어진다.
+모듈마다 upgrade(conn)를 정의하며, CREATE INDEX CONCURRENTLY처럼 트랜잭션 안에서 실행할 수 없는
+revision은 TRANSACTIONAL = False로 표시해 autocommit 연결에서 실행한다.
+적용한 revision은 schema_revisions 테이블에 기록한다.
+
+- upgrade: 적용하지 않은 revision을 순서대로 적용한다 (scripts.migrate). 여러 프로세스가 동시에
+  실행해도 advisory lock으로 한 번만 적용된다.
+- check_revision: 앱 시작 시 DB가 최신 revision인지만 확인한다. 스키마는 바꾸지 않는다.
+
+첫 revision은 현재 모델로 없는 테이블을 만들기 때문에, 새 DB에서는 뒤 revision이 추가하는
+컬럼과 인덱스가 이미 있을 수 있다. 그래서 revision은 IF NOT EXISTS 등으로 여러 번 실행해도
+안전하게 작성한다.
+"""
+
+import importlib
+import logging
+import pkgutil
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from sqlalchemy import Connection, Engine, text
+
+logger = logging.getLogger(__name__)
+
+# 동시에 실행된 upgrade가 같은 revision을 두 번 적용하지 않도록 잡는 advisory lock 키
+_LOCK_KEY = 7_240_001
+
+
+class SchemaOutdated(RuntimeError):
+    """DB가 코드가 기대하는 revision보다 뒤처져 있다."""
+
+
+@dataclass(frozen=True)
+class Revision:
+    version: int
+    name: str
+    upgrade: Callable[[Connection], None]
+    transactional: bool = True
+
+
+def load_revisions(package: str = "app.migrations") -> list[Revision]:
+    """package의 r<번호>_<이름> 모듈을 번호순으로 읽는다. 번호가 비거나 겹치면 에러."""
+    revisions = []
+    for module_info in pkgutil.iter_modules(importlib.import_module(package).__path__):
+        number, _, name = module_info.name.partition("_")
+        if not (number.startswith("r") and number[1:].isdigit()):
+            continue
+        module = importlib.import_module(f"{package}.{module_info.name}")
+        revisions.append(Revision(
+            version=int(number[1:]),
+            name=name,
+            upgrade=module.upgrade,
+            transactional=getattr(module, "TRANSACTIONAL", True),
+        ))
+    revisions.sort(key=lambda r: r.version)
+
+    versions = [r.version for r in revisions]
+    if versions != list(range(1, len(revisions) + 1)):
+        raise RuntimeError(f"revision 번호가 1부터 이어지지 않습니다: {versions}")
+    return revisions
+
+
+def current_revision(conn: Connection) -> int:
+    """DB에 마지막으로 적용한 revision 번호. 한 번도 적용하지 않았으면 0."""
+    if conn.execute(text("SELECT to_regclass('schema_revisions')")).scalar() is None:
+        return 0
+    return conn.execute(text("SELECT coalesce(max(version), 0) FROM schema_revisions")).scalar()
+
+
+def upgrade(
+    engine: Engine,
+    target: int | None = None,
+    revisions: list[Revision] | None = None,
+) -> list[Revision]:
+    """target(기본: 최신)까지 적용하지 않은 revision을 적용하고, 적용한 revision 목록을 반환한다."""
+    revisions = load_revisions() if revisions is None else revisions
+    applied = []
+    with engine.connect() as lock_conn:
+        lock_conn.execution_options(isolation_level="AUTOCOMMIT")
+        lock_conn.execute(text("SELECT pg_advisory_lock(:key)"), {"key": _LOCK_KEY})
+        try:
+            lock_conn.execute(text("""
+                CREATE TABLE IF NOT EXISTS schema_revisions (
+                    version INTEGER PRIMARY KEY,
+                    name VARCHAR(200) NOT NULL,
+                    applied_at TIMESTAMPTZ NOT NULL DEFAULT now()
+                )
+            """))
+            current = current_revision(lock_conn)
+            for revision in revisions:
+                if revision.version <= current:
+                    continue
+                if target is not None and revision.version > target:
+                    break
+                _apply(engine, revision)
+                applied.append(revision)
+        finally:
+            lock_conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": _LOCK_KEY})
+    return applied
+
+
+def _apply(engine: Engine, revision: Revision) -> None:
+    logger.info(f"revision {revision.version} ({revision.name}) 적용")
+    with engine.connect() as conn:
+        if not revision.transactional:
+            conn.execution_options(isolation_level="AUTOCOMMIT")
+        with conn.begin():
+            revision.upgrade(conn)
+            conn.execute(
+                text("INSERT INTO schema_revisions (version, name) VALUES (:version, :name)"),
+                {"version": revision.version, "name": revision.name},
+            )
+
+
+def check_revision(engine: Engine, revisions: list[Revision] | None = None) -> None:
+    """DB가 최신 revision이 아니면 SchemaOutdated. 코드보다 앞선 DB(배포 중 이전 버전)는 허용한다."""
+    revisions = load_revisions() if revisions is None else revisions
+    head = revisions[-1].version if revisions else 0
+    with engine.connect() as conn:
+        current = current_revision(conn)
+    if current < head:
+        raise SchemaOutdated(
+            f"DB 스키마 revision {current}, 필요한 revision {head}: "
+            "python -m scripts.migrate를 먼저 실행하세요"
+        )
+
+
+def create_index_concurrently(conn: Connection, name: str, definition: str) -> None:
+    """테이블 쓰기를 막지 않고 인덱스를 만든다. autocommit 연결(TRANSACTIONAL = False)에서 호출한다.
+
+    definition은 ON 뒤의 부분이다. 예: "messages (conversation_id, created_at)"
+    """
+    # 이전 실행이 도중에 실패하면 INVALID 인덱스가 남아 IF NOT EXISTS로 건너뛰게 되므로 지우고 만든다
+    invalid = conn.execute(text("""
+        SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid
+        WHERE c.relname = :name AND NOT i.indisvalid
+    """), {"name": name}).first()
+    if invalid:
+        conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {name}"))
+    conn.execute(text(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {definition}"))
@@ -0,0 +1,51 @@
+"""
+기존 messages로 대화별 집계(conversation_stats)를 다시 계산한다.
+
+새 메시지는 저장할 때 집계가 함께 갱신되고(app.chat.stats.record_messages), 집계가 없던 대화는
+revision 2(app.migrations.r0002)가 채운다. 이 스크립트는 집계가 어긋났을 때 전체를 다시 계산해
+덮어쓴다. 여러 번 실행해도 안전하다.
+
+서비스 중에 실행하면 배치를 계산하는 사이 저장된 메시지의 증가분이 덮어써질 수 있다.
+트래픽이 적을 때 실행하고, 어긋났다면 다시 실행하면 된다.
+
+실행: cd backend && python -m scripts.backfill_conversation_stats
+"""
+
+from sqlalchemy import select
+
+from app.shared.database import SessionLocal
+from app.chat.model import Conversation
+from app.chat.stats import backfill_stats
+from app.seller.model import Seller  # noqa: F401 — FK 대상 테이블 등록
+
+BATCH_SIZE = 1000
+
+
+def backfill():
+    db = SessionLocal()
+    try:
+        total = 0
+        last_id = 0
+        while True:
+            # 배치 단위로 나눠 긴 잠금을 피한다
+            ids = db.execute(
+                select(Conversation.id)
+                .where(Conversation.id > last_id)
+                .order_by(Conversation.id)
+                .limit(BATCH_SIZE)
+            ).scalars().all()
+            if not ids:
+                break
+            backfill_stats(db, ids)
+            db.commit()
+            total += len(ids)
+            last_id = ids[-1]
+            print(f"대화 {total}건 집계 완료")
+
+        print(f"conversation_stats 채우기 완료 (대화 {total}건)")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    backfill()
@@ -0,0 +1,193 @@
+"""
+/api/chat 부하 테스트.
+
+동시에 N개의 SSE 클라이언트로 /api/chat을 호출하고 다음 지표를 집계한다.
+- TTFT: 요청 시작부터 첫 content 이벤트까지
+- 토큰 간격: 연속된 content 이벤트 사이 시간
+- 전체 응답 시간: 요청 시작부터 done/error 이벤트까지
+- 에러율: HTTP 오류, 연결 오류, error 이벤트, done 없이 끊긴 응답
+
+실제 OpenAI 대신 scripts.mock_openai를 띄우고 OPENAI_BASE_URL로 연결해 두면
+외부 API 변동 없이 서버 자체의 처리량을 측정할 수 있다.
+
+Usage:
+    cd backend
+    python -m scripts.load_test --concurrency 20 --requests 200
+    python -m scripts.load_test --base-url http://localhost:8000 --message "배송비 설정 방법"
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from dataclasses import dataclass, field
+
+import httpx
+
+
+@dataclass
+class RequestResult:
+    ttft: float | None = None
+    duration: float | None = None
+    token_gaps: list[float] = field(default_factory=list)
+    error: str | None = None
+
+
+def percentile(values: list[float], p: float) -> float:
+    """선형 보간 백분위수. values가 비어 있으면 0을 반환한다."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * p / 100
+    lower = int(rank)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+
+async def _create_seller_token(client: httpx.AsyncClient) -> str:
+    response = await client.post("/api/sellers")
+    response.raise_for_status()
+    return response.json()["token"]
+
+
+async def run_chat(client: httpx.AsyncClient, token: str, message: str) -> RequestResult:
+    """채팅 요청 한 건을 보내고 SSE 이벤트 시각을 기록한다."""
+    result = RequestResult()
+    start = time.perf_counter()
+    last_content_at = None
+    finished = False
+
+    try:
+        async with client.stream(
+            "POST",
+            "/api/chat",
+            json={"message": message},
+            headers={"Authorization": f"Bearer {token}"},
+        ) as response:
+            if response.status_code != 200:
+                result.error = f"HTTP {response.status_code}"
+                return result
+
+            async for line in response.aiter_lines():
+                if not line.startswith("data: "):
+                    continue
+                event = json.loads(line[len("data: "):])
+                now = time.perf_counter()
+
+                if event["type"] == "content":
+                    if last_content_at is None:
+                        result.ttft = now - start
+                    else:
+                        result.token_gaps.append(now - last_content_at)
+                    last_content_at = now
+                elif event["type"] == "error":
+                    result.error = event["data"] or "error event"
+                    finished = True
+                elif event["type"] == "done":
+                    finished = True
+                    break
+    except httpx.HTTPError as e:
+        result.error = f"{type(e).__name__}: {e}"
+        return result
+
+    # 서버가 done/error 없이 연결을 닫은 응답은 완료로 치지 않는다
+    if not finished:
+        result.error = "stream ended without done"
+        return result
+
+    result.duration = time.perf_counter() - start
+    return result
+
+
+async def _worker(
+    client: httpx.AsyncClient, message: str, jobs: asyncio.Queue, results: list[RequestResult]
+) -> None:
+    try:
+        token = await _create_seller_token(client)
+    except httpx.HTTPError as e:
+        # 판매자 생성에 실패하면 이 워커가 맡을 요청을 모두 실패로 기록한다
+        while not jobs.empty():
+            jobs.get_nowait()
+            results.append(RequestResult(error=f"seller: {type(e).__name__}: {e}"))
+        return
+
+    while not jobs.empty():
+        jobs.get_nowait()
+        results.append(await run_chat(client, token, message))
+
+
+def summarize(results: list[RequestResult], elapsed: float) -> dict:
+    ok = [r for r in results if r.error is None]
+    ttfts = [r.ttft for r in ok if r.ttft is not None]
+    durations = [r.duration for r in ok if r.duration is not None]
+    gaps = [gap for r in ok for gap in r.token_gaps]
+
+    def stats(values: list[float]) -> dict:
+        return {f"p{p}": round(percentile(values, p) * 1000, 1) for p in (50, 95, 99)}
+
+    errors: dict[str, int] = {}
+    for r in results:
+        if r.error:
+            errors[r.error] = errors.get(r.error, 0) + 1
+
+    return {
+        "requests": len(results),
+        "errors": len(results) - len(ok),
+        "error_rate": round((len(results) - len(ok)) / len(results), 4) if results else 0,
+        "throughput_rps": round(len(results) / elapsed, 2) if elapsed else 0,
+        "ttft_ms": stats(ttfts),
+        "token_gap_ms": stats(gaps),
+        "duration_ms": stats(durations),
+        "error_breakdown": errors,
+    }
+
+
+def _print_report(summary: dict) -> None:
+    print(f"\n요청 {summary['requests']}건, 에러 {summary['errors']}건 "
+          f"(에러율 {summary['error_rate']:.2%}), 처리량 {summary['throughput_rps']} req/s")
+    print(f"{'지표':<16}{'p50':>10}{'p95':>10}{'p99':>10}")
+    for label, key in (("TTFT", "ttft_ms"), ("토큰 간격", "token_gap_ms"), ("전체 응답", "duration_ms")):
+        row = summary[key]
+        print(f"{label:<16}{row['p50']:>9}ms{row['p95']:>9}ms{row['p99']:>9}ms")
+    for error, count in summary["error_breakdown"].items():
+        print(f"  에러 {count}건: {error}")
+
+
+async def run(base_url: str, concurrency: int, total: int, message: str, timeout: float) -> dict:
+    jobs: asyncio.Queue = asyncio.Queue()
+    for i in range(total):
+        jobs.put_nowait(i)
+    results: list[RequestResult] = []
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, timeout=timeout, limits=limits) as client:
+        start = time.perf_counter()
+        await asyncio.gather(*(
+            _worker(client, message, jobs, results) for _ in range(concurrency)
+        ))
+        elapsed = time.perf_counter() - start
+
+    return summarize(results, elapsed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="/api/chat 부하 테스트")
+    parser.add_argument("--base-url", default="http://localhost:8000", help="API 서버 주소")
+    parser.add_argument("--concurrency", type=int, default=10, help="동시 클라이언트 수 (기본: 10)")
+    parser.add_argument("--requests", type=int, default=100, help="전체 요청 수 (기본: 100)")
+    parser.add_argument("--message", default="상품 등록 방법 알려줘", help="보낼 메시지")
+    parser.add_argument("--timeout", type=float, default=120, help="요청 타임아웃 초 (기본: 120)")
+    parser.add_argument("--json", action="store_true", help="결과를 JSON으로 출력")
+    args = parser.parse_args()
+
+    summary = asyncio.run(
+        run(args.base_url, args.concurrency, args.requests, args.message, args.timeout)
+    )
+    if args.json:
+        print(json.dumps(summary, ensure_ascii=False, indent=2))
+    else:
+        _print_report(summary)
+
+
+if __name__ == "__main__":
+    main()
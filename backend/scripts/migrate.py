@@ -0,0 +1,37 @@
+"""
+DB 스키마를 최신 revision으로 올린다 (app.shared.migration).
+
+배포 시 앱을 띄우기 전에 실행한다. 앱은 시작할 때 revision만 확인하고 스키마를 바꾸지 않는다.
+
+실행: cd backend && python -m scripts.migrate              # 최신 revision까지 적용
+      cd backend && python -m scripts.migrate --target 3   # 3번 revision까지만 적용
+      cd backend && python -m scripts.migrate --current    # 현재 revision 확인
+"""
+
+import argparse
+
+from app.shared.database import engine
+from app.shared.migration import current_revision, load_revisions, upgrade
+
+
+def main():
+    parser = argparse.ArgumentParser(description="DB 스키마 revision 적용")
+    parser.add_argument("--target", type=int, help="이 번호의 revision까지만 적용")
+    parser.add_argument("--current", action="store_true", help="현재 revision만 출력")
+    args = parser.parse_args()
+
+    revisions = load_revisions()
+    if args.current:
+        with engine.connect() as conn:
+            print(f"현재 revision {current_revision(conn)} (최신 {revisions[-1].version})")
+        return
+
+    applied = upgrade(engine, target=args.target, revisions=revisions)
+    for revision in applied:
+        print(f"revision {revision.version} ({revision.name}) 적용 완료")
+    if not applied:
+        print("적용할 revision이 없습니다")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,225 @@
+"""
+부하 테스트용 로컬 OpenAI mock 서버.
+
+chat completions(스트리밍/비스트리밍)와 embeddings 엔드포인트를 흉내 낸다.
+첫 토큰까지의 지연(TTFT), 초당 토큰 수, tool call 시나리오를 조절할 수 있어
+실제 OpenAI API 없이 stream_chat의 처리량을 측정할 수 있다.
+
+시나리오 파일(JSON) 형식:
+    {
+      "tool_calls": [{"name": "search_guide", "arguments": {"query": "배송 설정"}}],
+      "answer": "배송 설정은 ..."
+    }
+대화의 마지막 메시지가 user면 tool_calls를(없으면 answer를) 보내고,
+tool 결과가 돌아오면 answer를 보낸다.
+
+Usage:
+    cd backend
+    python -m scripts.mock_openai --port 8001 --ttft-ms 400 --tokens-per-sec 40
+    python -m scripts.mock_openai --scenario loadtest_scenario.json
+
+    # 다른 터미널에서 앱을 mock 서버에 연결
+    OPENAI_BASE_URL=http://localhost:8001/v1 uvicorn app.main:app
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+import time
+import uuid
+from dataclasses import dataclass, field
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+
+_DEFAULT_ANSWER = (
+    "식스샵 프로에서는 상품 관리 메뉴에서 판매 상태와 가격을 바로 수정할 수 있어요. "
+    "자세한 내용은 식스샵 프로 가이드를 참고해 주세요."
+)
+
+
+@dataclass
+class MockConfig:
+    ttft_ms: int = 300
+    tokens_per_sec: float = 50
+    # 응답 토큰(청크) 하나에 들어가는 글자 수
+    chars_per_token: int = 2
+    embedding_ms: int = 50
+    embedding_dimension: int = 1536
+    tool_calls: list[dict] = field(default_factory=list)
+    answer: str = _DEFAULT_ANSWER
+
+
+config = MockConfig()
+app = FastAPI(title="OpenAI mock")
+
+
+def _completion_id() -> str:
+    return f"chatcmpl-mock-{uuid.uuid4().hex[:12]}"
+
+
+def _chunk(completion_id: str, model: str, delta: dict, finish_reason: str | None = None) -> str:
+    payload = {
+        "id": completion_id,
+        "object": "chat.completion.chunk",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+    }
+    return f"data: {json.dumps(payload, ensure_ascii=False)}\n\n"
+
+
+def _usage(prompt_tokens: int, completion_tokens: int) -> dict:
+    return {
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "total_tokens": prompt_tokens + completion_tokens,
+    }
+
+
+def _wants_tool_calls(body: dict) -> bool:
+    messages = body.get("messages") or []
+    last_role = messages[-1]["role"] if messages else None
+    return bool(config.tool_calls and body.get("tools") and last_role == "user")
+
+
+def _prompt_tokens(body: dict) -> int:
+    # 실제 토크나이저 대신 글자 수로 근사한다
+    return sum(len(str(m.get("content") or "")) for m in body.get("messages") or []) // 2
+
+
+def _answer_tokens() -> list[str]:
+    step = config.chars_per_token
+    return [config.answer[i:i + step] for i in range(0, len(config.answer), step)]
+
+
+async def _stream(body: dict):
+    completion_id = _completion_id()
+    model = body.get("model", "mock")
+    include_usage = (body.get("stream_options") or {}).get("include_usage", False)
+    interval = 1 / config.tokens_per_sec if config.tokens_per_sec > 0 else 0
+
+    await asyncio.sleep(config.ttft_ms / 1000)
+    yield _chunk(completion_id, model, {"role": "assistant", "content": ""})
+
+    completion_tokens = 0
+    if _wants_tool_calls(body):
+        for index, call in enumerate(config.tool_calls):
+            arguments = json.dumps(call.get("arguments", {}), ensure_ascii=False)
+            yield _chunk(completion_id, model, {"tool_calls": [{
+                "index": index,
+                "id": f"call_mock_{uuid.uuid4().hex[:8]}",
+                "type": "function",
+                "function": {"name": call["name"], "arguments": ""},
+            }]})
+            # 인자는 실제 API처럼 여러 청크로 나눠 보낸다
+            for i in range(0, len(arguments), 8):
+                await asyncio.sleep(interval)
+                yield _chunk(completion_id, model, {"tool_calls": [{
+                    "index": index, "function": {"arguments": arguments[i:i + 8]},
+                }]})
+                completion_tokens += 1
+        finish_reason = "tool_calls"
+    else:
+        for token in _answer_tokens():
+            await asyncio.sleep(interval)
+            yield _chunk(completion_id, model, {"content": token})
+            completion_tokens += 1
+        finish_reason = "stop"
+
+    yield _chunk(completion_id, model, {}, finish_reason=finish_reason)
+    if include_usage:
+        payload = {
+            "id": completion_id,
+            "object": "chat.completion.chunk",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [],
+            "usage": _usage(_prompt_tokens(body), completion_tokens),
+        }
+        yield f"data: {json.dumps(payload)}\n\n"
+    yield "data: [DONE]\n\n"
+
+
+@app.post("/v1/chat/completions")
+async def chat_completions(request: Request):
+    body = await request.json()
+    if body.get("stream"):
+        return StreamingResponse(_stream(body), media_type="text/event-stream")
+
+    # 비스트리밍 호출(대화 요약 등)은 전체 응답 시간만큼 기다린 뒤 한 번에 반환한다
+    tokens = _answer_tokens()
+    if config.tokens_per_sec > 0:
+        await asyncio.sleep(config.ttft_ms / 1000 + len(tokens) / config.tokens_per_sec)
+    return {
+        "id": _completion_id(),
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": body.get("model", "mock"),
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": config.answer},
+            "finish_reason": "stop",
+        }],
+        "usage": _usage(_prompt_tokens(body), len(tokens)),
+    }
+
+
+def _embedding(text: str) -> list[float]:
+    # 같은 입력에는 항상 같은 벡터를 돌려준다
+    rng = random.Random(hashlib.sha256(text.encode("utf-8")).digest())
+    return [rng.uniform(-1, 1) for _ in range(config.embedding_dimension)]
+
+
+@app.post("/v1/embeddings")
+async def embeddings(request: Request):
+    body = await request.json()
+    inputs = body["input"] if isinstance(body["input"], list) else [body["input"]]
+    await asyncio.sleep(config.embedding_ms / 1000)
+    return {
+        "object": "list",
+        "data": [
+            {"object": "embedding", "index": i, "embedding": _embedding(text)}
+            for i, text in enumerate(inputs)
+        ],
+        "model": body.get("model", "mock"),
+        "usage": {"prompt_tokens": 0, "total_tokens": 0},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="로컬 OpenAI mock 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--ttft-ms", type=int, default=config.ttft_ms, help="첫 청크까지 지연 (ms)")
+    parser.add_argument(
+        "--tokens-per-sec", type=float, default=config.tokens_per_sec, help="초당 응답 청크 수 (0이면 지연 없음)"
+    )
+    parser.add_argument(
+        "--embedding-ms", type=int, default=config.embedding_ms, help="임베딩 응답 지연 (ms)"
+    )
+    parser.add_argument(
+        "--embedding-dimension", type=int, default=config.embedding_dimension, help="임베딩 차원"
+    )
+    parser.add_argument("--scenario", help="tool_calls/answer 시나리오 JSON 파일")
+    args = parser.parse_args()
+
+    config.ttft_ms = args.ttft_ms
+    config.tokens_per_sec = args.tokens_per_sec
+    config.embedding_ms = args.embedding_ms
+    config.embedding_dimension = args.embedding_dimension
+    if args.scenario:
+        with open(args.scenario, encoding="utf-8") as f:
+            scenario = json.load(f)
+        config.tool_calls = scenario.get("tool_calls", [])
+        config.answer = scenario.get("answer", config.answer)
+
+    print(f"OpenAI mock 서버: http://{args.host}:{args.port}/v1")
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
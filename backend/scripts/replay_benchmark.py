@@ -0,0 +1,452 @@
+"""
+저장된 대화를 재생하는 서버 오버헤드 벤치마크.
+
+assistant 메시지 metadata에 남은 tool_calls(이름, 인자)와 토큰 수로 턴마다 LLM 응답을 다시 만들고,
+같은 판매자로 stream_chat을 실행해 SSE 프레임까지 인코딩한다. LLM 응답은 기다림 없이 바로 나오므로
+측정값은 tool 실행, DB 쓰기, SSE 인코딩 등 서버 자체의 처리 시간이다. 실제 트래픽의 대화 모양
+그대로 OpenAI 호출 없이 성능 회귀를 잡는 데 쓴다.
+
+- 재생 순서와 응답 내용은 매번 같다. 임베딩도 입력 텍스트로 정해지는 벡터를 쓴다.
+- 기록된 tool call은 순서대로 LLM 응답 하나에 묶되, 조회 tool과 변경 tool이 바뀌는 곳에서
+  응답을 나눈다 (조회로 ID를 찾은 뒤 변경하는 흐름). 마지막 응답은 기록된 답변 텍스트다.
+- 오류/중단으로 끝난 턴은 답변이 온전하지 않으므로 재생하지 않는다.
+- tool은 실제로 실행된다. 변경 tool도 DB를 바꾸므로 운영 DB가 아니라 스냅샷을 복원한 DB에서
+  실행한다. --skip-mutating이면 변경 tool이 있는 대화는 빼고 재생한다.
+- 재생으로 만든 대화와 메시지는 단계별 시간을 읽은 뒤 지운다 (--keep이면 남긴다).
+
+Usage:
+    cd backend
+    python -m scripts.replay_benchmark --conversations 50
+    python -m scripts.replay_benchmark --conversation CON-12 --conversation CON-40 --json
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+import time
+from collections import deque
+from collections.abc import AsyncGenerator
+from contextlib import aclosing
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from types import SimpleNamespace
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.shared import embedding
+from app.shared.config import settings
+from app.shared.database import AsyncSessionLocal
+from app.shared.display_id import parse_pk
+from app.chat import service
+from app.chat.model import Conversation, ConversationStats, Message, MessageRole
+from app.chat.persistence import message_writer
+from app.chat.sse import ChatEvent, sse_stream
+from app.chat.tools.executor import MUTATING_TOOLS
+from app.seller.model import Seller  # noqa: F401 — FK 대상 테이블 등록
+from scripts.load_test import percentile
+
+_SUMMARY = "이전 대화에서 판매자가 쇼핑몰 운영에 대해 질문했어요."
+
+
+@dataclass
+class RecordedTurn:
+    message: str
+    answer: str
+    # LLM 응답마다 요청한 tool call({"name", "arguments"}) 목록. 마지막 텍스트 응답은 빠져 있다
+    iterations: list[list[dict]] = field(default_factory=list)
+    input_tokens: int = 0
+    output_tokens: int = 0
+
+
+@dataclass
+class RecordedConversation:
+    id: int
+    seller_id: int
+    turns: list[RecordedTurn]
+
+
+@dataclass
+class TurnResult:
+    duration: float | None = None
+    first_frame: float | None = None
+    frames: int = 0
+    sse_bytes: int = 0
+    error: str | None = None
+
+
+def split_iterations(tool_calls: list[dict]) -> list[list[dict]]:
+    """기록된 tool call을 LLM 응답 단위로 나눈다. 조회/변경 tool이 바뀌는 곳에서 끊는다."""
+    iterations: list[list[dict]] = []
+    for call in tool_calls:
+        mutating = call["name"] in MUTATING_TOOLS
+        if not iterations or (iterations[-1][-1]["name"] in MUTATING_TOOLS) != mutating:
+            iterations.append([])
+        iterations[-1].append({"name": call["name"], "arguments": call.get("arguments") or {}})
+    return iterations
+
+
+def _recorded_turn(user: Message, assistant: Message) -> RecordedTurn | None:
+    metadata = assistant.metadata_ or {}
+    if metadata.get("error") or metadata.get("aborted"):
+        return None
+    return RecordedTurn(
+        message=user.content,
+        answer=assistant.content,
+        iterations=split_iterations(metadata.get("tool_calls") or []),
+        input_tokens=metadata.get("input_tokens") or 0,
+        output_tokens=metadata.get("output_tokens") or 0,
+    )
+
+
+async def load_conversations(
+    db: AsyncSession,
+    limit: int,
+    conversation_ids: list[int] | None = None,
+    skip_mutating: bool = False,
+) -> list[RecordedConversation]:
+    """판매자 대화의 (질문, 답변) 턴을 읽는다. conversation_ids가 없으면 최근 대화 limit개."""
+    query = select(Conversation).where(Conversation.seller_id.is_not(None))
+    if conversation_ids:
+        query = query.where(Conversation.id.in_(conversation_ids))
+    else:
+        query = query.order_by(Conversation.id.desc()).limit(limit)
+    conversations = sorted((await db.execute(query)).scalars().all(), key=lambda c: c.id)
+
+    messages: dict[int, list[Message]] = {c.id: [] for c in conversations}
+    rows = await db.execute(
+        select(Message)
+        .where(Message.conversation_id.in_(messages))
+        .order_by(Message.conversation_id, Message.created_at, Message.id)
+    )
+    for message in rows.scalars():
+        messages[message.conversation_id].append(message)
+
+    recorded = []
+    for conversation in conversations:
+        turns = []
+        history = messages[conversation.id]
+        for user, assistant in zip(history, history[1:]):
+            if user.role != MessageRole.USER or assistant.role != MessageRole.ASSISTANT:
+                continue
+            turn = _recorded_turn(user, assistant)
+            if turn is not None:
+                turns.append(turn)
+        if skip_mutating and any(
+            call["name"] in MUTATING_TOOLS
+            for turn in turns for calls in turn.iterations for call in calls
+        ):
+            continue
+        if turns:
+            recorded.append(RecordedConversation(conversation.id, conversation.seller_id, turns))
+    return recorded
+
+
+def _chunk(content=None, tool_calls=None, finish_reason=None, usage=None):
+    choices = [] if usage else [
+        SimpleNamespace(
+            delta=SimpleNamespace(content=content, tool_calls=tool_calls),
+            finish_reason=finish_reason,
+        )
+    ]
+    return SimpleNamespace(usage=usage, choices=choices)
+
+
+def _pieces(text: str, size: int) -> list[str]:
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+class TurnScript:
+    """턴 하나의 LLM 응답 순서. 요청마다 다음 응답의 청크 목록을 꺼낸다.
+
+    tool call 인자와 답변은 실제 스트리밍처럼 chars_per_chunk 글자씩 나눠 보낸다. 기록된 토큰
+    수는 마지막 응답의 usage로 한 번에 보낸다.
+    """
+
+    def __init__(self, turn: RecordedTurn, chars_per_chunk: int):
+        self._turn = turn
+        self._iterations = deque(turn.iterations)
+        self._chars = chars_per_chunk
+        self._answered = False
+
+    def next_response(self) -> list:
+        if self._iterations:
+            return self._tool_call_chunks(self._iterations.popleft())
+        if self._answered:
+            raise RuntimeError("재생할 LLM 응답이 더 없습니다")
+        self._answered = True
+        usage = SimpleNamespace(
+            prompt_tokens=self._turn.input_tokens, completion_tokens=self._turn.output_tokens
+        )
+        return [
+            *(_chunk(content=piece) for piece in _pieces(self._turn.answer, self._chars)),
+            _chunk(finish_reason="stop"),
+            _chunk(usage=usage),
+        ]
+
+    def _tool_call_chunks(self, calls: list[dict]) -> list:
+        chunks = []
+        for index, call in enumerate(calls):
+            chunks.append(_chunk(tool_calls=[SimpleNamespace(
+                index=index,
+                id=f"call_replay_{index}",
+                function=SimpleNamespace(name=call["name"], arguments=""),
+            )]))
+            arguments = json.dumps(call["arguments"], ensure_ascii=False)
+            for piece in _pieces(arguments, self._chars):
+                chunks.append(_chunk(tool_calls=[SimpleNamespace(
+                    index=index, id=None, function=SimpleNamespace(name=None, arguments=piece),
+                )]))
+        chunks.append(_chunk(finish_reason="tool_calls"))
+        return chunks
+
+
+class ScriptedStream:
+    def __init__(self, chunks: list):
+        self._chunks = deque(chunks)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if not self._chunks:
+            raise StopAsyncIteration
+        return self._chunks.popleft()
+
+    async def close(self) -> None:
+        self._chunks.clear()
+
+
+# 현재 재생 중인 턴의 응답. 대화마다 태스크가 따로라 동시에 재생해도 섞이지 않는다
+_script: ContextVar[TurnScript | None] = ContextVar("replay_script", default=None)
+
+
+class ScriptedOpenAI:
+    """AsyncOpenAI 대역. chat completions는 현재 턴의 스크립트로, 임베딩은 입력 해시로 답한다."""
+
+    def __init__(self):
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._complete))
+        self.embeddings = SimpleNamespace(create=self._embed)
+
+    async def _complete(self, *, stream: bool = False, **kwargs):
+        if not stream:
+            # 히스토리 요약 요청
+            message = SimpleNamespace(content=_SUMMARY)
+            return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=None)
+        script = _script.get()
+        if script is None:
+            raise RuntimeError("재생 중인 턴이 없습니다")
+        return ScriptedStream(script.next_response())
+
+    async def _embed(self, *, input, **kwargs):
+        inputs = input if isinstance(input, list) else [input]
+        return SimpleNamespace(data=[SimpleNamespace(embedding=_embedding(t)) for t in inputs])
+
+
+def _embedding(text: str) -> list[float]:
+    rng = random.Random(hashlib.sha256(text.encode("utf-8")).digest())
+    return [rng.uniform(-1, 1) for _ in range(settings.openai_embedding_dimension)]
+
+
+async def replay_turn(
+    turn: RecordedTurn,
+    seller_id: int,
+    conversation_display_id: str | None,
+    chars_per_chunk: int = 2,
+    session_factory: async_sessionmaker = AsyncSessionLocal,
+) -> tuple[TurnResult, str | None]:
+    """턴 하나를 stream_chat으로 실행하고 SSE 프레임으로 인코딩한다. (결과, 대화 display ID)."""
+    result = TurnResult()
+    _script.set(TurnScript(turn, chars_per_chunk))
+
+    async def events(db: AsyncSession) -> AsyncGenerator[ChatEvent, None]:
+        nonlocal conversation_display_id
+        chat = service.stream_chat(db, turn.message, conversation_display_id, seller_id)
+        async with aclosing(chat):
+            async for event_type, data in chat:
+                if event_type == "conversation_id":
+                    conversation_display_id = data
+                elif event_type == "error":
+                    result.error = data
+                yield event_type, data
+
+    start = time.perf_counter()
+    try:
+        async with session_factory() as db:
+            frames = sse_stream(
+                events(db), settings.sse_coalesce_interval_ms, settings.sse_coalesce_max_bytes
+            )
+            async for frame in frames:
+                if result.first_frame is None:
+                    result.first_frame = time.perf_counter() - start
+                result.frames += 1
+                result.sse_bytes += len(frame.encode("utf-8"))
+    except Exception as e:
+        result.error = f"{type(e).__name__}: {e}"
+    result.duration = time.perf_counter() - start
+    return result, conversation_display_id
+
+
+async def _replay_conversation(
+    conversation: RecordedConversation, chars_per_chunk: int, results: list[TurnResult]
+) -> int | None:
+    display_id = None
+    for turn in conversation.turns:
+        result, display_id = await replay_turn(
+            turn, conversation.seller_id, display_id, chars_per_chunk
+        )
+        results.append(result)
+    return parse_pk(display_id, "conversations") if display_id else None
+
+
+def _stats(values: list[float]) -> dict:
+    return {f"p{p}": round(percentile(values, p), 1) for p in (50, 95, 99)}
+
+
+def summarize(results: list[TurnResult], replayed: list[Message], elapsed: float) -> dict:
+    """턴 결과와 재생으로 저장된 assistant 메시지의 metadata를 집계한다 (시간은 ms)."""
+    errors: dict[str, int] = {}
+    for r in results:
+        if r.error:
+            errors[r.error] = errors.get(r.error, 0) + 1
+
+    stages: dict[str, list[float]] = {}
+    tool_calls = tool_errors = 0
+    for message in replayed:
+        metadata = message.metadata_ or {}
+        for stage, ms in (metadata.get("stage_timings_ms") or {}).items():
+            stages.setdefault(stage, []).extend(ms)
+        for call in metadata.get("tool_calls") or []:
+            tool_calls += 1
+            if "error" in (call.get("result") or {}):
+                tool_errors += 1
+
+    ok = [r for r in results if r.error is None]
+    return {
+        "turns": len(results),
+        "errors": len(results) - len(ok),
+        "throughput_tps": round(len(results) / elapsed, 2) if elapsed else 0,
+        "turn_ms": _stats([r.duration * 1000 for r in ok]),
+        "first_frame_ms": _stats([r.first_frame * 1000 for r in ok if r.first_frame is not None]),
+        "sse_frames": sum(r.frames for r in results),
+        "sse_bytes": sum(r.sse_bytes for r in results),
+        "tool_calls": tool_calls,
+        "tool_errors": tool_errors,
+        "stages_ms": {
+            stage: {"count": len(ms), **_stats(ms), "total": round(sum(ms), 1)}
+            for stage, ms in sorted(stages.items())
+        },
+        "error_breakdown": errors,
+    }
+
+
+def _print_report(summary: dict) -> None:
+    print(f"\n턴 {summary['turns']}개, 에러 {summary['errors']}개, "
+          f"처리량 {summary['throughput_tps']} turn/s, tool 호출 {summary['tool_calls']}건 "
+          f"(tool 오류 {summary['tool_errors']}건), SSE {summary['sse_frames']}프레임 "
+          f"{summary['sse_bytes']}바이트")
+    print(f"{'지표':<24}{'건수':>8}{'p50':>10}{'p95':>10}{'p99':>10}")
+    for label, key in (("턴 전체", "turn_ms"), ("첫 프레임", "first_frame_ms")):
+        row = summary[key]
+        print(f"{label:<24}{'':>8}{row['p50']:>8}ms{row['p95']:>8}ms{row['p99']:>8}ms")
+    for stage, row in summary["stages_ms"].items():
+        print(f"{stage:<24}{row['count']:>8}{row['p50']:>8}ms{row['p95']:>8}ms{row['p99']:>8}ms")
+    for error, count in summary["error_breakdown"].items():
+        print(f"  에러 {count}건: {error}")
+
+
+async def run(
+    conversations: list[RecordedConversation],
+    concurrency: int,
+    chars_per_chunk: int,
+    keep: bool,
+) -> dict:
+    llm = ScriptedOpenAI()
+    service.client = llm
+    embedding.async_client = llm
+    # 캐시된 답변 재사용이나 hedge 요청 없이 기록된 응답 그대로 재생한다
+    settings.answer_cache_enabled = False
+    settings.llm_hedge_enabled = False
+
+    results: list[TurnResult] = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def replay(conversation: RecordedConversation) -> int | None:
+        async with semaphore:
+            return await _replay_conversation(conversation, chars_per_chunk, results)
+
+    message_writer.start()
+    start = time.perf_counter()
+    try:
+        created = await asyncio.gather(*(replay(c) for c in conversations))
+        elapsed = time.perf_counter() - start
+    finally:
+        await message_writer.stop()
+
+    created_ids = [pk for pk in created if pk is not None]
+    async with AsyncSessionLocal() as db:
+        replayed = (
+            await db.execute(
+                select(Message).where(
+                    Message.conversation_id.in_(created_ids),
+                    Message.role == MessageRole.ASSISTANT,
+                )
+            )
+        ).scalars().all()
+        if not keep:
+            await db.execute(delete(Message).where(Message.conversation_id.in_(created_ids)))
+            await db.execute(
+                delete(ConversationStats).where(ConversationStats.conversation_id.in_(created_ids))
+            )
+            await db.execute(delete(Conversation).where(Conversation.id.in_(created_ids)))
+            await db.commit()
+
+    summary = summarize(results, replayed, elapsed)
+    summary["conversations"] = len(conversations)
+    return summary
+
+
+async def _load(args) -> list[RecordedConversation]:
+    ids = [parse_pk(display_id, "conversations") for display_id in args.conversation or []]
+    async with AsyncSessionLocal() as db:
+        conversations = await load_conversations(
+            db, args.conversations, conversation_ids=ids, skip_mutating=args.skip_mutating
+        )
+    return conversations * args.repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description="저장된 대화를 재생하는 서버 오버헤드 벤치마크")
+    parser.add_argument(
+        "--conversations", type=int, default=20, help="재생할 최근 대화 수 (기본: 20)"
+    )
+    parser.add_argument(
+        "--conversation", action="append", help="재생할 대화 ID (예: CON-12, 여러 번 지정 가능)"
+    )
+    parser.add_argument(
+        "--skip-mutating", action="store_true", help="변경 tool을 호출한 대화는 재생하지 않음"
+    )
+    parser.add_argument("--concurrency", type=int, default=1, help="동시에 재생할 대화 수 (기본: 1)")
+    parser.add_argument("--repeat", type=int, default=1, help="같은 대화를 반복 재생할 횟수")
+    parser.add_argument(
+        "--chars-per-chunk", type=int, default=2, help="LLM 스트림 청크 하나의 글자 수 (기본: 2)"
+    )
+    parser.add_argument("--keep", action="store_true", help="재생으로 만든 대화를 지우지 않음")
+    parser.add_argument("--json", action="store_true", help="결과를 JSON으로 출력")
+    args = parser.parse_args()
+
+    async def _main() -> dict:
+        conversations = await _load(args)
+        return await run(conversations, args.concurrency, args.chars_per_chunk, args.keep)
+
+    summary = asyncio.run(_main())
+    if args.json:
+        print(json.dumps(summary, ensure_ascii=False, indent=2))
+    else:
+        _print_report(summary)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,42 +1,104 @@
 import pytest
 from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 
 from app.shared.config import settings
-from app.shared.database import Base
+from app.shared.migration import upgrade
+from app.chat import prompt_version
+from app.chat.history_cache import history_cache
+from app.chat.persistence import message_writer
 import app.seller.model  # noqa: F401
 import app.product.model  # noqa: F401
 import app.chat.model  # noqa: F401
 import app.guide.model  # noqa: F401
 
+# FK 의존성 역순 (자식 테이블 먼저)
+_TABLES = (
+    "chat_batch_items", "chat_batches", "answer_cache", "guide_chunks", "guide_documents",
+    "messages", "conversation_stats", "prompt_versions", "products", "conversations",
+    "sellers",
+)
+# 정수 PK 시퀀스를 쓰는 테이블
+_SERIAL_TABLES = tuple(t for t in _TABLES if t not in ("prompt_versions", "conversation_stats"))
+
+
+@pytest.fixture()
+def anyio_backend():
+    """비동기 테스트(@pytest.mark.anyio)는 asyncio에서만 실행한다."""
+    return "asyncio"
+
 
 @pytest.fixture()
 def db():
     """테스트용 DB 세션. 각 테스트 후 롤백하여 격리."""
     engine = create_engine(settings.database_url)
-    Base.metadata.create_all(bind=engine)
+    upgrade(engine)
 
     connection = engine.connect()
     transaction = connection.begin()
     session = sessionmaker(bind=connection)()
 
     # 기존 데이터 삭제 (트랜잭션 내부이므로 테스트 후 rollback으로 원복)
-    session.execute(text("DELETE FROM guide_chunks"))
-    session.execute(text("DELETE FROM guide_documents"))
-    session.execute(text("DELETE FROM messages"))
-    session.execute(text("DELETE FROM products"))
-    session.execute(text("DELETE FROM conversations"))
-    session.execute(text("DELETE FROM sellers"))
+    for table in _TABLES:
+        session.execute(text(f"DELETE FROM {table}"))
     session.flush()
 
     yield session
 
     session.close()
     transaction.rollback()
+    _reset_sequences(engine)
+    connection.close()
+
+
+@pytest.fixture()
+async def async_connection():
+    """테스트용 비동기 DB 연결. 트랜잭션 안에서 데이터를 비우고, 테스트 후 롤백한다."""
+    sync_engine = create_engine(settings.database_url)
+    upgrade(sync_engine)
+
+    engine = create_async_engine(settings.async_database_url)
+    connection = await engine.connect()
+    transaction = await connection.begin()
+
+    for table in _TABLES:
+        await connection.execute(text(f"DELETE FROM {table}"))
+    # 롤백으로 지워진 데이터를 가리키지 않도록 프로세스 내 캐시/큐도 비운다
+    history_cache.clear()
+    prompt_version._registered.clear()
+    message_writer._queue.clear()
+
+    yield connection
 
+    await transaction.rollback()
+    await connection.close()
+    await engine.dispose()
+    _reset_sequences(sync_engine)
+
+
+@pytest.fixture()
+def async_session_factory(async_connection):
+    """테스트 트랜잭션에 묶인 세션 팩토리. 서비스 코드의 commit은 savepoint로 처리된다."""
+    return async_sessionmaker(
+        bind=async_connection,
+        expire_on_commit=False,
+        join_transaction_mode="create_savepoint",
+    )
+
+
+@pytest.fixture()
+async def async_db(async_session_factory):
+    """테스트용 비동기 DB 세션."""
+    session = async_session_factory()
+    yield session
+    await session.close()
+
+
+def _reset_sequences(engine) -> None:
     # PostgreSQL 시퀀스는 트랜잭션과 독립적이므로, 롤백 후 시퀀스를 max(id) 기준으로 리셋
     with engine.connect() as reset_conn:
-        for table in ("conversations", "guide_chunks", "guide_documents", "messages", "products", "sellers"):
+        for table in _SERIAL_TABLES:
             reset_conn.execute(
                 text(
                     f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
@@ -44,5 +106,3 @@ def db():
                 )
             )
         reset_conn.commit()
-
-    connection.close()
@@ -0,0 +1,203 @@
+import asyncio
+import gc
+
+import pytest
+
+from app.chat.admission import (
+    AdmissionController,
+    AdmissionRejected,
+    OpenAIRateLimiter,
+    TokenBucket,
+    admitted,
+    parse_reset_duration,
+)
+
+
+def _controller(**overrides) -> AdmissionController:
+    options = dict(
+        max_concurrent=2, max_concurrent_per_seller=1, max_queue=10, max_queue_per_seller=3
+    )
+    options.update(overrides)
+    return AdmissionController(**options)
+
+
+class TestAdmissionController:
+    def test_grants_within_limits(self):
+        controller = _controller()
+
+        a = controller.enqueue(seller_id=1)
+        b = controller.enqueue(seller_id=2)
+
+        assert a.granted and b.granted
+        assert controller.running == 2
+
+    def test_queues_over_per_seller_limit(self):
+        controller = _controller()
+
+        controller.enqueue(seller_id=1)
+        waiting = controller.enqueue(seller_id=1)
+
+        assert not waiting.granted
+        assert waiting.position == 1
+
+    def test_release_grants_next_waiter(self):
+        controller = _controller()
+        first = controller.enqueue(seller_id=1)
+        waiting = controller.enqueue(seller_id=1)
+
+        first.release()
+
+        assert waiting.granted
+        assert controller.queued == 0
+
+    def test_rejects_when_seller_queue_is_full(self):
+        controller = _controller(max_queue_per_seller=1)
+        controller.enqueue(seller_id=1)
+        controller.enqueue(seller_id=1)
+
+        with pytest.raises(AdmissionRejected):
+            controller.enqueue(seller_id=1)
+
+    def test_rejects_when_queue_is_full(self):
+        controller = _controller(max_concurrent=1, max_queue=1)
+        controller.enqueue(seller_id=1)
+        controller.enqueue(seller_id=2)
+
+        with pytest.raises(AdmissionRejected):
+            controller.enqueue(seller_id=3)
+
+    def test_interleaves_sellers_fairly(self):
+        controller = _controller(max_concurrent=1, max_queue_per_seller=5)
+        running = controller.enqueue(seller_id=1)
+        burst = [controller.enqueue(seller_id=1) for _ in range(3)]
+        other = controller.enqueue(seller_id=2)
+
+        order = []
+        for _ in range(4):
+            running.release()
+            running = next(t for t in burst + [other] if t.granted and not t.released)
+            order.append(running.seller_id)
+
+        assert order == [1, 2, 1, 1]
+
+    def test_weight_gives_more_turns(self):
+        controller = _controller(
+            max_concurrent=1, max_concurrent_per_seller=1, max_queue_per_seller=5,
+            weights={2: 2.0},
+        )
+        running = controller.enqueue(seller_id=3)
+        waiting = [controller.enqueue(seller_id=1) for _ in range(2)]
+        waiting += [controller.enqueue(seller_id=2) for _ in range(2)]
+
+        order = []
+        for _ in range(4):
+            running.release()
+            running = next(t for t in waiting if t.granted and not t.released)
+            order.append(running.seller_id)
+
+        assert order == [2, 1, 2, 1]
+
+    def test_release_of_waiter_leaves_queue(self):
+        controller = _controller()
+        controller.enqueue(seller_id=1)
+        waiting = controller.enqueue(seller_id=1)
+
+        waiting.release()
+        waiting.release()
+
+        assert controller.queued == 0
+        assert controller.running == 1
+
+
+@pytest.mark.anyio
+class TestAdmitted:
+    async def test_emits_queue_positions_until_granted(self):
+        controller = _controller(max_concurrent=1)
+        first = controller.enqueue(seller_id=1)
+        second = controller.enqueue(seller_id=2)
+        ticket = controller.enqueue(seller_id=3)
+
+        async def events():
+            yield "done", ""
+
+        stream = admitted(ticket, events())
+        assert await anext(stream) == ("queued", "2")
+
+        first.release()
+        assert await anext(stream) == ("queued", "1")
+
+        second.release()
+        assert [e async for e in stream] == [("done", "")]
+        assert ticket.released
+
+    async def test_passes_events_and_releases(self):
+        controller = _controller()
+        ticket = controller.enqueue(seller_id=1)
+
+        async def events():
+            yield "content", "안녕"
+
+        assert [e async for e in admitted(ticket, events())] == [("content", "안녕")]
+        assert controller.running == 0
+
+    async def test_releases_when_stream_never_started(self):
+        controller = _controller()
+        ticket = controller.enqueue(seller_id=1)
+
+        async def events():
+            yield "done", ""
+
+        admitted(ticket, events())
+        gc.collect()
+
+        assert controller.running == 0
+
+
+class TestRateLimit:
+    def test_parse_reset_duration(self):
+        assert parse_reset_duration("1s") == 1
+        assert parse_reset_duration("6m0s") == 360
+        assert parse_reset_duration("20ms") == pytest.approx(0.02)
+        assert parse_reset_duration("") is None
+
+    def test_bucket_is_unlimited_before_sync(self):
+        assert TokenBucket().delay(1000) == 0
+
+    def test_bucket_waits_for_refill(self):
+        bucket = TokenBucket()
+        bucket.sync(limit=60, remaining=0, reset_seconds=60)
+
+        assert bucket.delay(1) == pytest.approx(1, rel=0.01)
+
+    def test_limiter_reads_headers(self):
+        limiter = OpenAIRateLimiter()
+
+        limiter.update({
+            "x-ratelimit-limit-requests": "500",
+            "x-ratelimit-remaining-requests": "499",
+            "x-ratelimit-reset-requests": "120ms",
+            "x-ratelimit-limit-tokens": "200000",
+            "x-ratelimit-remaining-tokens": "150000",
+            "x-ratelimit-reset-tokens": "15s",
+        })
+
+        assert limiter.requests.level == 499
+        assert limiter.tokens.rate == pytest.approx(50000 / 15)
+
+    @pytest.mark.anyio
+    async def test_acquire_waits_until_tokens_refill(self):
+        limiter = OpenAIRateLimiter()
+        limiter.tokens.sync(limit=1000, remaining=0, reset_seconds=0.1)
+
+        start = asyncio.get_running_loop().time()
+        await limiter.acquire(estimated_tokens=500)
+
+        assert asyncio.get_running_loop().time() - start >= 0.04
+
+    def test_try_acquire_does_not_wait(self):
+        limiter = OpenAIRateLimiter()
+        limiter.tokens.sync(limit=1000, remaining=600, reset_seconds=60)
+
+        assert limiter.try_acquire(estimated_tokens=500) is True
+        assert limiter.try_acquire(estimated_tokens=500) is False
+        assert limiter.tokens.level == pytest.approx(100, abs=1)
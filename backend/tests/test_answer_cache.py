@@ -0,0 +1,110 @@
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import func, select
+
+from app.guide.model import GuideChunk, GuideDocument
+from app.chat.answer_cache import (
+    find_cached_answer,
+    is_cacheable,
+    store_answer,
+    store_answer_later,
+)
+from app.chat.model import CachedAnswer
+
+_EMBED_MOCK_PATH = "app.chat.answer_cache.embed_text_async"
+_DIMENSION = 1536
+
+
+def _vector(*head: float) -> list[float]:
+    return list(head) + [0.0] * (_DIMENSION - len(head))
+
+
+_QUESTION = _vector(1.0)
+_SIMILAR = _vector(1.0, 0.05)
+_DIFFERENT = _vector(0.0, 1.0)
+
+_GUIDE_CALLS = [{"name": "search_guide", "arguments": {"query": "PG"}, "result": {"total": 0}}]
+
+
+async def _add_guide_chunk(db) -> None:
+    doc = GuideDocument(url=f"https://example.com/{id(db)}", title="PG 심사", content="내용")
+    db.add(doc)
+    await db.flush()
+    db.add(GuideChunk(document_id=doc.id, content="내용", embedding=_vector(1.0), chunk_index=0))
+    await db.flush()
+
+
+class TestIsCacheable:
+    def test_guide_only_answer(self):
+        assert is_cacheable("답변", _GUIDE_CALLS)
+
+    def test_answer_without_tools(self):
+        # 가이드 검색 근거 없이 모델이 바로 한 답변은 저장하지 않는다
+        assert not is_cacheable("답변", [])
+
+    def test_product_tool_answer(self):
+        assert not is_cacheable("답변", [{"name": "list_products"}])
+
+    def test_guide_and_product_tool_answer(self):
+        assert not is_cacheable("답변", _GUIDE_CALLS + [{"name": "list_products"}])
+
+    def test_empty_answer(self):
+        assert not is_cacheable("", [])
+
+
+@pytest.mark.anyio
+class TestAnswerCache:
+    async def test_finds_similar_question(self, async_db):
+        await store_answer(async_db, "PG 심사 기간?", _QUESTION, "3~5일 걸려요", _GUIDE_CALLS)
+
+        with patch(_EMBED_MOCK_PATH, return_value=_SIMILAR):
+            embedding, cached = await find_cached_answer(async_db, "PG 심사는 얼마나 걸려요?")
+
+        assert embedding == _SIMILAR
+        assert cached.answer == "3~5일 걸려요"
+        assert cached.tool_calls == _GUIDE_CALLS
+
+    async def test_ignores_dissimilar_question(self, async_db):
+        await store_answer(async_db, "PG 심사 기간?", _QUESTION, "3~5일 걸려요", [])
+
+        with patch(_EMBED_MOCK_PATH, return_value=_DIFFERENT):
+            embedding, cached = await find_cached_answer(async_db, "도메인 연결 방법")
+
+        assert embedding == _DIFFERENT
+        assert cached is None
+
+    async def test_reindexing_guide_invalidates_entries(self, async_db):
+        await store_answer(async_db, "PG 심사 기간?", _QUESTION, "3~5일 걸려요", [])
+
+        await _add_guide_chunk(async_db)
+        with patch(_EMBED_MOCK_PATH, return_value=_QUESTION):
+            _, cached = await find_cached_answer(async_db, "PG 심사 기간?")
+
+        assert cached is None
+
+    async def test_store_removes_entries_of_previous_guide_index(self, async_db):
+        await store_answer(async_db, "이전 질문", _DIFFERENT, "이전 답변", [])
+        await _add_guide_chunk(async_db)
+
+        await store_answer(async_db, "PG 심사 기간?", _QUESTION, "3~5일 걸려요", [])
+
+        count = (await async_db.execute(select(func.count(CachedAnswer.id)))).scalar_one()
+        assert count == 1
+
+    async def test_lookup_failure_returns_nothing(self, async_db):
+        with patch(_EMBED_MOCK_PATH, side_effect=RuntimeError("embedding API down")):
+            embedding, cached = await find_cached_answer(async_db, "PG 심사 기간?")
+
+        assert (embedding, cached) == (None, None)
+
+    async def test_store_later_uses_its_own_session(self, async_db, async_session_factory):
+        await store_answer_later(
+            "PG 심사 기간?", _QUESTION, "3~5일 걸려요", _GUIDE_CALLS,
+            session_factory=async_session_factory,
+        )
+
+        with patch(_EMBED_MOCK_PATH, return_value=_QUESTION):
+            _, cached = await find_cached_answer(async_db, "PG 심사 기간?")
+
+        assert cached.answer == "3~5일 걸려요"
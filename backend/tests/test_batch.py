@@ -0,0 +1,164 @@
+import asyncio
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import select
+
+from app.chat.batch import BatchWorkerPool, batch_detail, create_batch, run_item
+from app.chat.model import BatchItemStatus, ChatBatchItem, Conversation
+from app.seller.model import Seller
+from app.shared.display_id import to_display_id
+
+_STREAM_CHAT_PATH = "app.chat.batch.stream_chat"
+
+
+async def _seller(async_db) -> Seller:
+    seller = Seller(nickname="배치-판매자")
+    async_db.add(seller)
+    await async_db.flush()
+    return seller
+
+
+def _fake_stream_chat(*, error: str | None = None, gate: asyncio.Event | None = None):
+    """대화를 만들고 conversation_id, content, done(또는 error)을 내보내는 stream_chat."""
+    calls = []
+
+    async def stream_chat(db, message, conversation_display_id, seller_id):
+        calls.append((message, seller_id))
+        conversation = Conversation(seller_id=seller_id)
+        db.add(conversation)
+        await db.commit()
+        yield "conversation_id", to_display_id("conversations", conversation.id)
+        if gate is not None:
+            await gate.wait()
+        yield "content", f"{message} 처리했어요"
+        yield ("error", error) if error else ("done", "")
+
+    stream_chat.calls = calls
+    return stream_chat
+
+
+async def _items(async_db, batch_id: int) -> list[ChatBatchItem]:
+    async_db.expire_all()
+    return (
+        await async_db.execute(
+            select(ChatBatchItem)
+            .where(ChatBatchItem.batch_id == batch_id)
+            .order_by(ChatBatchItem.position)
+        )
+    ).scalars().all()
+
+
+@pytest.mark.anyio
+class TestBatch:
+    async def test_create_stores_items_in_order(self, async_db):
+        seller = await _seller(async_db)
+
+        batch, items = await create_batch(async_db, seller.id, ["첫째", "둘째"])
+        detail = batch_detail(batch, items)
+
+        assert [i.message for i in detail.items] == ["첫째", "둘째"]
+        assert (detail.status, detail.total, detail.pending) == ("pending", 2, 2)
+
+    async def test_run_item_saves_conversation(self, async_db, async_session_factory):
+        seller = await _seller(async_db)
+        seller_id = seller.id
+        batch, items = await create_batch(async_db, seller_id, ["가격 올려줘"])
+        fake = _fake_stream_chat()
+
+        with patch(_STREAM_CHAT_PATH, fake):
+            await run_item(items[0].id, async_session_factory)
+
+        item, = await _items(async_db, batch.id)
+        assert item.status == BatchItemStatus.DONE
+        assert item.conversation_id is not None
+        assert item.error is None
+        assert item.started_at is not None and item.finished_at is not None
+        assert fake.calls == [("가격 올려줘", seller_id)]
+
+    async def test_run_item_records_error_event(self, async_db, async_session_factory):
+        seller = await _seller(async_db)
+        batch, items = await create_batch(async_db, seller.id, ["가격 올려줘"])
+
+        with patch(_STREAM_CHAT_PATH, _fake_stream_chat(error="rate limit")):
+            await run_item(items[0].id, async_session_factory)
+
+        item, = await _items(async_db, batch.id)
+        assert (item.status, item.error) == (BatchItemStatus.FAILED, "rate limit")
+
+    async def test_run_item_skips_claimed_item(self, async_db, async_session_factory):
+        seller = await _seller(async_db)
+        batch, items = await create_batch(async_db, seller.id, ["가격 올려줘"])
+        items[0].status = BatchItemStatus.RUNNING
+        await async_db.commit()
+        fake = _fake_stream_chat()
+
+        with patch(_STREAM_CHAT_PATH, fake):
+            await run_item(items[0].id, async_session_factory)
+
+        assert fake.calls == []
+
+    async def test_cancelled_item_is_marked_failed(self, async_db, async_session_factory):
+        seller = await _seller(async_db)
+        batch, items = await create_batch(async_db, seller.id, ["가격 올려줘"])
+        gate = asyncio.Event()
+
+        with patch(_STREAM_CHAT_PATH, _fake_stream_chat(gate=gate)):
+            task = asyncio.create_task(run_item(items[0].id, async_session_factory))
+            await asyncio.sleep(0.05)
+            task.cancel()
+            await asyncio.wait({task})
+
+        item, = await _items(async_db, batch.id)
+        assert item.status == BatchItemStatus.FAILED
+        assert "중단" in item.error
+        assert item.conversation_id is not None
+
+
+@pytest.mark.anyio
+class TestBatchWorkerPool:
+    async def test_start_queues_pending_items_and_bounds_workers(
+        self, async_db, async_session_factory
+    ):
+        seller = await _seller(async_db)
+        _, items = await create_batch(async_db, seller.id, [f"지시 {i}" for i in range(5)])
+        items[0].status = BatchItemStatus.RUNNING
+        await async_db.commit()
+        processed = []
+        running = 0
+        peak = 0
+
+        async def fake_run_item(item_id, session_factory):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            processed.append(item_id)
+            running -= 1
+
+        pool = BatchWorkerPool(workers=2, session_factory=async_session_factory)
+        with patch("app.chat.batch.run_item", fake_run_item):
+            await pool.start()
+            await asyncio.wait_for(pool.join(), timeout=5)
+            await pool.stop()
+
+        # 실행 중(RUNNING)으로 남은 항목은 다시 실행하지 않는다
+        assert sorted(processed) == [item.id for item in items[1:]]
+        assert peak == 2
+
+    async def test_worker_survives_failed_item(self, async_session_factory):
+        processed = []
+
+        async def fake_run_item(item_id, session_factory):
+            if item_id == 1:
+                raise RuntimeError("boom")
+            processed.append(item_id)
+
+        pool = BatchWorkerPool(workers=1, session_factory=async_session_factory)
+        with patch("app.chat.batch.run_item", fake_run_item):
+            await pool.start()
+            pool.submit([1, 2])
+            await asyncio.wait_for(pool.join(), timeout=5)
+            await pool.stop()
+
+        assert processed == [2]
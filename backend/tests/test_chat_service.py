@@ -0,0 +1,468 @@
+import asyncio
+import json
+from collections import defaultdict, deque
+from functools import partial
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy import delete
+
+from app.shared.config import settings
+from app.shared.display_id import parse_pk
+from app.chat import disconnect as disconnect_module
+from app.chat import service
+from app.chat.disconnect import ClientDisconnect
+from app.chat.history_cache import history_cache
+from app.chat.model import CachedAnswer, Message, MessageRole
+from app.chat.persistence import message_writer
+from app.chat.service import (
+    create_or_get_conversation,
+    get_conversation_history,
+    queue_message,
+    stream_chat,
+)
+from app.chat.tools import runner as runner_module
+from app.chat.tools import selection
+from app.chat.tools.definitions import TOOL_DEFINITIONS
+from app.chat.tools.runner import ToolRunner
+from app.chat.tools.selection import tools_for
+from app.seller.model import Seller
+
+
+async def _save(async_db, conversation_id: int, role: MessageRole, content: str, metadata=None):
+    async_db.add(
+        Message(conversation_id=conversation_id, role=role, content=content, metadata_=metadata)
+    )
+    await async_db.commit()
+
+
+@pytest.fixture()
+def history_cache_enabled(monkeypatch):
+    monkeypatch.setattr(settings, "history_cache_enabled", True)
+
+
+@pytest.mark.anyio
+class TestCreateOrGetConversation:
+    async def test_creates_new_conversation(self, async_db):
+        conversation = await create_or_get_conversation(async_db, None)
+
+        assert conversation.id is not None
+
+    async def test_returns_existing_conversation(self, async_db):
+        created = await create_or_get_conversation(async_db, None)
+
+        result = await create_or_get_conversation(async_db, created.id)
+
+        assert result.id == created.id
+
+    async def test_creates_new_when_not_found(self, async_db):
+        result = await create_or_get_conversation(async_db, 9999)
+
+        assert result.id != 9999
+
+
+@pytest.mark.anyio
+class TestGetConversationHistory:
+    async def test_returns_messages_in_order(self, async_db):
+        conversation = await create_or_get_conversation(async_db, None)
+        await _save(async_db, conversation.id, MessageRole.USER, "질문")
+        await _save(async_db, conversation.id, MessageRole.ASSISTANT, "답변")
+
+        history = await get_conversation_history(async_db, conversation.id)
+
+        assert history == [
+            {"role": "user", "content": "질문"},
+            {"role": "assistant", "content": "답변"},
+        ]
+
+    async def test_excludes_aborted_messages(self, async_db):
+        conversation = await create_or_get_conversation(async_db, None)
+        await _save(async_db, conversation.id, MessageRole.USER, "질문")
+        await _save(
+            async_db, conversation.id, MessageRole.ASSISTANT, "중단된 답변", {"aborted": True}
+        )
+
+        history = await get_conversation_history(async_db, conversation.id)
+
+        assert history == [{"role": "user", "content": "질문"}]
+
+    async def test_serves_repeated_reads_from_cache(self, async_db, history_cache_enabled):
+        conversation = await create_or_get_conversation(async_db, None)
+        await _save(async_db, conversation.id, MessageRole.USER, "질문")
+        await get_conversation_history(async_db, conversation.id)
+
+        # DB에서 지워도 캐시에 남아 있으면 다시 조회하지 않는다
+        await async_db.execute(delete(Message).where(Message.conversation_id == conversation.id))
+
+        history = await get_conversation_history(async_db, conversation.id)
+
+        assert history == [{"role": "user", "content": "질문"}]
+
+
+@pytest.mark.anyio
+class TestQueueMessage:
+    async def test_history_includes_unsaved_messages(self, async_db):
+        conversation = await create_or_get_conversation(async_db, None)
+        await _save(async_db, conversation.id, MessageRole.USER, "질문")
+
+        queue_message(conversation.id, MessageRole.ASSISTANT, "답변")
+        queue_message(conversation.id, MessageRole.ASSISTANT, "중단", {"aborted": True})
+
+        history = await get_conversation_history(async_db, conversation.id)
+
+        assert history == [
+            {"role": "user", "content": "질문"},
+            {"role": "assistant", "content": "답변"},
+        ]
+
+    async def test_appends_to_cached_history(self, async_db, history_cache_enabled):
+        conversation = await create_or_get_conversation(async_db, None)
+        await get_conversation_history(async_db, conversation.id)
+
+        queue_message(conversation.id, MessageRole.USER, "질문")
+
+        assert history_cache.get(conversation.id) == [{"role": "user", "content": "질문"}]
+
+    async def test_cached_history_skips_aborted(self, async_db, history_cache_enabled):
+        conversation = await create_or_get_conversation(async_db, None)
+        await get_conversation_history(async_db, conversation.id)
+
+        queue_message(conversation.id, MessageRole.USER, "질문")
+        queue_message(conversation.id, MessageRole.ASSISTANT, "중단", {"aborted": True})
+
+        assert history_cache.get(conversation.id) == [{"role": "user", "content": "질문"}]
+
+
+def _chunk(content=None, tool_calls=None, finish_reason=None, usage=None):
+    choices = [] if usage else [
+        SimpleNamespace(
+            delta=SimpleNamespace(content=content, tool_calls=tool_calls),
+            finish_reason=finish_reason,
+        )
+    ]
+    return SimpleNamespace(usage=usage, choices=choices)
+
+
+def _tool_chunk(index: int, name: str, arguments: dict | None = None):
+    tool_call = SimpleNamespace(
+        index=index,
+        id=f"call_{index}",
+        function=SimpleNamespace(name=name, arguments=json.dumps(arguments or {})),
+    )
+    return _chunk(tool_calls=[tool_call])
+
+
+def _usage_chunk(prompt_tokens: int = 10, completion_tokens: int = 5):
+    usage = SimpleNamespace(prompt_tokens=prompt_tokens, completion_tokens=completion_tokens)
+    return _chunk(usage=usage)
+
+
+class _FakeStream:
+    """OpenAI 스트리밍 응답 대역.
+
+    항목이 예외면 그 자리에서 올리고, 이벤트면 set될 때까지, 숫자면 그 시간(초)만큼 기다린다.
+    """
+
+    def __init__(self, *items):
+        self._items = list(items)
+        self.closed = False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if not self._items:
+            raise StopAsyncIteration
+        item = self._items.pop(0)
+        if isinstance(item, Exception):
+            raise item
+        if isinstance(item, asyncio.Event):
+            await asyncio.wait_for(item.wait(), timeout=2)
+            return await self.__anext__()
+        if isinstance(item, float):
+            await asyncio.sleep(item)
+            return await self.__anext__()
+        return item
+
+    async def close(self):
+        self.closed = True
+
+
+class _FakeTools:
+    """execute_tool 대역. 실행 순서를 기록하고, tool별로 지연이나 대기를 걸 수 있다."""
+
+    def __init__(self):
+        self.executed: list[str] = []
+        self.started: defaultdict[str, asyncio.Event] = defaultdict(asyncio.Event)
+        self.gates: dict[str, asyncio.Event] = {}
+        self.delays: dict[str, float] = {}
+
+    async def __call__(self, ctx, name, arguments):
+        self.started[name].set()
+        if name in self.gates:
+            await self.gates[name].wait()
+        await asyncio.sleep(self.delays.get(json.dumps(arguments, sort_keys=True), 0))
+        self.executed.append(name)
+        return {"tool": name, **arguments}
+
+
+@pytest.fixture()
+def fake_llm(monkeypatch):
+    """stream_chat의 OpenAI 클라이언트를 대역으로 바꾼다. streams에 iteration별 응답을 넣는다."""
+    llm = MagicMock()
+    llm.chat.completions.create = AsyncMock()
+    monkeypatch.setattr(service, "client", llm)
+
+    async def no_embedding(*args):
+        raise RuntimeError("테스트에서는 임베딩을 호출하지 않는다")
+
+    monkeypatch.setattr(selection, "embed_text_async", no_embedding)
+    monkeypatch.setattr(selection, "embed_texts_async", no_embedding)
+    return llm
+
+
+@pytest.fixture()
+def fake_tools(monkeypatch):
+    tools = _FakeTools()
+    monkeypatch.setattr(runner_module, "execute_tool", tools)
+    monkeypatch.setattr(service, "ToolRunner", partial(ToolRunner, session_factory=MagicMock))
+    return tools
+
+
+async def _seller(async_db) -> Seller:
+    seller = Seller(nickname="스트림-판매자")
+    async_db.add(seller)
+    await async_db.flush()
+    return seller
+
+
+def _assistant_metadata(conversation_display_id: str) -> dict:
+    conversation_id = parse_pk(conversation_display_id, "conversations")
+    messages = message_writer.pending(conversation_id)
+    assert messages[-1].role == MessageRole.ASSISTANT
+    return messages[-1].metadata
+
+
+@pytest.mark.anyio
+class TestStreamChat:
+    async def test_dispatches_read_tool_while_stream_continues(
+        self, async_db, fake_llm, fake_tools
+    ):
+        seller = await _seller(async_db)
+        fake_llm.chat.completions.create.side_effect = [
+            _FakeStream(
+                _tool_chunk(0, "list_products", {"name": "A"}),
+                _tool_chunk(1, "list_products", {"status": "active"}),
+                # 첫 tool은 응답이 끝나기 전에 이미 실행되어 있어야 한다
+                fake_tools.started["list_products"],
+                _chunk(finish_reason="tool_calls"),
+                _usage_chunk(),
+            ),
+            _FakeStream(_chunk(content="상품 두 개예요"), _chunk(finish_reason="stop")),
+        ]
+        # 먼저 요청된 tool이 늦게 끝나도 결과는 요청 순서로 모델에 돌려준다
+        fake_tools.delays[json.dumps({"name": "A"})] = 0.05
+
+        events = [e async for e in stream_chat(async_db, "상품 보여줘", None, seller.id)]
+
+        assert [e for e in events if e[0] in ("tool_result", "done", "error")] == [
+            ("tool_result", "list_products"),
+            ("tool_result", "list_products"),
+            ("done", ""),
+        ]
+        assert fake_tools.executed == ["list_products", "list_products"]
+        messages = fake_llm.chat.completions.create.call_args_list[1].kwargs["messages"]
+        assert [tc["id"] for tc in messages[-3]["tool_calls"]] == ["call_0", "call_1"]
+        assert [m["tool_call_id"] for m in messages[-2:]] == ["call_0", "call_1"]
+        assert json.loads(messages[-2]["content"]) == {"tool": "list_products", "name": "A"}
+
+    async def test_holds_mutating_tools_until_finish_reason(self, async_db, fake_llm, fake_tools):
+        seller = await _seller(async_db)
+        fake_llm.chat.completions.create.side_effect = [
+            _FakeStream(
+                _tool_chunk(0, "create_product", {"name": "새 상품", "price": 1000}),
+                _tool_chunk(1, "list_products"),
+                # 조회 tool이었다면 이 사이에 실행된다
+                0.05,
+                RuntimeError("stream reset"),
+            ),
+        ]
+
+        events = [e async for e in stream_chat(async_db, "상품 등록해줘", None, seller.id)]
+
+        assert events[-1] == ("error", "stream reset")
+        assert fake_tools.executed == []
+        assert _assistant_metadata(events[0][1])["tool_calls"] is None
+
+    async def test_error_metadata_records_dispatched_calls(self, async_db, fake_llm, fake_tools):
+        seller = await _seller(async_db)
+        fake_llm.chat.completions.create.side_effect = [
+            _FakeStream(
+                _tool_chunk(0, "list_products", {"status": "active"}),
+                _tool_chunk(1, "list_products"),
+                fake_tools.started["list_products"],
+                RuntimeError("stream reset"),
+            ),
+        ]
+
+        events = [e async for e in stream_chat(async_db, "상품 보여줘", None, seller.id)]
+
+        assert events[-1] == ("error", "stream reset")
+        metadata = _assistant_metadata(events[0][1])
+        assert metadata["error"] == "stream reset"
+        assert [(c["name"], c["arguments"]) for c in metadata["tool_calls"]] == [
+            ("list_products", {"status": "active"}),
+        ]
+
+    async def test_abort_keeps_started_mutating_tool_and_records_it(
+        self, async_db, fake_llm, fake_tools
+    ):
+        seller = await _seller(async_db)
+        stream = _FakeStream(
+            _tool_chunk(0, "create_product", {"name": "새 상품", "price": 1000}),
+            _chunk(finish_reason="tool_calls"),
+            _usage_chunk(),
+        )
+        fake_llm.chat.completions.create.side_effect = [stream]
+        fake_tools.gates["create_product"] = asyncio.Event()
+
+        events = stream_chat(async_db, "상품 등록해줘", None, seller.id)
+        conversation_id = (await anext(events))[1]
+        async for event in events:
+            if event == ("tool_call", "create_product"):
+                break
+        # 변경 tool이 실행 중일 때 클라이언트가 끊긴다
+        await events.aclose()
+
+        metadata = _assistant_metadata(conversation_id)
+        assert metadata["aborted"] is True
+        assert metadata["tool_calls"] == [{
+            "name": "create_product",
+            "arguments": {"name": "새 상품", "price": 1000},
+            "result": None,
+            "status": "running",
+        }]
+        assert stream.closed
+
+        fake_tools.gates["create_product"].set()
+        for _ in range(100):
+            if fake_tools.executed:
+                break
+            await asyncio.sleep(0.01)
+        assert fake_tools.executed == ["create_product"]
+
+    async def test_abort_records_cancel_latency_and_tokens_saved(
+        self, async_db, fake_llm, fake_tools, monkeypatch
+    ):
+        monkeypatch.setattr(disconnect_module, "_recent_output_tokens", deque([50]))
+        seller = await _seller(async_db)
+        stream = _FakeStream(_chunk(content="안녕하세요"), asyncio.Event())
+        fake_llm.chat.completions.create.side_effect = [stream]
+        disconnect = ClientDisconnect(AsyncMock(return_value=True), poll_interval_ms=200)
+
+        events = stream_chat(async_db, "안녕", None, seller.id, disconnect=disconnect)
+        conversation_id = (await anext(events))[1]
+        assert await anext(events) == ("content", "안녕하세요")
+        disconnect.mark()
+        await events.aclose()
+
+        metadata = _assistant_metadata(conversation_id)
+        assert metadata["aborted"] is True
+        assert metadata["cancel_latency_ms"] >= 0
+        # 평균 50토큰에서 취소 전까지 스트리밍된 텍스트만큼 뺀 값
+        assert 0 < metadata["tokens_saved_estimate"] < 50
+        assert stream.closed
+
+    async def test_replays_cached_answer_without_llm(self, async_db, fake_llm, monkeypatch):
+        monkeypatch.setattr(settings, "answer_cache_enabled", True)
+        cached = CachedAnswer(
+            id=7, answer="3~5일 걸려요", tool_calls=[{"name": "search_guide", "arguments": {}}]
+        )
+        monkeypatch.setattr(service, "find_cached_answer", AsyncMock(return_value=([1.0], cached)))
+        seller = await _seller(async_db)
+
+        events = [e async for e in stream_chat(async_db, "PG 심사 기간?", None, seller.id)]
+
+        assert events[1:] == [
+            ("tool_call", "search_guide"),
+            ("tool_result", "search_guide"),
+            ("content", "3~5일 걸려요"),
+            ("done", ""),
+        ]
+        fake_llm.chat.completions.create.assert_not_called()
+        assert _assistant_metadata(events[0][1])["answer_cache_id"] == 7
+
+    async def test_stores_guide_answer_on_cache_miss(
+        self, async_db, fake_llm, fake_tools, monkeypatch
+    ):
+        monkeypatch.setattr(settings, "answer_cache_enabled", True)
+        monkeypatch.setattr(service, "find_cached_answer", AsyncMock(return_value=([1.0], None)))
+        store_later = MagicMock()
+        monkeypatch.setattr(service, "store_answer_later", store_later)
+        fake_llm.chat.completions.create.side_effect = [
+            _FakeStream(
+                _tool_chunk(0, "search_guide", {"query": "PG 심사"}),
+                _chunk(finish_reason="tool_calls"),
+            ),
+            _FakeStream(_chunk(content="3~5일 걸려요"), _chunk(finish_reason="stop")),
+        ]
+        seller = await _seller(async_db)
+
+        events = [e async for e in stream_chat(async_db, "PG 심사 기간?", None, seller.id)]
+
+        assert events[-1] == ("done", "")
+        question, embedding, answer, tool_calls = store_later.call_args.args
+        assert (question, embedding, answer) == ("PG 심사 기간?", [1.0], "3~5일 걸려요")
+        assert [c["name"] for c in tool_calls] == ["search_guide"]
+
+    async def test_does_not_store_answer_without_guide_search(
+        self, async_db, fake_llm, monkeypatch
+    ):
+        monkeypatch.setattr(settings, "answer_cache_enabled", True)
+        monkeypatch.setattr(service, "find_cached_answer", AsyncMock(return_value=([1.0], None)))
+        store_later = MagicMock()
+        monkeypatch.setattr(service, "store_answer_later", store_later)
+        fake_llm.chat.completions.create.side_effect = [
+            _FakeStream(_chunk(content="안녕하세요"), _chunk(finish_reason="stop")),
+        ]
+        seller = await _seller(async_db)
+
+        events = [e async for e in stream_chat(async_db, "안녕", None, seller.id)]
+
+        assert events[-1] == ("done", "")
+        store_later.assert_not_called()
+
+
+    async def test_sends_selected_tools_and_keeps_them_on_follow_up(
+        self, async_db, fake_llm, fake_tools
+    ):
+        seller = await _seller(async_db)
+        fake_llm.chat.completions.create.side_effect = [
+            _FakeStream(_chunk(content="상품이 없어요"), _chunk(finish_reason="stop")),
+            _FakeStream(_chunk(content="배송 설정은..."), _chunk(finish_reason="stop")),
+        ]
+
+        first = [e async for e in stream_chat(async_db, "상품 목록 보여줘", None, seller.id)]
+        conversation_id = first[0][1]
+        first_tools = fake_llm.chat.completions.create.call_args.kwargs["tools"]
+        assert first_tools == tools_for({"product"})
+        assert _assistant_metadata(conversation_id)["tool_domains"] == ["product"]
+
+        async for _ in stream_chat(async_db, "배송 방법도 알려주세요", conversation_id, seller.id):
+            pass
+
+        # 가이드 질문이어도 직전 턴의 상품 도메인을 함께 보낸다 (= 전체 tool)
+        assert fake_llm.chat.completions.create.call_args.kwargs["tools"] == TOOL_DEFINITIONS
+        assert _assistant_metadata(conversation_id)["tool_domains"] is None
+
+
+class TestBuildMetadata:
+    def test_stage_timings_are_not_shared_with_the_turn_record(self):
+        timings = {"llm_ttft": [120]}
+
+        metadata = service._build_metadata(0.0, 0, 0, [], stage_timings=timings)
+        # 메시지를 큐에 넣은 뒤에도 같은 턴의 기록(예: 백그라운드 tool)이 이어 붙을 수 있다
+        timings["llm_ttft"].append(80)
+
+        assert metadata["stage_timings_ms"] == {"llm_ttft": [120]}
@@ -0,0 +1,124 @@
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.chat.compaction import compact_history, plan_window_start
+from app.chat.model import Conversation
+
+# 토큰 수를 글자 수로 단순화 (메시지당 오버헤드 4토큰은 그대로)
+_COUNT_MOCK_PATH = "app.chat.compaction.count_tokens"
+
+
+def _turns(count: int, size: int = 10) -> list[dict]:
+    history = []
+    for i in range(count):
+        history.append({"role": "user", "content": f"{i}" * size})
+        history.append({"role": "assistant", "content": f"{i}" * size})
+    return history
+
+
+def _fake_llm(summary: str = "요약") -> MagicMock:
+    llm = MagicMock()
+    llm.chat.completions.create = AsyncMock(
+        return_value=SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=summary))],
+            usage=SimpleNamespace(prompt_tokens=100, completion_tokens=20),
+        )
+    )
+    return llm
+
+
+@patch(_COUNT_MOCK_PATH, side_effect=len)
+class TestPlanWindowStart:
+    def test_keeps_window_within_budget(self, _):
+        history = _turns(3)  # 6 messages * 14 tokens = 84
+
+        assert plan_window_start(history, 0, budget=100, keep_tokens=50) == 0
+
+    def test_moves_window_to_user_boundary_within_keep_tokens(self, _):
+        history = _turns(5)  # 10 messages * 14 tokens = 140
+
+        start = plan_window_start(history, 0, budget=100, keep_tokens=60)
+
+        assert start == 6  # 마지막 2턴(56토큰)만 원문으로 유지
+        assert history[start]["role"] == "user"
+
+    def test_does_not_move_when_summarized_tail_fits(self, _):
+        history = _turns(5)
+
+        assert plan_window_start(history, 6, budget=100, keep_tokens=60) == 6
+
+    def test_keeps_last_user_message_even_if_oversized(self, _):
+        history = _turns(2) + [{"role": "user", "content": "x" * 500}]
+
+        assert plan_window_start(history, 0, budget=100, keep_tokens=60) == 4
+
+
+@pytest.mark.anyio
+@patch(_COUNT_MOCK_PATH, side_effect=len)
+class TestCompactHistory:
+    async def _conversation(self, async_db) -> Conversation:
+        conversation = Conversation()
+        async_db.add(conversation)
+        await async_db.flush()
+        return conversation
+
+    async def test_returns_full_history_within_budget(self, _, async_db):
+        conversation = await self._conversation(async_db)
+        llm = _fake_llm()
+        history = _turns(2)
+
+        window = await compact_history(async_db, conversation, history, llm=llm)
+
+        assert window.messages == history
+        llm.chat.completions.create.assert_not_called()
+
+    async def test_summarizes_messages_outside_window(self, _, async_db):
+        conversation = await self._conversation(async_db)
+        llm = _fake_llm("이전에 상품A를 등록함")
+        history = _turns(5)
+
+        with (
+            patch("app.chat.compaction.settings.history_token_budget", 100),
+            patch("app.chat.compaction.settings.history_keep_tokens", 60),
+        ):
+            window = await compact_history(async_db, conversation, history, llm=llm)
+
+        assert window.messages[0]["role"] == "system"
+        assert "이전에 상품A를 등록함" in window.messages[0]["content"]
+        assert window.messages[1:] == history[6:]
+        assert conversation.summary == "이전에 상품A를 등록함"
+        assert conversation.summary_message_count == 6
+        assert (window.input_tokens, window.output_tokens) == (100, 20)
+
+    async def test_reuses_stored_summary_when_window_does_not_move(self, _, async_db):
+        conversation = await self._conversation(async_db)
+        conversation.summary = "저장된 요약"
+        conversation.summary_message_count = 6
+        llm = _fake_llm()
+
+        with (
+            patch("app.chat.compaction.settings.history_token_budget", 100),
+            patch("app.chat.compaction.settings.history_keep_tokens", 60),
+        ):
+            window = await compact_history(async_db, conversation, _turns(5), llm=llm)
+
+        llm.chat.completions.create.assert_not_called()
+        assert "저장된 요약" in window.messages[0]["content"]
+        assert len(window.messages) == 5
+
+    async def test_keeps_previous_window_when_summary_fails(self, _, async_db):
+        conversation = await self._conversation(async_db)
+        llm = MagicMock()
+        llm.chat.completions.create = AsyncMock(side_effect=RuntimeError("API 오류"))
+        history = _turns(5)
+
+        with (
+            patch("app.chat.compaction.settings.history_token_budget", 100),
+            patch("app.chat.compaction.settings.history_keep_tokens", 60),
+        ):
+            window = await compact_history(async_db, conversation, history, llm=llm)
+
+        assert window.messages == history
+        assert conversation.summary_message_count == 0
@@ -1,5 +1,19 @@
-from app.chat.model import Conversation, Message, MessageRole
-from app.chat.history import get_conversations, get_messages
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import event
+
+from app.seller.model import Seller
+from app.chat.model import Conversation, Message, MessageRole, PromptVersion
+from app.chat.history import (
+    decode_cursor,
+    encode_cursor,
+    get_conversations,
+    get_message,
+    get_messages,
+)
+from app.chat.persistence import metadata_columns
+from app.chat.stats import backfill_stats
 
 
 def _create_conversation_with_messages(db, metadata=None):
@@ -20,9 +34,11 @@ def _create_conversation_with_messages(db, metadata=None):
         role=MessageRole.ASSISTANT,
         content="재고 관리는 크게 세 가지 방법이 있습니다.",
         metadata_=metadata,
+        **metadata_columns(metadata),
     )
     db.add(assistant_msg)
     db.flush()
+    backfill_stats(db, [conv.id])
 
     return conv
 
@@ -31,7 +47,7 @@ class TestGetConversations:
     def test_returns_conversations(self, db):
         _create_conversation_with_messages(db)
 
-        result = get_conversations(db)
+        result = get_conversations(db).items
 
         assert len(result) == 1
         assert result[0].id.startswith("CON-")
@@ -40,7 +56,7 @@ class TestGetConversations:
     def test_first_message_from_user(self, db):
         _create_conversation_with_messages(db)
 
-        result = get_conversations(db)
+        result = get_conversations(db).items
 
         assert result[0].first_message == "재고 관리 방법 알려줘"
 
@@ -50,19 +66,19 @@ class TestGetConversations:
             "input_tokens": 100,
             "output_tokens": 200,
             "response_time_ms": 1500,
-            "system_prompt": "test",
+            "system_prompt_id": "a" * 64,
             "error": None,
         }
         _create_conversation_with_messages(db, metadata=metadata)
 
-        result = get_conversations(db)
+        result = get_conversations(db).items
 
         assert result[0].total_tokens == 300
 
     def test_total_tokens_zero_without_metadata(self, db):
         _create_conversation_with_messages(db, metadata=None)
 
-        result = get_conversations(db)
+        result = get_conversations(db).items
 
         assert result[0].total_tokens == 0
 
@@ -70,22 +86,107 @@ class TestGetConversations:
         _create_conversation_with_messages(db)
         _create_conversation_with_messages(db)
 
-        result = get_conversations(db)
+        result = get_conversations(db).items
 
         assert len(result) == 2
         assert result[0].created_at >= result[1].created_at
 
+    def test_conversation_without_messages(self, db):
+        db.add(Conversation())
+        db.flush()
+
+        result, = get_conversations(db).items
+
+        assert (result.first_message, result.message_count, result.total_tokens) == ("", 0, 0)
+
     def test_empty_list(self, db):
-        result = get_conversations(db)
+        page = get_conversations(db)
+
+        assert page.items == []
+        assert page.next_cursor is None
+
+    def test_counts_only_first_user_message_and_assistant_tokens(self, db):
+        conv = _create_conversation_with_messages(db, metadata={"input_tokens": 10})
+        db.add(Message(conversation_id=conv.id, role=MessageRole.USER, content="두 번째 질문"))
+        metadata = {"input_tokens": 20, "output_tokens": None}
+        db.add(
+            Message(
+                conversation_id=conv.id,
+                role=MessageRole.ASSISTANT,
+                content="답변",
+                metadata_=metadata,
+                **metadata_columns(metadata),
+            )
+        )
+        db.flush()
+        backfill_stats(db, [conv.id])
+
+        result, = get_conversations(db).items
+
+        assert result.first_message == "재고 관리 방법 알려줘"
+        assert result.message_count == 4
+        assert result.total_tokens == 30
+
+    def test_pages_by_updated_at_and_id(self, db):
+        convs = [_create_conversation_with_messages(db) for _ in range(5)]
+
+        first = get_conversations(db, limit=2)
+        second = get_conversations(db, limit=2, cursor=decode_cursor(first.next_cursor))
+        last = get_conversations(db, limit=2, cursor=decode_cursor(second.next_cursor))
+
+        # 같은 트랜잭션이라 updated_at이 모두 같으므로 id 역순으로 나뉜다
+        ids = [c.id for page in (first, second, last) for c in page.items]
+        assert ids == [f"CON-{c.id}" for c in reversed(convs)]
+        assert last.next_cursor is None
+
+    def test_filters_by_seller(self, db):
+        seller = Seller(nickname="목록-판매자")
+        db.add(seller)
+        db.flush()
+        conv = _create_conversation_with_messages(db)
+        conv.seller_id = seller.id
+        _create_conversation_with_messages(db)
+        db.flush()
+
+        result, = get_conversations(db, seller_id=seller.id).items
+
+        assert result.id == f"CON-{conv.id}"
+        assert result.seller_nickname == "목록-판매자"
+
+    def test_runs_single_query(self, db):
+        for _ in range(3):
+            _create_conversation_with_messages(db)
+        statements = []
+
+        def record(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        engine = db.get_bind().engine
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            get_conversations(db)
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+
+        assert len(statements) == 1
+
+
+class TestDecodeCursor:
+    def test_round_trips(self):
+        updated_at = datetime(2026, 1, 2, 3, 4, 5, 678901, tzinfo=timezone.utc)
+
+        assert decode_cursor(encode_cursor(updated_at, 42)) == (updated_at, 42)
 
-        assert result == []
+    def test_rejects_malformed(self):
+        with pytest.raises(ValueError):
+            decode_cursor("not-a-cursor")
 
 
 class TestGetMessages:
     def test_returns_messages(self, db):
         conv = _create_conversation_with_messages(db)
 
-        result = get_messages(db, conv.id)
+        result = get_messages(db, conv.id).items
 
         assert len(result) == 2
         assert result[0].role == "user"
@@ -94,7 +195,7 @@ class TestGetMessages:
     def test_message_ids_have_prefix(self, db):
         conv = _create_conversation_with_messages(db)
 
-        result = get_messages(db, conv.id)
+        result = get_messages(db, conv.id).items
 
         assert all(m.id.startswith("MSG-") for m in result)
 
@@ -104,12 +205,12 @@ class TestGetMessages:
             "input_tokens": 50,
             "output_tokens": 150,
             "response_time_ms": 800,
-            "system_prompt": "테스트 프롬프트",
+            "system_prompt_id": "b" * 64,
             "error": None,
         }
         conv = _create_conversation_with_messages(db, metadata=metadata)
 
-        result = get_messages(db, conv.id)
+        result = get_messages(db, conv.id).items
         assistant = result[1]
 
         assert assistant.metadata is not None
@@ -121,7 +222,7 @@ class TestGetMessages:
     def test_user_message_has_no_metadata(self, db):
         conv = _create_conversation_with_messages(db)
 
-        result = get_messages(db, conv.id)
+        result = get_messages(db, conv.id).items
         user_msg = result[0]
 
         assert user_msg.metadata is None
@@ -129,6 +230,60 @@ class TestGetMessages:
     def test_ordered_by_created_at(self, db):
         conv = _create_conversation_with_messages(db)
 
-        result = get_messages(db, conv.id)
+        result = get_messages(db, conv.id).items
 
         assert result[0].created_at <= result[1].created_at
+
+    def test_pages_by_created_at_and_id(self, db):
+        conv = _create_conversation_with_messages(db)
+        db.add_all(
+            Message(conversation_id=conv.id, role=MessageRole.USER, content=f"질문 {i}")
+            for i in range(3)
+        )
+        db.flush()
+
+        first = get_messages(db, conv.id, limit=3)
+        second = get_messages(db, conv.id, limit=3, cursor=decode_cursor(first.next_cursor))
+
+        assert [m.content for m in first.items + second.items][2:] == ["질문 0", "질문 1", "질문 2"]
+        assert len(first.items) == 3
+        assert second.next_cursor is None
+
+    def test_summary_has_tool_names_without_results(self, db):
+        conv = _create_conversation_with_messages(db, metadata={
+            "model": "gpt-4o-mini",
+            "tool_calls": [
+                {"name": "list_products", "arguments": {}, "result": {"items": ["A" * 1000]}},
+                {"name": "search_guide", "arguments": {"query": "배송"}, "result": {}},
+            ],
+        })
+
+        assistant = get_messages(db, conv.id).items[1]
+
+        assert assistant.metadata.tool_names == ["list_products", "search_guide"]
+        assert "tool_calls" not in assistant.metadata.model_dump()
+
+
+class TestGetMessage:
+    def test_returns_tool_calls_and_system_prompt(self, db):
+        db.add(PromptVersion(id="c" * 64, content="당신은 상품 관리 도우미입니다."))
+        conv = _create_conversation_with_messages(db, metadata={
+            "system_prompt_id": "c" * 64,
+            "tool_calls": [{"name": "list_products", "arguments": {}, "result": {"total": 0}}],
+        })
+        message_id = db.query(Message.id).filter(
+            Message.conversation_id == conv.id, Message.role == MessageRole.ASSISTANT
+        ).scalar()
+
+        detail = get_message(db, conv.id, message_id)
+
+        assert detail.metadata.tool_calls[0].result == {"total": 0}
+        assert detail.metadata.tool_names == ["list_products"]
+        assert detail.system_prompt == "당신은 상품 관리 도우미입니다."
+
+    def test_returns_none_for_message_of_other_conversation(self, db):
+        conv = _create_conversation_with_messages(db)
+        other = _create_conversation_with_messages(db)
+        message_id = db.query(Message.id).filter(Message.conversation_id == other.id).first()[0]
+
+        assert get_message(db, conv.id, message_id) is None
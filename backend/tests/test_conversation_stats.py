@@ -0,0 +1,96 @@
+import pytest
+from sqlalchemy import select
+
+from app.chat.model import Conversation, ConversationStats, Message, MessageRole
+from app.chat.persistence import MessageWriter, PendingMessage, metadata_columns
+from app.chat.stats import FIRST_MESSAGE_CHARS, backfill_stats
+
+
+def _stats_tuple(stats: ConversationStats) -> tuple:
+    return (
+        stats.message_count,
+        stats.input_tokens,
+        stats.output_tokens,
+        stats.first_message,
+        stats.error_count,
+        stats.aborted_count,
+    )
+
+
+@pytest.mark.anyio
+class TestRecordMessages:
+    async def test_flushes_add_to_stats(self, async_db, async_session_factory):
+        conversation = Conversation()
+        async_db.add(conversation)
+        await async_db.commit()
+        writer = MessageWriter(session_factory=async_session_factory)
+        writer.enqueue(PendingMessage(conversation.id, MessageRole.USER, "첫 질문" * 20))
+        writer.enqueue(PendingMessage(conversation.id, MessageRole.ASSISTANT, "답변", {
+            "input_tokens": 100, "output_tokens": 30,
+        }))
+        await writer.flush()
+        writer.enqueue(PendingMessage(conversation.id, MessageRole.USER, "두 번째 질문"))
+        writer.enqueue(PendingMessage(conversation.id, MessageRole.ASSISTANT, "", {
+            "input_tokens": 50, "error": "rate limit",
+        }))
+        writer.enqueue(PendingMessage(conversation.id, MessageRole.USER, "세 번째 질문"))
+        writer.enqueue(PendingMessage(conversation.id, MessageRole.ASSISTANT, "중단", {
+            "output_tokens": 5, "aborted": True,
+        }))
+        await writer.flush()
+
+        stats = await async_db.get(ConversationStats, conversation.id, populate_existing=True)
+
+        assert _stats_tuple(stats) == (6, 150, 35, ("첫 질문" * 20)[:FIRST_MESSAGE_CHARS], 1, 1)
+        last_message_at = (
+            await async_db.execute(
+                select(Message.created_at)
+                .where(Message.conversation_id == conversation.id)
+                .order_by(Message.created_at.desc())
+                .limit(1)
+            )
+        ).scalar_one()
+        assert stats.last_message_at == last_message_at
+
+
+class TestBackfillStats:
+    def test_recomputes_and_overwrites(self, db):
+        conversation = Conversation()
+        db.add(conversation)
+        db.flush()
+        db.add(ConversationStats(conversation_id=conversation.id, message_count=99))
+        failed = {"input_tokens": 40, "output_tokens": None, "error": "timeout"}
+        aborted = {"input_tokens": 10, "output_tokens": 2, "aborted": True}
+        db.add_all([
+            Message(conversation_id=conversation.id, role=MessageRole.USER, content="질문"),
+            Message(
+                conversation_id=conversation.id,
+                role=MessageRole.ASSISTANT,
+                content="답변",
+                metadata_=failed,
+                **metadata_columns(failed),
+            ),
+            Message(
+                conversation_id=conversation.id,
+                role=MessageRole.ASSISTANT,
+                content="중단",
+                metadata_=aborted,
+                **metadata_columns(aborted),
+            ),
+        ])
+        db.flush()
+
+        backfill_stats(db, [conversation.id])
+
+        stats = db.get(ConversationStats, conversation.id, populate_existing=True)
+        assert _stats_tuple(stats) == (3, 50, 2, "질문", 1, 1)
+        assert stats.last_message_at is not None
+
+    def test_skips_conversation_without_messages(self, db):
+        conversation = Conversation()
+        db.add(conversation)
+        db.flush()
+
+        backfill_stats(db, [conversation.id])
+
+        assert db.get(ConversationStats, conversation.id) is None
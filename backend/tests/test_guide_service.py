@@ -1,5 +1,6 @@
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
+import pytest
 from sqlalchemy import select
 
 from app.shared.crawling.parsers.base import ParseResult
@@ -10,6 +11,7 @@ from app.guide.service import (
     crawl_and_ingest,
     crawl_guide_site,
     search_guide,
+    search_guide_async,
 )
 
 _HTML = "<html><body><h1>제목</h1><p>본문</p></body></html>"
@@ -304,3 +306,28 @@ class TestSearchGuide:
         assert result["content"] == "가이드 내용"
         assert result["url"] == "https://ex.com/page"
         assert result["similarity"] == 1.0
+
+    @pytest.mark.anyio
+    async def test_async_version_returns_same_format(self, async_db):
+        doc = GuideDocument(url="https://ex.com/page", title="가이드 제목", content="가이드 내용")
+        async_db.add(doc)
+        await async_db.flush()
+        async_db.add(GuideChunk(
+            document_id=doc.id, content="가이드 내용",
+            embedding=_make_embedding(0), chunk_index=0,
+        ))
+        await async_db.flush()
+
+        with patch(
+            "app.guide.service.embed_text_async",
+            new=AsyncMock(return_value=_make_embedding(0)),
+        ):
+            results = await search_guide_async(async_db, "질문")
+
+        assert results == [{
+            "title": "가이드 제목",
+            "content": "가이드 내용",
+            "url": "https://ex.com/page",
+            "breadcrumb": None,
+            "similarity": 1.0,
+        }]
@@ -0,0 +1,203 @@
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from app.chat import hedging
+from app.chat.hedging import TtftTracker, hedged_stream, open_stream
+from app.shared.metrics import HEDGE_TOTAL, start_turn
+
+
+class _FakeStream:
+    """delay초 뒤에 청크를 내보내는 스트리밍 응답."""
+
+    def __init__(self, name: str, delay: float, chunks: int = 2, error: Exception | None = None):
+        self.name = name
+        self.delay = delay
+        self.error = error
+        self.remaining = chunks
+        self.closed = False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self.delay:
+            await asyncio.sleep(self.delay)
+            self.delay = 0
+        if self.error:
+            raise self.error
+        if self.remaining == 0:
+            raise StopAsyncIteration
+        self.remaining -= 1
+        return self.name
+
+    async def close(self):
+        self.closed = True
+
+
+def _factory(*streams: _FakeStream):
+    """호출할 때마다 다음 스트림을 반환하는 create 함수."""
+    pending = list(streams)
+
+    async def create():
+        return pending.pop(0)
+
+    return create
+
+
+def _hedge_count(outcome: str) -> float:
+    return HEDGE_TOTAL.labels(outcome=outcome)._value.get()
+
+
+@pytest.fixture(autouse=True)
+def tracker(monkeypatch):
+    tracker = TtftTracker(percentile=90, window=10, min_samples=3, min_budget_ms=0)
+    monkeypatch.setattr(hedging, "ttft_tracker", tracker)
+    return tracker
+
+
+class TestTtftTracker:
+    def test_no_budget_until_min_samples(self, tracker):
+        tracker.add(0.1)
+        tracker.add(0.2)
+
+        assert tracker.budget() is None
+
+    def test_budget_is_percentile(self):
+        tracker = TtftTracker(percentile=90, window=100, min_samples=1, min_budget_ms=0)
+        for i in range(1, 11):
+            tracker.add(i / 10)
+
+        assert tracker.budget() == 1.0
+
+    def test_budget_has_floor(self):
+        tracker = TtftTracker(percentile=90, window=100, min_samples=1, min_budget_ms=500)
+        tracker.add(0.01)
+
+        assert tracker.budget() == 0.5
+
+    def test_keeps_recent_window(self):
+        tracker = TtftTracker(percentile=50, window=2, min_samples=1, min_budget_ms=0)
+        for seconds in (5.0, 0.1, 0.2):
+            tracker.add(seconds)
+
+        assert tracker.budget() == 0.2
+
+
+@pytest.mark.anyio
+class TestOpenStream:
+    async def test_fast_primary_does_not_hedge(self, tracker):
+        primary = _FakeStream("primary", delay=0)
+        hedge = _FakeStream("hedge", delay=0)
+        before = _hedge_count("not_needed")
+
+        stream = await open_stream(_factory(primary, hedge), budget=0.5)
+
+        assert [chunk async for chunk in stream] == ["primary", "primary"]
+        assert hedge.remaining == 2
+        assert _hedge_count("not_needed") == before + 1
+        assert len(tracker._samples) == 1
+
+    async def test_slow_primary_loses_to_hedge(self, tracker):
+        primary = _FakeStream("primary", delay=0.3)
+        hedge = _FakeStream("hedge", delay=0)
+        timings = start_turn()
+        before = _hedge_count("hedge")
+
+        stream = await open_stream(_factory(primary, hedge), budget=0.02)
+
+        assert [chunk async for chunk in stream] == ["hedge", "hedge"]
+        assert _hedge_count("hedge") == before + 1
+        assert timings["llm_hedge"] == [20]
+        # 진 원래 요청은 첫 청크가 올 때까지 기다렸다가 앞당긴 시간을 남기고 닫는다
+        await asyncio.sleep(0.4)
+        assert primary.closed
+        assert 200 <= timings["llm_hedge_gain"][0] <= 400
+        assert len(tracker._samples) == 1
+        await stream.close()
+
+    async def test_close_cancels_waiting_primary(self, tracker):
+        primary = _FakeStream("primary", delay=1)
+        hedge = _FakeStream("hedge", delay=0)
+
+        stream = await open_stream(_factory(primary, hedge), budget=0.02)
+        await stream.close()
+
+        assert hedge.closed
+        assert stream._loser.cancelled()
+        assert not tracker._samples
+
+    async def test_primary_wins_after_hedge_sent(self):
+        primary = _FakeStream("primary", delay=0.05)
+        hedge = _FakeStream("hedge", delay=1)
+        before = _hedge_count("primary")
+
+        stream = await open_stream(_factory(primary, hedge), budget=0.02)
+
+        assert await anext(stream) == "primary"
+        assert _hedge_count("primary") == before + 1
+        assert hedge.closed
+
+    async def test_failed_request_falls_back_to_other(self):
+        primary = _FakeStream("primary", delay=0.05, error=RuntimeError("boom"))
+        hedge = _FakeStream("hedge", delay=0.1)
+
+        stream = await open_stream(_factory(primary, hedge), budget=0.02)
+
+        assert await anext(stream) == "hedge"
+        assert primary.closed
+
+    async def test_raises_when_both_fail(self):
+        primary = _FakeStream("primary", delay=0.05, error=RuntimeError("primary"))
+        hedge = _FakeStream("hedge", delay=0, error=RuntimeError("hedge"))
+
+        with pytest.raises(RuntimeError, match="primary"):
+            await open_stream(_factory(primary, hedge), budget=0.02)
+
+    async def test_skips_hedge_without_rate_limit_room(self):
+        primary = _FakeStream("primary", delay=0.05)
+        hedge = _FakeStream("hedge", delay=0)
+        before = _hedge_count("skipped")
+
+        stream = await open_stream(
+            _factory(primary, hedge), budget=0.01, can_hedge=lambda: False
+        )
+
+        assert await anext(stream) == "primary"
+        assert hedge.remaining == 2
+        assert _hedge_count("skipped") == before + 1
+
+    async def test_no_budget_waits_for_primary(self):
+        primary = _FakeStream("primary", delay=0.05)
+        hedge = _FakeStream("hedge", delay=0)
+        before = _hedge_count("not_needed")
+
+        stream = await open_stream(_factory(primary, hedge), budget=None)
+
+        assert await anext(stream) == "primary"
+        assert hedge.remaining == 2
+        assert _hedge_count("not_needed") == before
+
+
+@pytest.mark.anyio
+class TestHedgedStream:
+    async def test_disabled_returns_original_stream(self):
+        primary = _FakeStream("primary", delay=0)
+
+        with patch("app.chat.hedging.settings.llm_hedge_enabled", False):
+            stream = await hedged_stream(_factory(primary))
+
+        assert stream is primary
+
+    async def test_enabled_uses_tracker_budget(self, tracker):
+        for _ in range(3):
+            tracker.add(0.01)
+        primary = _FakeStream("primary", delay=0.3)
+        hedge = _FakeStream("hedge", delay=0)
+
+        with patch("app.chat.hedging.settings.llm_hedge_enabled", True):
+            stream = await hedged_stream(_factory(primary, hedge))
+
+        assert await anext(stream) == "hedge"
+        await stream.close()
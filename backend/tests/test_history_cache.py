@@ -0,0 +1,90 @@
+from app.chat.history_cache import ConversationHistoryCache
+
+
+def _msg(content: str, role: str = "user") -> dict:
+    return {"role": role, "content": content}
+
+
+def _cache(max_entries: int = 10, max_bytes: int = 10_000) -> ConversationHistoryCache:
+    return ConversationHistoryCache(max_entries=max_entries, max_bytes=max_bytes)
+
+
+class TestConversationHistoryCache:
+    def test_miss_returns_none(self):
+        assert _cache().get(1) is None
+
+    def test_put_and_get(self):
+        cache = _cache()
+        cache.put(1, [_msg("질문")])
+
+        assert cache.get(1) == [_msg("질문")]
+
+    def test_get_returns_copy(self):
+        cache = _cache()
+        cache.put(1, [_msg("질문")])
+
+        cache.get(1).append(_msg("외부 변경"))
+
+        assert cache.get(1) == [_msg("질문")]
+
+    def test_append_to_cached_conversation(self):
+        cache = _cache()
+        cache.put(1, [_msg("질문")])
+
+        cache.append(1, _msg("답변", role="assistant"))
+
+        assert cache.get(1) == [_msg("질문"), _msg("답변", role="assistant")]
+
+    def test_append_ignores_uncached_conversation(self):
+        cache = _cache()
+
+        cache.append(1, _msg("질문"))
+
+        assert cache.get(1) is None
+
+    def test_evicts_least_recently_used_by_entry_count(self):
+        cache = _cache(max_entries=2)
+        cache.put(1, [_msg("a")])
+        cache.put(2, [_msg("b")])
+        cache.get(1)
+
+        cache.put(3, [_msg("c")])
+
+        assert cache.get(1) is not None
+        assert cache.get(2) is None
+        assert cache.get(3) is not None
+
+    def test_evicts_by_byte_budget(self):
+        cache = _cache(max_bytes=300)
+        cache.put(1, [_msg("가" * 40)])  # 120 bytes + overhead
+        cache.put(2, [_msg("나" * 40)])
+
+        assert cache.get(1) is None
+        assert cache.get(2) is not None
+        assert cache.total_bytes <= 300
+
+    def test_skips_history_larger_than_budget(self):
+        cache = _cache(max_bytes=100)
+
+        cache.put(1, [_msg("x" * 200)])
+
+        assert cache.get(1) is None
+        assert cache.total_bytes == 0
+
+    def test_drops_entry_that_grows_beyond_budget(self):
+        cache = _cache(max_bytes=200)
+        cache.put(1, [_msg("x" * 50)])
+
+        cache.append(1, _msg("y" * 100))
+
+        assert cache.get(1) is None
+        assert cache.total_bytes == 0
+
+    def test_invalidate(self):
+        cache = _cache()
+        cache.put(1, [_msg("질문")])
+
+        cache.invalidate(1)
+
+        assert cache.get(1) is None
+        assert len(cache) == 0
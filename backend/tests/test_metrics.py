@@ -0,0 +1,71 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.chat.sse import sse_stream
+from app.shared.metrics import STAGE_SECONDS, measure, measure_tool, observe, start_turn
+
+
+def _sample_count(stage: str) -> float:
+    for metric in STAGE_SECONDS.collect():
+        for sample in metric.samples:
+            if sample.name.endswith("_count") and sample.labels["stage"] == stage:
+                return sample.value
+    return 0.0
+
+
+class TestTurnTimings:
+    def test_records_observations_in_current_turn(self):
+        timings = start_turn()
+
+        observe("llm_ttft", 0.1234)
+        observe("llm_ttft", 0.2)
+        with measure_tool("list_products"):
+            pass
+
+        assert timings["llm_ttft"] == [123, 200]
+        assert len(timings["tool.list_products"]) == 1
+
+    def test_observe_updates_histogram(self):
+        before = _sample_count("vector_query")
+
+        with measure("vector_query"):
+            pass
+
+        assert _sample_count("vector_query") == before + 1
+
+    @pytest.mark.anyio
+    async def test_tasks_created_in_turn_share_timings(self):
+        timings = start_turn()
+
+        async def tool():
+            observe("embedding", 0.05)
+
+        await asyncio.gather(asyncio.create_task(tool()), asyncio.create_task(tool()))
+
+        assert timings["embedding"] == [50, 50]
+
+    @pytest.mark.anyio
+    async def test_turn_started_inside_coalesced_stream_persists(self):
+        seen = {}
+
+        async def events():
+            seen["timings"] = start_turn()
+            yield "content", "a"
+            observe("llm_iteration", 0.01)
+            yield "done", ""
+
+        frames = [frame async for frame in sse_stream(events(), interval_ms=30, max_bytes=1024)]
+
+        assert len(frames) == 2
+        assert seen["timings"] == {"llm_iteration": [10]}
+
+
+def test_metrics_endpoint_exposes_histograms():
+    from app.main import app
+
+    response = TestClient(app).get("/metrics")
+
+    assert response.status_code == 200
+    assert "chat_stage_duration_seconds" in response.text
@@ -0,0 +1,96 @@
+import pytest
+from sqlalchemy import create_engine, text
+
+from app.shared.config import settings
+from app.shared.migration import (
+    Revision,
+    SchemaOutdated,
+    check_revision,
+    current_revision,
+    load_revisions,
+    upgrade,
+)
+
+
+@pytest.fixture()
+def engine():
+    engine = create_engine(settings.database_url)
+    upgrade(engine)
+    yield engine
+    engine.dispose()
+
+
+def _next_revision(upgrade_fn=lambda conn: None, transactional=True) -> Revision:
+    head = load_revisions()[-1].version
+    return Revision(head + 1, "test", upgrade_fn, transactional)
+
+
+def _forget(engine, version: int) -> None:
+    with engine.begin() as conn:
+        conn.execute(text("DELETE FROM schema_revisions WHERE version = :v"), {"v": version})
+
+
+class TestLoadRevisions:
+    def test_numbered_from_one_without_gaps(self):
+        revisions = load_revisions()
+
+        assert [r.version for r in revisions] == list(range(1, len(revisions) + 1))
+
+    def test_index_revisions_run_outside_transaction(self):
+        revisions = {r.name: r for r in load_revisions()}
+
+        assert revisions["initial_schema"].transactional
+        assert not revisions["messages_conversation_index"].transactional
+
+
+class TestUpgrade:
+    def test_is_at_head_after_upgrade(self, engine):
+        with engine.connect() as conn:
+            assert current_revision(conn) == load_revisions()[-1].version
+
+        assert upgrade(engine) == []
+
+    def test_applies_and_records_pending_revision(self, engine):
+        calls = []
+        revision = _next_revision(lambda conn: calls.append(conn.in_transaction()))
+        try:
+            applied = upgrade(engine, revisions=[*load_revisions(), revision])
+
+            assert applied == [revision]
+            assert calls == [True]
+            with engine.connect() as conn:
+                assert current_revision(conn) == revision.version
+            assert upgrade(engine, revisions=[*load_revisions(), revision]) == []
+        finally:
+            _forget(engine, revision.version)
+
+    def test_failed_revision_is_not_recorded(self, engine):
+        def fail(conn):
+            raise RuntimeError("boom")
+
+        revision = _next_revision(fail)
+
+        with pytest.raises(RuntimeError):
+            upgrade(engine, revisions=[*load_revisions(), revision])
+
+        with engine.connect() as conn:
+            assert current_revision(conn) == revision.version - 1
+
+    def test_creates_indexes(self, engine):
+        with engine.connect() as conn:
+            indexes = set(conn.execute(text("SELECT indexname FROM pg_indexes")).scalars())
+
+        assert {
+            "ix_messages_conversation_id_created_at",
+            "ix_conversations_seller_id_updated_at",
+            "ix_products_seller_id_id_active",
+        } <= indexes
+
+
+class TestCheckRevision:
+    def test_passes_at_head(self, engine):
+        check_revision(engine)
+
+    def test_raises_when_behind(self, engine):
+        with pytest.raises(SchemaOutdated):
+            check_revision(engine, revisions=[*load_revisions(), _next_revision()])
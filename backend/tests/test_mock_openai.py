@@ -0,0 +1,120 @@
+import httpx
+import pytest
+from openai import AsyncOpenAI
+
+from scripts import mock_openai
+from scripts.load_test import percentile, run_chat
+
+
+@pytest.fixture()
+def mock_client(monkeypatch):
+    monkeypatch.setattr(mock_openai, "config", mock_openai.MockConfig(ttft_ms=0, tokens_per_sec=0))
+    http_client = httpx.AsyncClient(transport=httpx.ASGITransport(app=mock_openai.app))
+    return AsyncOpenAI(api_key="dummy", base_url="http://mock/v1", http_client=http_client)
+
+
+async def _collect(stream):
+    content, tool_calls, usage = "", {}, None
+    async for chunk in stream:
+        if chunk.usage:
+            usage = chunk.usage
+        if not chunk.choices:
+            continue
+        delta = chunk.choices[0].delta
+        content += delta.content or ""
+        for tc in delta.tool_calls or []:
+            call = tool_calls.setdefault(tc.index, {"name": "", "arguments": ""})
+            call["name"] += tc.function.name or ""
+            call["arguments"] += tc.function.arguments or ""
+    return content, tool_calls, usage
+
+
+@pytest.mark.anyio
+class TestMockOpenAI:
+    async def test_streams_answer(self, mock_client):
+        stream = await mock_client.chat.completions.create(
+            model="gpt-4o-mini",
+            messages=[{"role": "user", "content": "안녕"}],
+            stream=True,
+            stream_options={"include_usage": True},
+        )
+
+        content, tool_calls, usage = await _collect(stream)
+
+        assert content == mock_openai.config.answer
+        assert tool_calls == {}
+        assert usage.completion_tokens > 0
+
+    async def test_streams_scripted_tool_calls_then_answer(self, mock_client):
+        mock_openai.config.tool_calls = [
+            {"name": "search_guide", "arguments": {"query": "배송 설정"}},
+        ]
+        tools = [{"type": "function", "function": {"name": "search_guide", "parameters": {}}}]
+
+        first = await mock_client.chat.completions.create(
+            model="gpt-4o-mini",
+            messages=[{"role": "user", "content": "배송 설정"}],
+            tools=tools,
+            stream=True,
+        )
+        _, tool_calls, _ = await _collect(first)
+        second = await mock_client.chat.completions.create(
+            model="gpt-4o-mini",
+            messages=[
+                {"role": "user", "content": "배송 설정"},
+                {"role": "tool", "tool_call_id": "call_0", "content": "{}"},
+            ],
+            tools=tools,
+            stream=True,
+        )
+        content, _, _ = await _collect(second)
+
+        assert tool_calls == {0: {"name": "search_guide", "arguments": '{"query": "배송 설정"}'}}
+        assert content == mock_openai.config.answer
+
+    async def test_embeddings_are_deterministic(self, mock_client):
+        response = await mock_client.embeddings.create(
+            model="text-embedding-3-small", input=["배송", "배송", "결제"]
+        )
+
+        vectors = [item.embedding for item in response.data]
+        assert len(vectors[0]) == 1536
+        assert vectors[0] == vectors[1]
+        assert vectors[0] != vectors[2]
+
+
+class TestPercentile:
+    def test_interpolates_between_values(self):
+        assert percentile([1, 2, 3, 4], 50) == 2.5
+
+    def test_bounds(self):
+        assert percentile([5, 1, 3], 0) == 1
+        assert percentile([5, 1, 3], 100) == 5
+
+    def test_empty(self):
+        assert percentile([], 99) == 0.0
+
+
+def _sse_client(body: str) -> httpx.AsyncClient:
+    def handler(request):
+        return httpx.Response(200, text=body, headers={"content-type": "text/event-stream"})
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler), base_url="http://app")
+
+
+@pytest.mark.anyio
+class TestRunChat:
+    async def test_counts_done_as_success(self):
+        body = 'data: {"type": "content", "data": "안녕"}\n\ndata: {"type": "done", "data": ""}\n\n'
+        async with _sse_client(body) as client:
+            result = await run_chat(client, "token", "안녕")
+
+        assert result.error is None
+        assert result.duration is not None
+
+    async def test_stream_without_done_is_failure(self):
+        body = 'data: {"type": "content", "data": "안녕"}\n\n'
+        async with _sse_client(body) as client:
+            result = await run_chat(client, "token", "안녕")
+
+        assert result.error == "stream ended without done"
@@ -0,0 +1,197 @@
+import asyncio
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.exc import OperationalError
+
+from app.chat.model import Conversation, Message, MessageRole
+from app.chat.persistence import MessageWriter, PendingMessage
+
+
+class _FlakySessionFactory:
+    """처음 failures번은 연결 오류를 내는 세션 팩토리."""
+
+    def __init__(self, factory, failures: int):
+        self._factory = factory
+        self.failures = failures
+
+    def __call__(self):
+        if self.failures:
+            self.failures -= 1
+            raise OperationalError("INSERT", {}, ConnectionError("connection lost"))
+        return self._factory()
+
+
+async def _create_conversation(db) -> Conversation:
+    conversation = Conversation()
+    db.add(conversation)
+    await db.commit()
+    await db.refresh(conversation)
+    return conversation
+
+
+async def _saved_messages(db, conversation_id: int) -> list[tuple[str, str]]:
+    messages = (
+        await db.execute(
+            select(Message)
+            .where(Message.conversation_id == conversation_id)
+            .order_by(Message.created_at)
+        )
+    ).scalars()
+    return [(m.role.value, m.content) for m in messages]
+
+
+@pytest.mark.anyio
+class TestMessageWriter:
+    async def test_flush_saves_queued_messages_in_order(self, async_db, async_session_factory):
+        conversation = await _create_conversation(async_db)
+        writer = MessageWriter(session_factory=async_session_factory)
+        writer.enqueue(PendingMessage(conversation.id, MessageRole.USER, "질문"))
+        writer.enqueue(PendingMessage(conversation.id, MessageRole.ASSISTANT, "답변"))
+
+        await writer.flush()
+
+        assert len(writer) == 0
+        assert await _saved_messages(async_db, conversation.id) == [
+            ("user", "질문"),
+            ("assistant", "답변"),
+        ]
+
+    async def test_flush_batches_across_conversations(self, async_db, async_session_factory):
+        first = await _create_conversation(async_db)
+        second = await _create_conversation(async_db)
+        writer = MessageWriter(session_factory=async_session_factory, batch_size=2)
+        for conversation in (first, second, first):
+            writer.enqueue(PendingMessage(conversation.id, MessageRole.USER, "질문"))
+
+        await writer.flush()
+
+        assert len(await _saved_messages(async_db, first.id)) == 2
+        assert len(await _saved_messages(async_db, second.id)) == 1
+
+    async def test_flush_touches_conversation_updated_at(self, async_db, async_session_factory):
+        conversation = await _create_conversation(async_db)
+        before = conversation.updated_at
+        writer = MessageWriter(session_factory=async_session_factory)
+        writer.enqueue(PendingMessage(conversation.id, MessageRole.USER, "질문"))
+
+        await writer.flush()
+
+        await async_db.refresh(conversation)
+        assert conversation.updated_at >= before
+
+    async def test_flush_fills_columns_from_metadata(self, async_db, async_session_factory):
+        conversation = await _create_conversation(async_db)
+        writer = MessageWriter(session_factory=async_session_factory)
+        writer.enqueue(PendingMessage(conversation.id, MessageRole.USER, "질문"))
+        writer.enqueue(PendingMessage(conversation.id, MessageRole.ASSISTANT, "", {
+            "model": "gpt-4o-mini",
+            "input_tokens": 120,
+            "output_tokens": 30,
+            "response_time_ms": 900,
+            "error": "rate limit",
+        }))
+
+        await writer.flush()
+
+        rows = (
+            await async_db.execute(
+                select(
+                    Message.input_tokens,
+                    Message.output_tokens,
+                    Message.response_time_ms,
+                    Message.model,
+                    Message.is_error,
+                )
+                .where(Message.conversation_id == conversation.id)
+                .order_by(Message.id)
+            )
+        ).all()
+        assert [tuple(row) for row in rows] == [
+            (None, None, None, None, False),
+            (120, 30, 900, "gpt-4o-mini", True),
+        ]
+
+    async def test_keeps_messages_on_transient_error(self, async_db, async_session_factory):
+        conversation = await _create_conversation(async_db)
+        writer = MessageWriter(session_factory=_FlakySessionFactory(async_session_factory, 1))
+        writer.enqueue(PendingMessage(conversation.id, MessageRole.USER, "질문"))
+
+        with pytest.raises(OperationalError):
+            await writer.flush()
+        assert len(writer) == 1
+
+        await writer.flush()
+
+        assert await _saved_messages(async_db, conversation.id) == [("user", "질문")]
+
+    async def test_drops_only_messages_that_cannot_be_saved(self, async_db, async_session_factory):
+        conversation = await _create_conversation(async_db)
+        writer = MessageWriter(session_factory=async_session_factory)
+        writer.enqueue(PendingMessage(conversation.id, MessageRole.USER, "질문"))
+        writer.enqueue(PendingMessage(9999, MessageRole.USER, "없는 대화"))
+
+        await writer.flush()
+
+        assert len(writer) == 0
+        assert await _saved_messages(async_db, conversation.id) == [("user", "질문")]
+
+    async def test_drops_unserializable_message_and_saves_the_rest(
+        self, async_db, async_session_factory
+    ):
+        conversation = await _create_conversation(async_db)
+        writer = MessageWriter(session_factory=async_session_factory)
+        # DB 오류가 아닌 오류(JSON 직렬화 실패)도 다시 시도하지 않고 그 메시지만 버린다
+        writer.enqueue(PendingMessage(conversation.id, MessageRole.USER, "불량", {"x": object()}))
+        writer.enqueue(PendingMessage(conversation.id, MessageRole.USER, "질문"))
+        writer.enqueue(PendingMessage(conversation.id, MessageRole.ASSISTANT, "답변"))
+
+        await writer.flush()
+
+        assert len(writer) == 0
+        assert await _saved_messages(async_db, conversation.id) == [
+            ("user", "질문"),
+            ("assistant", "답변"),
+        ]
+
+    async def test_drops_new_messages_past_max_pending(self):
+        writer = MessageWriter(max_pending=2)
+        for content in ("첫째", "둘째", "셋째"):
+            writer.enqueue(PendingMessage(1, MessageRole.USER, content))
+
+        assert [m.content for m in writer.pending(1)] == ["첫째", "둘째"]
+
+    async def test_pending_returns_unsaved_messages_of_conversation(self):
+        writer = MessageWriter()
+        writer.enqueue(PendingMessage(1, MessageRole.USER, "질문"))
+        writer.enqueue(PendingMessage(2, MessageRole.USER, "다른 대화"))
+
+        pending = writer.pending(1)
+
+        assert [m.content for m in pending] == ["질문"]
+
+    async def test_background_task_flushes_after_enqueue(self, async_db, async_session_factory):
+        conversation = await _create_conversation(async_db)
+        writer = MessageWriter(session_factory=async_session_factory, flush_interval_ms=1)
+        writer.start()
+        try:
+            writer.enqueue(PendingMessage(conversation.id, MessageRole.USER, "질문"))
+            for _ in range(100):
+                if not len(writer):
+                    break
+                await asyncio.sleep(0.01)
+        finally:
+            await writer.stop()
+
+        assert await _saved_messages(async_db, conversation.id) == [("user", "질문")]
+
+    async def test_stop_flushes_remaining_messages(self, async_db, async_session_factory):
+        conversation = await _create_conversation(async_db)
+        writer = MessageWriter(session_factory=async_session_factory, flush_interval_ms=10_000)
+        writer.start()
+        writer.enqueue(PendingMessage(conversation.id, MessageRole.USER, "질문"))
+
+        await writer.stop()
+
+        assert len(writer) == 0
+        assert await _saved_messages(async_db, conversation.id) == [("user", "질문")]
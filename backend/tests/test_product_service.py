@@ -1,7 +1,17 @@
 import pytest
 
 from app.product.model import ProductStatus
-from app.product.service import create_product, delete_product, list_products, update_product
+from app.product.service import (
+    create_product,
+    create_product_async,
+    delete_product,
+    delete_product_async,
+    list_products,
+    list_products_page_async,
+    update_product,
+    update_product_async,
+)
+from app.seller.model import Seller
 from app.seller.service import create_seller
 
 
@@ -231,3 +241,97 @@ class TestDeleteProduct:
 
         with pytest.raises(ValueError, match="상품을 찾을 수 없습니다"):
             delete_product(db, seller_id=seller.id, product_id=product.id)
+
+
+async def _create_seller_async(async_db, nickname: str = "비동기-판매자-1") -> Seller:
+    seller = Seller(nickname=nickname)
+    async_db.add(seller)
+    await async_db.flush()
+    return seller
+
+
+@pytest.mark.anyio
+class TestAsyncProductService:
+    async def test_create_and_list(self, async_db):
+        seller = await _create_seller_async(async_db)
+        await create_product_async(async_db, seller_id=seller.id, name="상품A", price=1000)
+        await create_product_async(async_db, seller_id=seller.id, name="상품B", price=2000)
+
+        page = await list_products_page_async(async_db, seller_id=seller.id, limit=10)
+
+        assert [p.name for p in page.products] == ["상품B", "상품A"]
+        assert (page.total, page.remaining) == (2, 0)
+
+    async def test_list_filters_by_name(self, async_db):
+        seller = await _create_seller_async(async_db)
+        await create_product_async(async_db, seller_id=seller.id, name="여름 티셔츠", price=1000)
+        await create_product_async(async_db, seller_id=seller.id, name="겨울 코트", price=2000)
+
+        page = await list_products_page_async(
+            async_db, seller_id=seller.id, limit=10, name="티셔츠"
+        )
+
+        assert [p.name for p in page.products] == ["여름 티셔츠"]
+        assert page.total == 1
+
+    async def test_page_after_cursor_keeps_full_total(self, async_db):
+        seller = await _create_seller_async(async_db)
+        products = [
+            await create_product_async(async_db, seller_id=seller.id, name=f"상품{i}", price=1000)
+            for i in range(4)
+        ]
+
+        page = await list_products_page_async(
+            async_db, seller_id=seller.id, limit=2, before_id=products[3].id
+        )
+
+        assert [p.name for p in page.products] == ["상품2", "상품1"]
+        assert (page.total, page.remaining) == (4, 1)
+
+    async def test_empty_page_after_cursor_keeps_full_total(self, async_db):
+        seller = await _create_seller_async(async_db)
+        product = await create_product_async(async_db, seller_id=seller.id, name="상품", price=1)
+
+        page = await list_products_page_async(
+            async_db, seller_id=seller.id, limit=2, before_id=product.id
+        )
+
+        assert (page.products, page.total, page.remaining) == ([], 1, 0)
+
+    async def test_page_empty(self, async_db):
+        seller = await _create_seller_async(async_db)
+
+        page = await list_products_page_async(async_db, seller_id=seller.id, limit=10)
+
+        assert (page.products, page.total, page.remaining) == ([], 0, 0)
+
+    async def test_update(self, async_db):
+        seller = await _create_seller_async(async_db)
+        product = await create_product_async(async_db, seller_id=seller.id, name="상품", price=1000)
+
+        updated = await update_product_async(
+            async_db, seller_id=seller.id, product_id=product.id, price=2000, status="inactive"
+        )
+
+        assert updated.price == 2000
+        assert updated.status == ProductStatus.INACTIVE
+
+    async def test_update_raises_for_other_seller(self, async_db):
+        seller_a = await _create_seller_async(async_db, "비동기-판매자-A")
+        seller_b = await _create_seller_async(async_db, "비동기-판매자-B")
+        product = await create_product_async(async_db, seller_id=seller_a.id, name="상품", price=1000)
+
+        with pytest.raises(ValueError, match="상품을 찾을 수 없습니다"):
+            await update_product_async(
+                async_db, seller_id=seller_b.id, product_id=product.id, name="변경"
+            )
+
+    async def test_delete_excludes_from_list(self, async_db):
+        seller = await _create_seller_async(async_db)
+        product = await create_product_async(async_db, seller_id=seller.id, name="상품", price=1000)
+
+        deleted = await delete_product_async(async_db, seller_id=seller.id, product_id=product.id)
+
+        assert deleted.is_deleted is True
+        page = await list_products_page_async(async_db, seller_id=seller.id, limit=10)
+        assert page.total == 0
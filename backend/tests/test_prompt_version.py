@@ -0,0 +1,45 @@
+import hashlib
+
+import pytest
+
+from app.chat.model import PromptVersion
+from app.chat.prompt_version import ensure_prompt_version, get_prompt_version, prompt_hash
+
+
+class TestPromptHash:
+    def test_sha256_of_content(self):
+        assert prompt_hash("프롬프트") == hashlib.sha256("프롬프트".encode()).hexdigest()
+
+    def test_same_content_same_hash(self):
+        assert prompt_hash("a") == prompt_hash("a")
+        assert prompt_hash("a") != prompt_hash("b")
+
+
+@pytest.mark.anyio
+class TestEnsurePromptVersion:
+    async def test_stores_prompt_once(self, async_db):
+        first = await ensure_prompt_version(async_db, "시스템 프롬프트")
+        second = await ensure_prompt_version(async_db, "시스템 프롬프트")
+
+        stored = await async_db.get(PromptVersion, first)
+        assert first == second == prompt_hash("시스템 프롬프트")
+        assert stored.content == "시스템 프롬프트"
+
+    async def test_ignores_existing_row(self, async_db):
+        async_db.add(PromptVersion(id=prompt_hash("기존"), content="기존"))
+        await async_db.flush()
+
+        prompt_id = await ensure_prompt_version(async_db, "기존")
+
+        assert prompt_id == prompt_hash("기존")
+
+
+class TestGetPromptVersion:
+    def test_returns_prompt(self, db):
+        db.add(PromptVersion(id=prompt_hash("내용"), content="내용"))
+        db.flush()
+
+        assert get_prompt_version(db, prompt_hash("내용")).content == "내용"
+
+    def test_returns_none_when_missing(self, db):
+        assert get_prompt_version(db, "missing") is None
@@ -0,0 +1,150 @@
+from functools import partial
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.shared import embedding
+from app.shared.display_id import parse_pk
+from app.chat import service
+from app.chat.model import Conversation, Message, MessageRole
+from app.chat.persistence import message_writer
+from app.chat.tools import runner as runner_module
+from app.chat.tools.runner import ToolRunner
+from app.seller.model import Seller
+from scripts.replay_benchmark import (
+    RecordedTurn,
+    ScriptedOpenAI,
+    load_conversations,
+    replay_turn,
+    split_iterations,
+)
+
+
+def _call(tool_name: str, **arguments) -> dict:
+    return {"name": tool_name, "arguments": arguments, "result": {"ok": True}}
+
+
+async def _conversation(async_db, *messages: tuple[MessageRole, str, dict | None]) -> int:
+    seller = Seller(nickname="재생-판매자")
+    async_db.add(seller)
+    await async_db.flush()
+    conversation = Conversation(seller_id=seller.id)
+    async_db.add(conversation)
+    await async_db.flush()
+    async_db.add_all(
+        Message(conversation_id=conversation.id, role=role, content=content, metadata_=metadata)
+        for role, content, metadata in messages
+    )
+    await async_db.commit()
+    return conversation.id
+
+
+class TestSplitIterations:
+    def test_splits_where_read_and_mutating_tools_alternate(self):
+        calls = [
+            _call("list_products", name="A"),
+            _call("search_guide", query="배송"),
+            _call("update_product", product_id="PRD-1", price=1000),
+            _call("delete_product", product_id="PRD-2"),
+            _call("list_products"),
+        ]
+
+        iterations = split_iterations(calls)
+
+        assert [[c["name"] for c in it] for it in iterations] == [
+            ["list_products", "search_guide"],
+            ["update_product", "delete_product"],
+            ["list_products"],
+        ]
+        assert iterations[0][0] == {"name": "list_products", "arguments": {"name": "A"}}
+
+
+@pytest.mark.anyio
+class TestLoadConversations:
+    async def test_pairs_turns_and_skips_failed_ones(self, async_db):
+        conversation_id = await _conversation(
+            async_db,
+            (MessageRole.USER, "상품 보여줘", None),
+            (MessageRole.ASSISTANT, "두 개예요", {
+                "tool_calls": [_call("list_products")], "input_tokens": 30, "output_tokens": 5,
+            }),
+            (MessageRole.USER, "가이드 찾아줘", None),
+            (MessageRole.ASSISTANT, "", {"error": "rate limit"}),
+            (MessageRole.USER, "고마워요", None),
+            (MessageRole.ASSISTANT, "천만에요", {"tool_calls": None}),
+        )
+
+        conversation, = await load_conversations(async_db, limit=10)
+
+        assert conversation.id == conversation_id
+        assert conversation.turns == [
+            RecordedTurn(
+                message="상품 보여줘",
+                answer="두 개예요",
+                iterations=[[{"name": "list_products", "arguments": {}}]],
+                input_tokens=30,
+                output_tokens=5,
+            ),
+            RecordedTurn(message="고마워요", answer="천만에요"),
+        ]
+
+    async def test_skip_mutating_drops_conversation(self, async_db):
+        await _conversation(
+            async_db,
+            (MessageRole.USER, "가격 올려줘", None),
+            (MessageRole.ASSISTANT, "올렸어요", {
+                "tool_calls": [_call("update_product", product_id="PRD-1", price=2000)],
+            }),
+        )
+
+        assert len(await load_conversations(async_db, limit=10)) == 1
+        assert await load_conversations(async_db, limit=10, skip_mutating=True) == []
+
+
+@pytest.mark.anyio
+class TestReplayTurn:
+    async def test_drives_stream_chat_with_recorded_responses(
+        self, async_db, async_session_factory, monkeypatch
+    ):
+        llm = ScriptedOpenAI()
+        monkeypatch.setattr(service, "client", llm)
+        monkeypatch.setattr(embedding, "async_client", llm)
+        executed = []
+
+        async def execute_tool(ctx, name, arguments):
+            executed.append((name, arguments))
+            return {"tool": name}
+
+        monkeypatch.setattr(runner_module, "execute_tool", execute_tool)
+        monkeypatch.setattr(service, "ToolRunner", partial(ToolRunner, session_factory=MagicMock))
+        seller = Seller(nickname="재생-판매자")
+        async_db.add(seller)
+        await async_db.commit()
+        turn = RecordedTurn(
+            message="A 상품 가격 2000원으로 바꿔줘",
+            answer="A 상품 가격을 2,000원으로 바꿨어요.",
+            iterations=split_iterations([
+                _call("list_products", name="A"),
+                _call("update_product", product_id="PRD-1", price=2000),
+            ]),
+            input_tokens=120,
+            output_tokens=40,
+        )
+
+        result, display_id = await replay_turn(
+            turn, seller.id, None, chars_per_chunk=3, session_factory=async_session_factory
+        )
+
+        assert result.error is None
+        assert result.frames > 0 and result.first_frame is not None
+        assert executed == [
+            ("list_products", {"name": "A"}),
+            ("update_product", {"product_id": "PRD-1", "price": 2000}),
+        ]
+        assistant = message_writer.pending(parse_pk(display_id, "conversations"))[-1]
+        assert assistant.content == turn.answer
+        assert assistant.metadata["input_tokens"] == 120
+        assert assistant.metadata["output_tokens"] == 40
+        assert [c["name"] for c in assistant.metadata["tool_calls"]] == [
+            "list_products", "update_product",
+        ]
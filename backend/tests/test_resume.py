@@ -0,0 +1,181 @@
+import asyncio
+
+import pytest
+
+from app.chat.resume import TurnLog, TurnLogRegistry, parse_event_id
+
+
+def _registry(**overrides) -> TurnLogRegistry:
+    options = {"ttl_seconds": 60, "max_bytes": 1024 * 1024, "turn_max_bytes": 64 * 1024}
+    options.update(overrides)
+    options.setdefault("grace_ms", 50)
+    return TurnLogRegistry(**options)
+
+
+def _turn(*items, gate: asyncio.Event | None = None, cancelled: asyncio.Event | None = None):
+    """items를 내보내고, gate가 있으면 마지막 이벤트 전에 기다리는 턴."""
+
+    def make_events(disconnect):
+        async def events():
+            try:
+                for i, item in enumerate(items):
+                    if gate is not None and i == len(items) - 1:
+                        await gate.wait()
+                    yield item
+            except asyncio.CancelledError:
+                if cancelled is not None:
+                    cancelled.set()
+                raise
+
+        return events()
+
+    return make_events
+
+
+async def _collect(stream) -> list[tuple[str, str, str]]:
+    return [event async for event in stream]
+
+
+class TestParseEventId:
+    def test_splits_turn_and_sequence(self):
+        assert parse_event_id("abc123:7") == ("abc123", 7)
+
+    def test_rejects_malformed(self):
+        assert parse_event_id("abc123") is None
+        assert parse_event_id(":3") is None
+        assert parse_event_id("abc:x") is None
+
+
+class TestTurnLog:
+    def test_drops_oldest_over_cap(self):
+        log = TurnLog("t", seller_id=1, max_bytes=200, grace_seconds=0)
+        for i in range(5):
+            log.append("content", str(i))
+
+        assert log.size <= 200
+        assert not log.can_resume(0)
+        assert log.can_resume(log.last_seq - 1)
+
+    def test_cannot_resume_ahead_of_log(self):
+        log = TurnLog("t", seller_id=1, max_bytes=1024, grace_seconds=0)
+        log.append("content", "a")
+
+        assert log.can_resume(1)
+        assert not log.can_resume(2)
+
+
+@pytest.mark.anyio
+class TestTurnLogRegistry:
+    async def test_subscriber_receives_events_with_ids(self):
+        registry = _registry()
+        log = registry.start(1, _turn(("conversation_id", "CONV-1"), ("done", "")))
+
+        events = await asyncio.wait_for(_collect(log.subscribe()), timeout=1)
+
+        assert events == [
+            ("conversation_id", "CONV-1", f"{log.turn_id}:1"),
+            ("done", "", f"{log.turn_id}:2"),
+        ]
+
+    async def test_resume_replays_missed_events_and_follows_turn(self):
+        registry = _registry()
+        gate = asyncio.Event()
+        log = registry.start(
+            1, _turn(("conversation_id", "CONV-1"), ("content", "안녕"), ("done", ""), gate=gate)
+        )
+        first = log.subscribe()
+        assert await anext(first) == ("conversation_id", "CONV-1", f"{log.turn_id}:1")
+        await first.aclose()
+
+        resumed = registry.get(log.turn_id, seller_id=1).subscribe(after=1)
+        gate.set()
+        events = await asyncio.wait_for(_collect(resumed), timeout=1)
+
+        assert [e[:2] for e in events] == [("content", "안녕"), ("done", "")]
+
+    async def test_cancels_turn_after_grace_without_subscribers(self):
+        registry = _registry(grace_ms=20)
+        cancelled = asyncio.Event()
+        log = registry.start(
+            1,
+            _turn(("conversation_id", "CONV-1"), ("done", ""), gate=asyncio.Event(),
+                  cancelled=cancelled),
+        )
+        stream = log.subscribe()
+        await anext(stream)
+        await stream.aclose()
+
+        await asyncio.wait_for(cancelled.wait(), timeout=1)
+        await asyncio.wait({log.task})
+
+        assert log.finished
+        assert log.disconnect.latency_ms() is not None
+
+    async def test_reattach_within_grace_keeps_turn(self):
+        registry = _registry(grace_ms=50)
+        gate = asyncio.Event()
+        log = registry.start(1, _turn(("conversation_id", "CONV-1"), ("done", ""), gate=gate))
+        stream = log.subscribe()
+        await anext(stream)
+        await stream.aclose()
+
+        resumed = log.subscribe(after=1)
+        await asyncio.sleep(0.1)
+        gate.set()
+        events = await asyncio.wait_for(_collect(resumed), timeout=1)
+
+        assert [e[0] for e in events] == ["done"]
+        assert log.disconnect.latency_ms() is None
+
+    async def test_unread_subscription_still_detaches(self):
+        registry = _registry(grace_ms=20)
+        cancelled = asyncio.Event()
+        log = registry.start(
+            1, _turn(("done", ""), gate=asyncio.Event(), cancelled=cancelled)
+        )
+        log.subscribe()
+
+        await asyncio.wait_for(cancelled.wait(), timeout=1)
+
+    async def test_hides_other_sellers_turn(self):
+        registry = _registry()
+        log = registry.start(1, _turn(("done", "")))
+
+        assert registry.get(log.turn_id, seller_id=2) is None
+        assert registry.get(log.turn_id, seller_id=1) is log
+
+    async def test_expires_finished_logs_after_ttl(self):
+        registry = _registry(ttl_seconds=0)
+        log = registry.start(1, _turn(("done", "")))
+        await asyncio.wait({log.task})
+        await asyncio.sleep(0.01)
+
+        assert registry.get(log.turn_id, seller_id=1) is None
+        assert registry.total_bytes == 0
+
+    async def test_evicts_finished_before_running_logs(self):
+        registry = _registry(max_bytes=300)
+        gate = asyncio.Event()
+        finished = registry.start(1, _turn(("content", "a" * 100)))
+        await asyncio.wait({finished.task})
+        running = registry.start(1, _turn(("content", "b" * 100), ("done", ""), gate=gate))
+        await asyncio.sleep(0.01)
+
+        assert registry.get(finished.turn_id, seller_id=1) is None
+        assert registry.get(running.turn_id, seller_id=1) is running
+        gate.set()
+        await asyncio.wait({running.task})
+
+    async def test_failed_turn_ends_with_error_event(self):
+        def make_events(disconnect):
+            async def events():
+                yield "conversation_id", "CONV-1"
+                raise RuntimeError("boom")
+
+            return events()
+
+        log = _registry().start(1, make_events)
+
+        events = await asyncio.wait_for(_collect(log.subscribe()), timeout=1)
+
+        assert [e[:2] for e in events] == [("conversation_id", "CONV-1"), ("error", "boom")]
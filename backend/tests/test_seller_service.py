@@ -4,6 +4,8 @@ from unittest.mock import patch
 import pytest
 
 from app.chat.model import Conversation, Message, MessageRole
+from app.chat.persistence import metadata_columns
+from app.chat.stats import backfill_stats
 from app.seller.model import Seller
 from app.seller.service import create_seller, get_seller_by_token, get_seller_detail, generate_nickname
 
@@ -86,9 +88,11 @@ def _create_conversation_with_messages(db, seller, metadata=None):
         role=MessageRole.ASSISTANT,
         content="테스트 답변",
         metadata_=metadata,
+        **metadata_columns(metadata),
     )
     db.add(assistant_msg)
     db.flush()
+    backfill_stats(db, [conv.id])
 
     return conv
 
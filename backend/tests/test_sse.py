@@ -0,0 +1,178 @@
+import asyncio
+import json
+from collections import deque
+
+import pytest
+
+from app.chat import disconnect as disconnect_module
+from app.chat.disconnect import ClientDisconnect, estimate_tokens_saved, record_output_tokens
+from app.chat.sse import sse_event, sse_stream
+
+
+def _parse(frames: list[str]) -> list[tuple[str, str]]:
+    events = []
+    for frame in frames:
+        assert frame.startswith("data: ") and frame.endswith("\n\n")
+        payload = json.loads(frame[len("data: "):])
+        events.append((payload["type"], payload["data"]))
+    return events
+
+
+async def _events(items, delay: float = 0):
+    for item in items:
+        if delay:
+            await asyncio.sleep(delay)
+        yield item
+
+
+async def _collect(stream) -> list[str]:
+    return [frame async for frame in stream]
+
+
+class TestSseEvent:
+    def test_encodes_json_frame(self):
+        frame = sse_event("content", "안녕")
+
+        assert frame == 'data: {"type": "content", "data": "안녕"}\n\n'
+
+    def test_adds_event_id(self):
+        frame = sse_event("done", "", "turn:3")
+
+        assert frame == 'id: turn:3\ndata: {"type": "done", "data": ""}\n\n'
+
+
+@pytest.mark.anyio
+class TestSseStream:
+    async def test_passes_through_when_disabled(self):
+        items = [("content", "안"), ("content", "녕"), ("done", "")]
+
+        frames = await _collect(sse_stream(_events(items), interval_ms=0, max_bytes=1024))
+
+        assert _parse(frames) == items
+
+    async def test_coalesces_content_within_interval(self):
+        items = [("content", "안"), ("content", "녕"), ("content", "하세요"), ("done", "")]
+
+        frames = await _collect(sse_stream(_events(items), interval_ms=1000, max_bytes=1024))
+
+        assert _parse(frames) == [("content", "안녕하세요"), ("done", "")]
+
+    async def test_coalesced_content_carries_last_event_id(self):
+        items = [("content", "안", "t:1"), ("content", "녕", "t:2"), ("done", "", "t:3")]
+
+        frames = await _collect(sse_stream(_events(items), interval_ms=1000, max_bytes=1024))
+
+        assert frames == [
+            'id: t:2\ndata: {"type": "content", "data": "안녕"}\n\n',
+            'id: t:3\ndata: {"type": "done", "data": ""}\n\n',
+        ]
+
+    async def test_flushes_before_other_events(self):
+        items = [
+            ("conversation_id", "CONV-1"),
+            ("content", "상품을"),
+            ("content", " 조회할게요"),
+            ("tool_call", "list_products"),
+            ("tool_result", "list_products"),
+            ("content", "완료"),
+            ("done", ""),
+        ]
+
+        frames = await _collect(sse_stream(_events(items), interval_ms=1000, max_bytes=1024))
+
+        assert _parse(frames) == [
+            ("conversation_id", "CONV-1"),
+            ("content", "상품을 조회할게요"),
+            ("tool_call", "list_products"),
+            ("tool_result", "list_products"),
+            ("content", "완료"),
+            ("done", ""),
+        ]
+
+    async def test_flushes_when_max_bytes_reached(self):
+        # 한글 한 글자 = 3바이트
+        items = [("content", "가"), ("content", "나"), ("content", "다"), ("done", "")]
+
+        frames = await _collect(sse_stream(_events(items), interval_ms=1000, max_bytes=6))
+
+        assert _parse(frames) == [("content", "가나"), ("content", "다"), ("done", "")]
+
+    async def test_flushes_when_interval_elapses(self):
+        async def slow_events():
+            yield "content", "먼저"
+            await asyncio.sleep(0.2)
+            yield "content", "나중"
+
+        stream = sse_stream(slow_events(), interval_ms=10, max_bytes=1024)
+
+        first = await asyncio.wait_for(anext(stream), timeout=0.1)
+        rest = await _collect(stream)
+
+        assert _parse([first] + rest) == [("content", "먼저"), ("content", "나중")]
+
+    async def test_flushes_remaining_content_at_end(self):
+        frames = await _collect(
+            sse_stream(_events([("content", "끝")]), interval_ms=1000, max_bytes=1024)
+        )
+
+        assert _parse(frames) == [("content", "끝")]
+
+    async def test_closes_source_when_consumer_stops(self):
+        closed = asyncio.Event()
+
+        async def events():
+            try:
+                yield "conversation_id", "CONV-1"
+                await asyncio.sleep(10)
+                yield "done", ""
+            finally:
+                closed.set()
+
+        stream = sse_stream(events(), interval_ms=10, max_bytes=1024)
+        await anext(stream)
+        await stream.aclose()
+
+        assert closed.is_set()
+
+    async def test_cancels_source_when_client_disconnects(self):
+        connected = True
+        cancelled = asyncio.Event()
+
+        async def is_disconnected():
+            return not connected
+
+        async def events():
+            try:
+                yield "conversation_id", "CONV-1"
+                await asyncio.sleep(10)
+                yield "done", ""
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        disconnect = ClientDisconnect(is_disconnected, poll_interval_ms=10)
+        stream = sse_stream(events(), interval_ms=0, max_bytes=1024, disconnect=disconnect)
+
+        first = await anext(stream)
+        connected = False
+        rest = await asyncio.wait_for(_collect(stream), timeout=1)
+
+        assert _parse([first] + rest) == [("conversation_id", "CONV-1")]
+        assert cancelled.is_set()
+        assert disconnect.latency_ms() is not None
+
+
+class TestTokensSavedEstimate:
+    @pytest.fixture(autouse=True)
+    def _reset(self, monkeypatch):
+        monkeypatch.setattr(disconnect_module, "_recent_output_tokens", deque(maxlen=100))
+
+    def test_none_without_history(self):
+        assert estimate_tokens_saved(10) is None
+
+    def test_subtracts_generated_from_average(self):
+        record_output_tokens(100)
+        record_output_tokens(200)
+
+        assert estimate_tokens_saved(30) == 120
+        assert estimate_tokens_saved(500) == 0
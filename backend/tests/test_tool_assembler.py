@@ -0,0 +1,57 @@
+import json
+
+import pytest
+from openai.types.chat.chat_completion_chunk import ChoiceDeltaToolCall
+
+from app.chat.tools.assembler import ToolCallAssembler
+
+
+def _chunk(index: int, id: str | None = None, name: str | None = None, arguments: str | None = None):
+    function = {}
+    if name is not None:
+        function["name"] = name
+    if arguments is not None:
+        function["arguments"] = arguments
+    return ChoiceDeltaToolCall.model_validate(
+        {"index": index, "id": id, "type": "function" if id else None, "function": function}
+    )
+
+
+class TestToolCallAssembler:
+    def test_accumulates_split_arguments(self):
+        assembler = ToolCallAssembler()
+        assembler.add(_chunk(0, id="call_0", name="list_products", arguments='{"sta'))
+        assembler.add(_chunk(0, arguments='tus": "active"}'))
+
+        [call] = assembler.finish()
+
+        assert call.id == "call_0"
+        assert call.name == "list_products"
+        assert call.arguments == {"status": "active"}
+        assert call.raw_arguments == '{"status": "active"}'
+
+    def test_completes_previous_call_when_next_index_starts(self):
+        assembler = ToolCallAssembler()
+        assert assembler.add(_chunk(0, id="call_0", name="search_guide", arguments='{"query": "배송"}')) == []
+
+        completed = assembler.add(_chunk(1, id="call_1", name="list_products", arguments="{}"))
+
+        assert [c.id for c in completed] == ["call_0"]
+
+    def test_finish_returns_only_remaining_calls(self):
+        assembler = ToolCallAssembler()
+        assembler.add(_chunk(0, id="call_0", name="search_guide", arguments="{}"))
+        assembler.add(_chunk(1, id="call_1", name="list_products", arguments="{}"))
+
+        assert [c.id for c in assembler.finish()] == ["call_1"]
+        assert assembler.finish() == []
+
+    def test_is_falsy_without_tool_calls(self):
+        assert not ToolCallAssembler()
+
+    def test_raises_on_invalid_arguments(self):
+        assembler = ToolCallAssembler()
+        assembler.add(_chunk(0, id="call_0", name="list_products", arguments='{"status"'))
+
+        with pytest.raises(json.JSONDecodeError):
+            assembler.finish()
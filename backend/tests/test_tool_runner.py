@@ -0,0 +1,178 @@
+import asyncio
+import weakref
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.chat.tools import runner as runner_module
+from app.chat.tools.runner import ToolCall, ToolRunner
+
+_EXECUTE_MOCK_PATH = "app.chat.tools.runner.execute_tool"
+
+
+def _call(index: int, name: str, **arguments) -> ToolCall:
+    return ToolCall(
+        index=index, id=f"call_{index}", name=name, arguments=arguments, raw_arguments="{}"
+    )
+
+
+def _runner() -> ToolRunner:
+    return ToolRunner(seller_id=1, session_factory=MagicMock)
+
+
+async def _drain(runner: ToolRunner) -> list[tuple[str, str]]:
+    return [(event_type, call.id) async for event_type, call in runner.events()]
+
+
+@pytest.mark.anyio
+class TestToolRunner:
+    async def test_runs_read_tools_concurrently(self):
+        barrier = asyncio.Barrier(2)
+
+        async def fake_execute(ctx, name, arguments):
+            # 두 tool이 동시에 실행 중이어야 통과
+            await asyncio.wait_for(barrier.wait(), timeout=2)
+            return {"name": name}
+
+        runner = _runner()
+        with patch(_EXECUTE_MOCK_PATH, side_effect=fake_execute):
+            runner.submit(_call(0, "list_products", status="active"))
+            runner.submit(_call(1, "search_guide", query="배송"))
+            await _drain(runner)
+
+        assert [c.result for c in runner.ordered_calls()] == [
+            {"name": "list_products"},
+            {"name": "search_guide"},
+        ]
+
+    async def test_ordered_calls_follow_index_not_completion(self):
+        async def fake_execute(ctx, name, arguments):
+            await asyncio.sleep(arguments["delay"])
+            return {"delay": arguments["delay"]}
+
+        runner = _runner()
+        with patch(_EXECUTE_MOCK_PATH, side_effect=fake_execute):
+            runner.submit(_call(0, "list_products", delay=0.1))
+            runner.submit(_call(1, "search_guide", delay=0))
+            events = await _drain(runner)
+
+        results = [e for e in events if e[0] == "tool_result"]
+        assert results == [("tool_result", "call_1"), ("tool_result", "call_0")]
+        assert [c.id for c in runner.ordered_calls()] == ["call_0", "call_1"]
+
+    async def test_emits_start_and_finish_events(self):
+        runner = _runner()
+        with patch(_EXECUTE_MOCK_PATH, return_value={}):
+            runner.submit(_call(0, "list_products"))
+            events = await _drain(runner)
+
+        assert events == [("tool_call", "call_0"), ("tool_result", "call_0")]
+
+    async def test_mutating_tool_waits_for_earlier_calls(self):
+        order = []
+
+        async def fake_execute(ctx, name, arguments):
+            if name == "list_products":
+                await asyncio.sleep(0.05)
+            order.append(name)
+            return {}
+
+        runner = _runner()
+        with patch(_EXECUTE_MOCK_PATH, side_effect=fake_execute):
+            runner.submit(_call(0, "list_products"))
+            runner.submit(_call(1, "delete_product", id="PRD-1"))
+            runner.submit(_call(2, "search_guide", query="배송"))
+            await _drain(runner)
+
+        assert order == ["list_products", "delete_product", "search_guide"]
+
+    async def test_uses_separate_session_per_call(self):
+        sessions = []
+
+        def factory():
+            session = MagicMock()
+            sessions.append(session)
+            return session
+
+        runner = ToolRunner(seller_id=1, session_factory=factory)
+        with patch(_EXECUTE_MOCK_PATH, return_value={}):
+            runner.submit(_call(0, "list_products"))
+            runner.submit(_call(1, "search_guide", query="배송"))
+            await _drain(runner)
+
+        assert len(sessions) == 2
+        assert all(s.__aexit__.called for s in sessions)
+
+    async def test_limits_concurrent_workers_across_runners(self, monkeypatch):
+        monkeypatch.setattr(runner_module, "_worker_slots", weakref.WeakKeyDictionary())
+        running = 0
+        peak = 0
+
+        async def fake_execute(ctx, name, arguments):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return {}
+
+        with (
+            patch("app.chat.tools.runner.settings.tool_max_workers", 2),
+            patch(_EXECUTE_MOCK_PATH, side_effect=fake_execute),
+        ):
+            runners = [_runner(), _runner()]
+            for runner in runners:
+                for i in range(3):
+                    runner.submit(_call(i, "search_guide", query=str(i)))
+            await asyncio.gather(*(_drain(runner) for runner in runners))
+
+        assert peak == 2
+
+    async def test_propagates_unexpected_errors(self):
+        runner = _runner()
+        with patch(_EXECUTE_MOCK_PATH, side_effect=RuntimeError("boom")):
+            runner.submit(_call(0, "list_products"))
+            with pytest.raises(RuntimeError, match="boom"):
+                await _drain(runner)
+
+    async def test_cancel_lets_started_mutating_tool_finish(self):
+        started = asyncio.Event()
+
+        async def fake_execute(ctx, name, arguments):
+            started.set()
+            await asyncio.sleep(0.05)
+            return {"name": name}
+
+        runner = _runner()
+        with patch(_EXECUTE_MOCK_PATH, side_effect=fake_execute):
+            runner.submit(_call(0, "delete_product", id="PRD-1"))
+            runner.submit(_call(1, "list_products"))
+            await started.wait()
+
+            runner.cancel()
+            delete, listing = runner.ordered_calls()
+            assert (delete.status, listing.status) == ("running", "cancelled")
+
+            await asyncio.sleep(0.1)
+
+        assert delete.status == "done"
+        assert delete.result == {"name": "delete_product"}
+        assert listing.result is None
+
+    async def test_cancel_stops_started_read_tool(self):
+        started = asyncio.Event()
+
+        async def fake_execute(ctx, name, arguments):
+            started.set()
+            await asyncio.sleep(1)
+            return {}
+
+        runner = _runner()
+        with patch(_EXECUTE_MOCK_PATH, side_effect=fake_execute):
+            runner.submit(_call(0, "search_guide", query="배송"))
+            await started.wait()
+            runner.cancel()
+            await asyncio.sleep(0)
+
+        assert runner.calls[0].status == "cancelled"
+        assert runner.calls[0].result is None
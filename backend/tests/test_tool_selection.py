@@ -0,0 +1,191 @@
+import asyncio
+
+import pytest
+
+from app.shared.config import settings
+from app.chat.tools import selection
+from app.chat.tools.definitions import TOOL_DEFINITIONS
+from app.chat.tools.selection import (
+    classify_by_keywords,
+    is_contextual,
+    select_tools,
+    tools_for,
+)
+
+
+def _names(tools: list[dict]) -> list[str]:
+    return [tool["function"]["name"] for tool in tools]
+
+
+def _one_hot(domain: str) -> list[float]:
+    return [1.0, 0.0] if domain == "guide" else [0.0, 1.0]
+
+
+@pytest.fixture()
+def fake_embeddings(monkeypatch):
+    """예시 문장은 도메인별 단위 벡터로, 질문은 테스트가 지정한 벡터로 임베딩한다."""
+    query = {"vector": [1.0, 0.0]}
+
+    async def embed_texts_async(texts):
+        domains = dict(selection._EXAMPLES)
+        return [_one_hot(domains[text]) for text in texts]
+
+    async def embed_text_async(text):
+        return query["vector"]
+
+    monkeypatch.setattr(selection, "_example_embeddings", None)
+    monkeypatch.setattr(selection, "embed_texts_async", embed_texts_async)
+    monkeypatch.setattr(selection, "embed_text_async", embed_text_async)
+    return query
+
+
+class TestClassifyByKeywords:
+    def test_guide(self):
+        assert classify_by_keywords("배송비 설정은 어디서 해요?") == {"guide"}
+
+    def test_product(self):
+        assert classify_by_keywords("품절된 상품 보여줘") == {"product"}
+
+    def test_both(self):
+        assert classify_by_keywords("상품 등록 방법 알려줘") == {"guide", "product"}
+
+    def test_none(self):
+        assert classify_by_keywords("안녕") == set()
+
+    def test_product_name_question_with_guide_keyword(self):
+        assert classify_by_keywords("회원 전용 에코백 있어?") == {"guide", "product"}
+
+
+class TestIsContextual:
+    def test_short_reply(self):
+        assert is_contextual("네 진행해 주세요")
+
+    def test_anaphora(self):
+        assert is_contextual("응, 그렇게 설정해줘")
+
+    def test_standalone_question(self):
+        assert not is_contextual("배송비 무료 기준은 어디서 바꾸나요?")
+
+
+class TestToolsFor:
+    def test_keeps_definition_order(self):
+        assert _names(tools_for({"product"})) == [
+            "create_product", "list_products", "update_product", "delete_product",
+        ]
+
+    def test_guide_only(self):
+        assert _names(tools_for({"guide"})) == ["search_guide"]
+
+
+@pytest.mark.anyio
+class TestSelectTools:
+    async def test_keyword_match_skips_embedding(self, monkeypatch):
+        async def fail(*args, **kwargs):
+            raise AssertionError("임베딩을 호출하면 안 된다")
+
+        monkeypatch.setattr(selection, "embed_text_async", fail)
+
+        result = await select_tools("상품 목록 보여줘")
+
+        assert result.domains == ["product"]
+        assert _names(result.tools) == _names(tools_for({"product"}))
+
+    async def test_falls_back_to_examples(self, fake_embeddings):
+        fake_embeddings["vector"] = [0.1, 0.9]
+
+        result = await select_tools("안 팔리는 거 정리해줘")
+
+        assert result.domains == ["product"]
+
+    async def test_uses_given_embedding(self, fake_embeddings):
+        result = await select_tools("안 팔리는 거 정리해줘", embedding=[0.9, 0.1])
+
+        assert result.domains == ["guide"]
+
+    async def test_sends_all_tools_when_similarity_is_low(self, fake_embeddings):
+        fake_embeddings["vector"] = [-1.0, -1.0]
+
+        result = await select_tools("안녕")
+
+        assert result.domains == []
+        assert result.tools == TOOL_DEFINITIONS
+
+    async def test_sends_all_tools_when_domains_are_close(self, fake_embeddings):
+        fake_embeddings["vector"] = [1.0, 1.0]
+
+        result = await select_tools("안녕")
+
+        assert result.tools == TOOL_DEFINITIONS
+
+    async def test_sends_all_tools_when_embedding_fails(self, monkeypatch):
+        async def broken(*args, **kwargs):
+            raise RuntimeError("embedding API down")
+
+        monkeypatch.setattr(selection, "_example_embeddings", None)
+        monkeypatch.setattr(selection, "embed_texts_async", broken)
+
+        result = await select_tools("안녕")
+
+        assert result.tools == TOOL_DEFINITIONS
+
+    async def test_sends_all_tools_when_embedding_is_slow(self, fake_embeddings, monkeypatch):
+        async def slow(text):
+            await asyncio.sleep(1)
+            return [1.0, 0.0]
+
+        monkeypatch.setattr(settings, "tool_selection_timeout_ms", 10)
+        monkeypatch.setattr(selection, "embed_text_async", slow)
+
+        result = await select_tools("안 팔리는 거 정리해줘")
+
+        assert result.tools == TOOL_DEFINITIONS
+
+    async def test_product_name_question_keeps_list_products(self):
+        result = await select_tools("회원 전용 에코백 있어?")
+
+        assert "list_products" in _names(result.tools)
+
+
+@pytest.mark.anyio
+class TestSelectToolsFollowUp:
+    @pytest.fixture(autouse=True)
+    def no_embedding(self, monkeypatch):
+        async def fail(*args, **kwargs):
+            raise AssertionError("이어지는 턴에서는 임베딩을 호출하면 안 된다")
+
+        monkeypatch.setattr(selection, "embed_text_async", fail)
+        monkeypatch.setattr(selection, "embed_texts_async", fail)
+
+    async def test_anaphoric_reply_after_product_question_sends_all_tools(self):
+        result = await select_tools(
+            "응, 그렇게 설정해줘", follow_up=True, previous_domains=["product"]
+        )
+
+        assert result.tools == TOOL_DEFINITIONS
+
+    async def test_delete_confirmation_keeps_delete_product(self):
+        for reply in ("네", "네, 에코백 삭제 진행해 주세요"):
+            result = await select_tools(reply, follow_up=True, previous_domains=["product"])
+
+            assert "delete_product" in _names(result.tools)
+
+    async def test_unions_previous_domains(self):
+        result = await select_tools(
+            "그리고 배송비 설정은 어디서 하나요?", follow_up=True, previous_domains=["product"]
+        )
+
+        assert result.tools == TOOL_DEFINITIONS
+
+    async def test_keeps_single_domain_when_previous_matches(self):
+        result = await select_tools(
+            "후드티 상품 가격도 알려줄래요?", follow_up=True, previous_domains=["product"]
+        )
+
+        assert result.domains == ["product"]
+
+    async def test_sends_all_tools_without_keyword(self):
+        result = await select_tools(
+            "이번 달에 새로 들어온 주문 정리해줄래요?", follow_up=True, previous_domains=["guide"]
+        )
+
+        assert result.tools == TOOL_DEFINITIONS
@@ -1,18 +1,33 @@
+import pytest
+
+from app.shared.config import settings
 from app.shared.display_id import to_display_id
-from app.product.service import create_product
-from app.chat.tools.executor import ToolContext, execute_tool
-from app.seller.service import create_seller
+from app.product.service import create_product_async
+from app.chat.tools.executor import ToolContext, ToolResultCache, execute_tool
+from app.seller.model import Seller
+
+
+async def _create_seller(async_db, nickname: str = "도구-판매자-1") -> Seller:
+    seller = Seller(nickname=nickname)
+    async_db.add(seller)
+    await async_db.flush()
+    return seller
+
+
+def _ctx(async_db, seller, cache: ToolResultCache | None = None) -> ToolContext:
+    return ToolContext(db=async_db, seller_id=seller.id, cache=cache)
 
 
-def _ctx(db, seller):
-    return ToolContext(db=db, seller_id=seller.id)
+def _products(result: dict) -> list[dict]:
+    return [dict(zip(result["columns"], row)) for row in result["rows"]]
 
 
+@pytest.mark.anyio
 class TestExecuteTool:
-    def test_create_product(self, db):
-        seller = create_seller(db)
-        result = execute_tool(
-            _ctx(db, seller), "create_product", {"name": "테스트 상품", "price": 10000}
+    async def test_create_product(self, async_db):
+        seller = await _create_seller(async_db)
+        result = await execute_tool(
+            _ctx(async_db, seller), "create_product", {"name": "테스트 상품", "price": 10000}
         )
 
         assert result["id"].startswith("PRD-")
@@ -20,87 +35,181 @@ class TestExecuteTool:
         assert result["price"] == 10000
         assert result["status"] == "active"
 
-    def test_list_products_empty(self, db):
-        seller = create_seller(db)
-        result = execute_tool(_ctx(db, seller), "list_products", {})
+    async def test_list_products_empty(self, async_db):
+        seller = await _create_seller(async_db)
+        result = await execute_tool(_ctx(async_db, seller), "list_products", {})
 
-        assert result["products"] == []
+        assert result["rows"] == []
         assert result["total"] == 0
+        assert "next_cursor" not in result
 
-    def test_list_products_with_data(self, db):
-        seller = create_seller(db)
-        create_product(db, name="상품A", price=1000, seller_id=seller.id)
-        create_product(db, name="상품B", price=2000, seller_id=seller.id)
+    async def test_list_products_with_data(self, async_db):
+        seller = await _create_seller(async_db)
+        await create_product_async(async_db, name="상품A", price=1000, seller_id=seller.id)
+        await create_product_async(async_db, name="상품B", price=2000, seller_id=seller.id)
 
-        result = execute_tool(_ctx(db, seller), "list_products", {})
+        result = await execute_tool(_ctx(async_db, seller), "list_products", {})
 
         assert result["total"] == 2
 
-    def test_list_products_isolates_by_seller(self, db):
-        seller_a = create_seller(db)
-        seller_b = create_seller(db)
-        create_product(db, name="A의 상품", price=1000, seller_id=seller_a.id)
-        create_product(db, name="B의 상품", price=2000, seller_id=seller_b.id)
+    async def test_list_products_isolates_by_seller(self, async_db):
+        seller_a = await _create_seller(async_db, "도구-판매자-A")
+        seller_b = await _create_seller(async_db, "도구-판매자-B")
+        await create_product_async(async_db, name="A의 상품", price=1000, seller_id=seller_a.id)
+        await create_product_async(async_db, name="B의 상품", price=2000, seller_id=seller_b.id)
 
-        result = execute_tool(_ctx(db, seller_a), "list_products", {})
+        result = await execute_tool(_ctx(async_db, seller_a), "list_products", {})
 
         assert result["total"] == 1
-        assert result["products"][0]["name"] == "A의 상품"
+        assert _products(result)[0]["name"] == "A의 상품"
 
-    def test_list_products_with_status_filter(self, db):
-        seller = create_seller(db)
-        ctx = _ctx(db, seller)
-        execute_tool(ctx, "create_product", {"name": "상품A", "price": 1000})
-        execute_tool(ctx, "create_product", {"name": "상품B", "price": 2000})
+    async def test_list_products_with_status_filter(self, async_db):
+        seller = await _create_seller(async_db)
+        ctx = _ctx(async_db, seller)
+        await execute_tool(ctx, "create_product", {"name": "상품A", "price": 1000})
+        await execute_tool(ctx, "create_product", {"name": "상품B", "price": 2000})
 
-        result = execute_tool(ctx, "list_products", {"status": "active"})
+        result = await execute_tool(ctx, "list_products", {"status": "active"})
 
         assert result["total"] == 2
 
-    def test_update_product(self, db):
-        seller = create_seller(db)
-        product = create_product(db, name="원래 상품", price=10000, seller_id=seller.id)
+    async def test_list_products_uses_compact_columns(self, async_db):
+        seller = await _create_seller(async_db)
+        product = await create_product_async(
+            async_db, name="상품A", price=1000, seller_id=seller.id
+        )
+
+        result = await execute_tool(_ctx(async_db, seller), "list_products", {})
+
+        assert result["columns"] == ["id", "name", "price", "status"]
+        assert result["rows"] == [[to_display_id("products", product.id), "상품A", 1000, "active"]]
+
+    async def test_list_products_pages_with_cursor(self, async_db, monkeypatch):
+        monkeypatch.setattr(settings, "tool_result_page_size", 2)
+        seller = await _create_seller(async_db)
+        for i in range(5):
+            await create_product_async(async_db, name=f"상품{i}", price=1000, seller_id=seller.id)
+        ctx = _ctx(async_db, seller)
+
+        first = await execute_tool(ctx, "list_products", {})
+        second = await execute_tool(ctx, "list_products", {"cursor": first["next_cursor"]})
+        last = await execute_tool(ctx, "list_products", {"cursor": second["next_cursor"]})
+
+        assert [p["name"] for p in _products(first)] == ["상품4", "상품3"]
+        assert (first["total"], first["more"]) == (5, 3)
+        assert [p["name"] for p in _products(second)] == ["상품2", "상품1"]
+        assert (second["total"], second["more"]) == (5, 1)
+        assert [p["name"] for p in _products(last)] == ["상품0"]
+        assert last["total"] == 5
+        assert "more" not in last and "next_cursor" not in last
+
+    async def test_list_products_invalid_cursor(self, async_db):
+        seller = await _create_seller(async_db)
+
+        result = await execute_tool(_ctx(async_db, seller), "list_products", {"cursor": "CON-1"})
+
+        assert "error" in result
+
+    async def test_update_product(self, async_db):
+        seller = await _create_seller(async_db)
+        product = await create_product_async(
+            async_db, name="원래 상품", price=10000, seller_id=seller.id
+        )
         display_id = to_display_id("products", product.id)
 
-        result = execute_tool(
-            _ctx(db, seller), "update_product", {"id": display_id, "name": "변경된 상품", "price": 20000}
+        result = await execute_tool(
+            _ctx(async_db, seller),
+            "update_product",
+            {"id": display_id, "name": "변경된 상품", "price": 20000},
         )
 
         assert result["id"] == display_id
         assert result["name"] == "변경된 상품"
         assert result["price"] == 20000
 
-    def test_update_product_not_found(self, db):
-        seller = create_seller(db)
-        result = execute_tool(
-            _ctx(db, seller), "update_product", {"id": "PRD-9999", "name": "변경"}
+    async def test_update_product_not_found(self, async_db):
+        seller = await _create_seller(async_db)
+        result = await execute_tool(
+            _ctx(async_db, seller), "update_product", {"id": "PRD-9999", "name": "변경"}
         )
 
         assert "error" in result
 
-    def test_delete_product(self, db):
-        seller = create_seller(db)
-        product = create_product(db, name="삭제할 상품", price=10000, seller_id=seller.id)
+    async def test_delete_product(self, async_db):
+        seller = await _create_seller(async_db)
+        product = await create_product_async(
+            async_db, name="삭제할 상품", price=10000, seller_id=seller.id
+        )
         display_id = to_display_id("products", product.id)
 
-        result = execute_tool(_ctx(db, seller), "delete_product", {"id": display_id})
+        result = await execute_tool(_ctx(async_db, seller), "delete_product", {"id": display_id})
 
         assert result["id"] == display_id
         assert result["name"] == "삭제할 상품"
 
-        list_result = execute_tool(_ctx(db, seller), "list_products", {})
+        list_result = await execute_tool(_ctx(async_db, seller), "list_products", {})
         assert list_result["total"] == 0
 
-    def test_delete_product_not_found(self, db):
-        seller = create_seller(db)
-        result = execute_tool(
-            _ctx(db, seller), "delete_product", {"id": "PRD-9999"}
+    async def test_delete_product_not_found(self, async_db):
+        seller = await _create_seller(async_db)
+        result = await execute_tool(
+            _ctx(async_db, seller), "delete_product", {"id": "PRD-9999"}
         )
 
         assert "error" in result
 
-    def test_unknown_tool(self, db):
-        seller = create_seller(db)
-        result = execute_tool(_ctx(db, seller), "unknown_tool", {})
+    async def test_unknown_tool(self, async_db):
+        seller = await _create_seller(async_db)
+        result = await execute_tool(_ctx(async_db, seller), "unknown_tool", {})
 
         assert "error" in result
+
+
+@pytest.mark.anyio
+class TestToolResultCache:
+    async def test_reuses_result_for_same_arguments(self, async_db):
+        seller = await _create_seller(async_db)
+        ctx = _ctx(async_db, seller, ToolResultCache())
+        first = await execute_tool(ctx, "list_products", {"status": "active"})
+
+        # 캐시가 없으면 새 상품이 보여야 하지만, 같은 턴 안의 같은 호출은 이전 결과를 쓴다
+        await create_product_async(async_db, name="상품A", price=1000, seller_id=seller.id)
+        result = await execute_tool(ctx, "list_products", {"status": "active", "name": None})
+
+        assert result is first
+
+    async def test_different_arguments_are_not_shared(self, async_db):
+        seller = await _create_seller(async_db)
+        ctx = _ctx(async_db, seller, ToolResultCache())
+        await execute_tool(ctx, "list_products", {"status": "active"})
+        await create_product_async(async_db, name="상품A", price=1000, seller_id=seller.id)
+
+        result = await execute_tool(ctx, "list_products", {})
+
+        assert result["total"] == 1
+
+    async def test_mutating_tool_invalidates_results(self, async_db):
+        seller = await _create_seller(async_db)
+        ctx = _ctx(async_db, seller, ToolResultCache())
+        await execute_tool(ctx, "list_products", {})
+
+        await execute_tool(ctx, "create_product", {"name": "새 상품", "price": 1000})
+        result = await execute_tool(ctx, "list_products", {})
+
+        assert result["total"] == 1
+
+    async def test_does_not_cache_errors(self, async_db):
+        seller = await _create_seller(async_db)
+        cache = ToolResultCache()
+        ctx = _ctx(async_db, seller, cache)
+
+        await execute_tool(ctx, "update_product", {"id": "PRD-9999", "price": 1000})
+        await execute_tool(ctx, "unknown_tool", {})
+
+        assert len(cache) == 0
+
+    def test_key_ignores_argument_order(self):
+        cache = ToolResultCache()
+        cache.record("search_guide", {"query": "배송", "top_k": 3}, {"total": 0})
+
+        assert cache.get("search_guide", {"top_k": 3, "query": "배송"}) == {"total": 0}
@@ -1,9 +1,9 @@
 import ApiError from '@/shared/api/api-error';
 import client from '@/shared/api/client';
 
-export const fetchConversations = async (sellerId?: string) => {
+export const fetchConversations = async (sellerId?: string, cursor?: string) => {
   const { data, error, response } = await client.GET('/api/conversations', {
-    params: { query: sellerId ? { seller_id: sellerId } : {} },
+    params: { query: { seller_id: sellerId, cursor } },
   });
 
   if (error) {
@@ -13,8 +13,10 @@ export const fetchConversations = async (sellerId?: string) => {
   return data;
 };
 
-export const fetchMyConversations = async () => {
-  const { data, error, response } = await client.GET('/api/my/conversations');
+export const fetchMyConversations = async (cursor?: string) => {
+  const { data, error, response } = await client.GET('/api/my/conversations', {
+    params: { query: { cursor } },
+  });
 
   if (error) {
     throw new ApiError(response.status, error, '대화 목록을 불러오는데 실패했습니다.');
@@ -1,19 +1,27 @@
-import { queryOptions } from '@tanstack/react-query';
+import { infiniteQueryOptions } from '@tanstack/react-query';
 
+import type { ConversationPage } from '../model/types';
 import { fetchConversations, fetchMyConversations } from './conversation.api';
 
+const pageOptions = {
+  initialPageParam: undefined as string | undefined,
+  getNextPageParam: (lastPage: ConversationPage) => lastPage.next_cursor ?? undefined,
+};
+
 export const conversationQueries = {
   all: () => ['conversations'] as const,
   lists: () => [...conversationQueries.all(), 'list'] as const,
   list: (sellerId?: string) =>
-    queryOptions({
+    infiniteQueryOptions({
       queryKey: [...conversationQueries.lists(), { sellerId }],
-      queryFn: () => fetchConversations(sellerId),
+      queryFn: ({ pageParam }) => fetchConversations(sellerId, pageParam),
+      ...pageOptions,
     }),
   myLists: () => [...conversationQueries.lists(), 'my'] as const,
   myList: () =>
-    queryOptions({
+    infiniteQueryOptions({
       queryKey: [...conversationQueries.myLists()],
-      queryFn: fetchMyConversations,
+      queryFn: ({ pageParam }) => fetchMyConversations(pageParam),
+      ...pageOptions,
     }),
 };
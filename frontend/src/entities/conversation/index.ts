@@ -1,4 +1,4 @@
-export type { ConversationSummary } from './model/types';
+export type { ConversationPage, ConversationSummary } from './model/types';
 export { conversationQueries } from './api/conversation.queries';
 export { default as ConversationItem } from './ui/ConversationItem';
 export { default as ConversationTable } from './ui/ConversationTable';
@@ -1,3 +1,4 @@
 import type { components } from '@/shared/api/schema';
 
 export type ConversationSummary = components['schemas']['ConversationSummary'];
+export type ConversationPage = components['schemas']['ConversationPage'];
@@ -1,11 +1,16 @@
 import ApiError from '@/shared/api/api-error';
 import client from '@/shared/api/client';
 
-export const fetchMessages = async (conversationId: string) => {
+import type { MessageSummary } from '../model/types';
+
+// 서버의 메시지 목록 한 페이지 최대 크기
+const MAX_PAGE_SIZE = 200;
+
+export const fetchMessages = async (conversationId: string, cursor?: string) => {
   const { data, error, response } = await client.GET(
     '/api/conversations/{conversation_id}/messages',
     {
-      params: { path: { conversation_id: conversationId } },
+      params: { path: { conversation_id: conversationId }, query: { cursor } },
     },
   );
 
@@ -16,11 +21,14 @@ export const fetchMessages = async (conversationId: string) => {
   return data;
 };
 
-export const fetchMyMessages = async (conversationId: string) => {
+export const fetchMyMessages = async (conversationId: string, cursor?: string) => {
   const { data, error, response } = await client.GET(
     '/api/my/conversations/{conversation_id}/messages',
     {
-      params: { path: { conversation_id: conversationId } },
+      params: {
+        path: { conversation_id: conversationId },
+        query: { cursor, limit: MAX_PAGE_SIZE },
+      },
     },
   );
 
@@ -30,3 +38,43 @@ export const fetchMyMessages = async (conversationId: string) => {
 
   return data;
 };
+
+// 채팅 화면은 대화를 이어가기 위해 메시지 전체가 필요하다
+export const fetchAllMyMessages = async (conversationId: string) => {
+  const messages: MessageSummary[] = [];
+  let cursor: string | undefined;
+  do {
+    const page = await fetchMyMessages(conversationId, cursor);
+    messages.push(...page.items);
+    cursor = page.next_cursor ?? undefined;
+  } while (cursor);
+
+  return messages;
+};
+
+export const fetchMessageDetail = async (conversationId: string, messageId: string) => {
+  const { data, error, response } = await client.GET(
+    '/api/conversations/{conversation_id}/messages/{message_id}',
+    {
+      params: { path: { conversation_id: conversationId, message_id: messageId } },
+    },
+  );
+
+  if (error) {
+    throw new ApiError(response.status, error, '메시지 상세를 불러오는데 실패했습니다.');
+  }
+
+  return data;
+};
+
+export const fetchPromptVersion = async (promptId: string) => {
+  const { data, error, response } = await client.GET('/api/prompt-versions/{prompt_id}', {
+    params: { path: { prompt_id: promptId } },
+  });
+
+  if (error) {
+    throw new ApiError(response.status, error, '시스템 프롬프트를 불러오는데 실패했습니다.');
+  }
+
+  return data;
+};
@@ -1,19 +1,41 @@
-import { queryOptions } from '@tanstack/react-query';
+import { infiniteQueryOptions, queryOptions } from '@tanstack/react-query';
 
-import { fetchMessages, fetchMyMessages } from './message.api';
+import type { MessagePage } from '../model/types';
+import {
+  fetchAllMyMessages,
+  fetchMessageDetail,
+  fetchMessages,
+  fetchPromptVersion,
+} from './message.api';
 
 export const messageQueries = {
   all: () => ['messages'] as const,
   lists: () => [...messageQueries.all(), 'list'] as const,
   list: (conversationId: string) =>
-    queryOptions({
+    infiniteQueryOptions({
       queryKey: [...messageQueries.lists(), conversationId],
-      queryFn: () => fetchMessages(conversationId),
+      queryFn: ({ pageParam }) => fetchMessages(conversationId, pageParam),
+      initialPageParam: undefined as string | undefined,
+      getNextPageParam: (lastPage: MessagePage) => lastPage.next_cursor ?? undefined,
     }),
   myLists: () => [...messageQueries.lists(), 'my'] as const,
   myList: (conversationId: string) =>
     queryOptions({
       queryKey: [...messageQueries.myLists(), conversationId],
-      queryFn: () => fetchMyMessages(conversationId),
+      queryFn: () => fetchAllMyMessages(conversationId),
+    }),
+  detail: (conversationId: string, messageId: string) =>
+    queryOptions({
+      queryKey: [...messageQueries.all(), 'detail', conversationId, messageId],
+      queryFn: () => fetchMessageDetail(conversationId, messageId),
+      // 저장된 메시지는 바뀌지 않는다
+      staleTime: Infinity,
+    }),
+  promptVersion: (promptId: string) =>
+    queryOptions({
+      queryKey: [...messageQueries.all(), 'prompt-version', promptId],
+      queryFn: () => fetchPromptVersion(promptId),
+      // 프롬프트 버전은 해시로 식별되어 내용이 바뀌지 않는다
+      staleTime: Infinity,
     }),
 };
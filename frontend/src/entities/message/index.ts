@@ -4,6 +4,8 @@ export type {
   MessageStatus,
   MessageMetadata,
   MessageDetail,
+  MessagePage,
+  MessageSummary,
 } from './model/types';
 export { messageQueries } from './api/message.queries';
 export { convertToMessages } from './lib/convertToMessages';
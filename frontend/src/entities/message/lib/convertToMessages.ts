@@ -1,20 +1,20 @@
-import type { Message, MessageDetail, MessageRole, MessageStatus } from '../model/types';
+import type { Message, MessageRole, MessageStatus, MessageSummary } from '../model/types';
 
 const CHAT_ROLES: MessageRole[] = ['user', 'assistant'];
 
-const getStatus = (detail: MessageDetail): MessageStatus => {
+const getStatus = (detail: MessageSummary): MessageStatus => {
   if (detail.metadata?.aborted) {
     return 'aborted';
   }
   return 'completed';
 };
 
-const convertToMessage = (detail: MessageDetail): Message => ({
+const convertToMessage = (detail: MessageSummary): Message => ({
   id: detail.id,
   role: detail.role as MessageRole,
   content: detail.content,
   status: getStatus(detail),
 });
 
-export const convertToMessages = (details: MessageDetail[]): Message[] =>
+export const convertToMessages = (details: MessageSummary[]): Message[] =>
   details.filter((d) => CHAT_ROLES.includes(d.role as MessageRole)).map(convertToMessage);
@@ -14,3 +14,7 @@ export interface Message {
 export type MessageMetadata = components['schemas']['MessageMetadata'];
 
 export type MessageDetail = components['schemas']['MessageDetail'];
+
+export type MessageSummary = components['schemas']['MessageSummary'];
+
+export type MessagePage = components['schemas']['MessagePage'];
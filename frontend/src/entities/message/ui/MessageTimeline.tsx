@@ -1,95 +1,129 @@
-import { Bot, ChevronDown, ChevronRight, Clock, Coins, Cpu, User, Wrench } from 'lucide-react';
+import { Virtuoso } from 'react-virtuoso';
 
-import type { MessageDetail } from '@/entities/message';
+import { Bot, Clock, Coins, Cpu, DatabaseZap, Timer, User } from 'lucide-react';
+
+import type { MessageSummary } from '@/entities/message';
 import { formatDate } from '@/shared/lib/format';
 import { Badge } from '@/shared/ui/Badge';
 import MarkdownContent from '@/shared/ui/MarkdownContent';
 
-import { isSearchGuideToolCall } from '../model/tool-calls';
-
-import GuideSearchResult from './GuideSearchResult';
 import MessageTimelineSkeleton from './MessageTimelineSkeleton';
 import SystemPromptCard from './SystemPromptCard';
-import ToolCallDefaultResult from './ToolCallDefaultResult';
+import ToolCallList from './ToolCallList';
 
 interface MessageTimelineProps {
-  messages: MessageDetail[];
+  conversationId: string;
+  messages: MessageSummary[];
+  // 목록을 스크롤하는 바깥 요소. 화면에 보이는 메시지만 렌더링한다
+  scrollParent: HTMLElement;
+  hasNextPage: boolean;
+  isFetchingNextPage: boolean;
+  onEndReached: () => void;
 }
 
-const MessageTimeline = ({ messages }: MessageTimelineProps) => {
-  const systemPrompt = messages.find((m) => m.role === 'assistant' && m.metadata?.system_prompt)
-    ?.metadata?.system_prompt;
+const MessageTimeline = ({
+  conversationId,
+  messages,
+  scrollParent,
+  hasNextPage,
+  isFetchingNextPage,
+  onEndReached,
+}: MessageTimelineProps) => {
+  const systemPromptId = messages.find(
+    (m) => m.role === 'assistant' && m.metadata?.system_prompt_id,
+  )?.metadata?.system_prompt_id;
 
   return (
-    <div className='space-y-4'>
-      {systemPrompt && <SystemPromptCard prompt={systemPrompt} />}
-
-      {messages.map((message) => (
-        <div key={message.id} className='rounded-md border p-4'>
-          <div className='mb-2 flex items-center gap-2'>
-            {message.role === 'user' ? (
-              <User className='h-4 w-4 text-blue-500' />
-            ) : (
-              <Bot className='h-4 w-4 text-green-500' />
-            )}
-            <span className='text-sm font-medium uppercase'>{message.role}</span>
-            <span className='text-xs text-muted-foreground'>{formatDate(message.created_at)}</span>
-          </div>
+    <div>
+      {systemPromptId && (
+        <div className='pb-4'>
+          <SystemPromptCard promptId={systemPromptId} />
+        </div>
+      )}
 
-          {message.role === 'user' ? (
-            <p className='text-sm whitespace-pre-wrap'>{message.content}</p>
-          ) : (
-            <MarkdownContent content={message.content} />
-          )}
+      <Virtuoso
+        customScrollParent={scrollParent}
+        data={messages}
+        endReached={() => hasNextPage && !isFetchingNextPage && onEndReached()}
+        computeItemKey={(_, message) => message.id}
+        itemContent={(_, message) => (
+          <div className='pb-4'>
+            <div className='rounded-md border p-4'>
+              <div className='mb-2 flex items-center gap-2'>
+                {message.role === 'user' ? (
+                  <User className='h-4 w-4 text-blue-500' />
+                ) : (
+                  <Bot className='h-4 w-4 text-green-500' />
+                )}
+                <span className='text-sm font-medium uppercase'>{message.role}</span>
+                <span className='text-xs text-muted-foreground'>
+                  {formatDate(message.created_at)}
+                </span>
+              </div>
 
-          {message.role === 'assistant' && message.metadata && (
-            <div className='mt-3 flex flex-wrap gap-2 border-t pt-3'>
-              <Badge variant='outline'>
-                <Cpu data-icon='inline-start' />
-                {message.metadata.model}
-              </Badge>
-              {message.metadata.input_tokens != null && message.metadata.output_tokens != null && (
-                <Badge variant='secondary'>
-                  <Coins data-icon='inline-start' />
-                  IN {message.metadata.input_tokens.toLocaleString()} · OUT{' '}
-                  {message.metadata.output_tokens.toLocaleString()}
-                </Badge>
-              )}
-              {message.metadata.response_time_ms != null && (
-                <Badge variant='secondary'>
-                  <Clock data-icon='inline-start' />
-                  {message.metadata.response_time_ms.toLocaleString()}ms
-                </Badge>
-              )}
-              {message.metadata.error && (
-                <Badge variant='destructive'>에러: {message.metadata.error}</Badge>
+              {message.role === 'user' ? (
+                <p className='text-sm whitespace-pre-wrap'>{message.content}</p>
+              ) : (
+                <MarkdownContent content={message.content} />
               )}
-            </div>
-          )}
 
-          {message.metadata?.tool_calls && message.metadata.tool_calls.length > 0 && (
-            <div className='mt-2 space-y-1'>
-              {message.metadata.tool_calls.map((toolCall, index) => (
-                <details key={index} className='group rounded border bg-muted/30 text-xs'>
-                  <summary className='flex cursor-pointer items-center gap-1.5 px-2 py-1.5'>
-                    <ChevronRight className='h-3 w-3 text-muted-foreground group-open:hidden' />
-                    <ChevronDown className='hidden h-3 w-3 text-muted-foreground group-open:block' />
-                    <Wrench className='h-3 w-3 text-muted-foreground' />
-                    <span className='font-medium'>{toolCall.name}</span>
-                  </summary>
-                  <div className='border-t px-2 py-1.5'>
-                    {isSearchGuideToolCall(toolCall) ? (
-                      <GuideSearchResult toolCall={toolCall} />
-                    ) : (
-                      <ToolCallDefaultResult toolCall={toolCall} />
+              {message.role === 'assistant' && message.metadata && (
+                <div className='mt-3 flex flex-wrap gap-2 border-t pt-3'>
+                  <Badge variant='outline'>
+                    <Cpu data-icon='inline-start' />
+                    {message.metadata.model}
+                  </Badge>
+                  {message.metadata.input_tokens != null &&
+                    message.metadata.output_tokens != null && (
+                      <Badge variant='secondary'>
+                        <Coins data-icon='inline-start' />
+                        IN {message.metadata.input_tokens.toLocaleString()} · OUT{' '}
+                        {message.metadata.output_tokens.toLocaleString()}
+                      </Badge>
                     )}
-                  </div>
-                </details>
-              ))}
+                  {message.metadata.response_time_ms != null && (
+                    <Badge variant='secondary'>
+                      <Clock data-icon='inline-start' />
+                      {message.metadata.response_time_ms.toLocaleString()}ms
+                    </Badge>
+                  )}
+                  {message.metadata.stage_timings_ms &&
+                    Object.entries(message.metadata.stage_timings_ms).map(([stage, durations]) => (
+                      <Badge key={stage} variant='outline'>
+                        <Timer data-icon='inline-start' />
+                        {stage} {durations.reduce((sum, ms) => sum + ms, 0).toLocaleString()}ms
+                        {durations.length > 1 && ` (${durations.length}회)`}
+                      </Badge>
+                    ))}
+                  {message.metadata.answer_cache_id != null && (
+                    <Badge variant='outline'>
+                      <DatabaseZap data-icon='inline-start' />
+                      캐시된 답변
+                    </Badge>
+                  )}
+                  {message.metadata.error && (
+                    <Badge variant='destructive'>에러: {message.metadata.error}</Badge>
+                  )}
+                </div>
+              )}
+
+              {message.metadata?.tool_names && message.metadata.tool_names.length > 0 && (
+                <ToolCallList
+                  conversationId={conversationId}
+                  messageId={message.id}
+                  toolNames={message.metadata.tool_names}
+                />
+              )}
             </div>
-          )}
-        </div>
-      ))}
+          </div>
+        )}
+        components={{
+          Footer: () =>
+            isFetchingNextPage ? (
+              <p className='pb-4 text-center text-sm text-muted-foreground'>불러오는 중...</p>
+            ) : null,
+        }}
+      />
     </div>
   );
 };
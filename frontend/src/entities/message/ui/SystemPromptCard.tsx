@@ -1,14 +1,27 @@
+import { useState } from 'react';
+
+import { useQuery } from '@tanstack/react-query';
 import { ChevronDown, ChevronRight } from 'lucide-react';
 
 import { Collapsible, CollapsibleContent, CollapsibleTrigger } from '@/shared/ui/Collapsible';
+import { Skeleton } from '@/shared/ui/Skeleton';
+
+import { messageQueries } from '../api/message.queries';
 
 interface SystemPromptCardProps {
-  prompt: string;
+  promptId: string;
 }
 
-const SystemPromptCard = ({ prompt }: SystemPromptCardProps) => {
+const SystemPromptCard = ({ promptId }: SystemPromptCardProps) => {
+  const [open, setOpen] = useState(false);
+  // 펼쳤을 때만 프롬프트 원문을 불러온다
+  const { data, isPending, isError } = useQuery({
+    ...messageQueries.promptVersion(promptId),
+    enabled: open,
+  });
+
   return (
-    <Collapsible>
+    <Collapsible open={open} onOpenChange={setOpen}>
       <div className='rounded-md border bg-muted/30 p-4'>
         <CollapsibleTrigger className='flex w-full items-center gap-2 text-left text-sm font-medium [&[data-state=closed]>svg:last-child]:hidden [&[data-state=open]>svg:first-child]:hidden'>
           <ChevronRight className='h-4 w-4' />
@@ -16,7 +29,13 @@ const SystemPromptCard = ({ prompt }: SystemPromptCardProps) => {
           시스템 프롬프트
         </CollapsibleTrigger>
         <CollapsibleContent>
-          <p className='mt-3 text-sm whitespace-pre-wrap text-muted-foreground'>{prompt}</p>
+          {isError ? (
+            <p className='mt-3 text-sm text-destructive'>시스템 프롬프트를 불러오지 못했습니다.</p>
+          ) : isPending ? (
+            <Skeleton className='mt-3 h-20 w-full' />
+          ) : (
+            <p className='mt-3 text-sm whitespace-pre-wrap text-muted-foreground'>{data.content}</p>
+          )}
         </CollapsibleContent>
       </div>
     </Collapsible>
@@ -0,0 +1,64 @@
+import { useState } from 'react';
+
+import { useQuery } from '@tanstack/react-query';
+import { ChevronDown, ChevronRight, Wrench } from 'lucide-react';
+
+import { Skeleton } from '@/shared/ui/Skeleton';
+
+import { messageQueries } from '../api/message.queries';
+import { isSearchGuideToolCall } from '../model/tool-calls';
+
+import GuideSearchResult from './GuideSearchResult';
+import ToolCallDefaultResult from './ToolCallDefaultResult';
+
+interface ToolCallListProps {
+  conversationId: string;
+  messageId: string;
+  toolNames: string[];
+}
+
+const ToolCallList = ({ conversationId, messageId, toolNames }: ToolCallListProps) => {
+  const [opened, setOpened] = useState(false);
+  // 목록에는 tool 이름만 온다. 하나라도 펼치면 메시지 상세에서 인자와 결과를 불러온다
+  const { data, isError } = useQuery({
+    ...messageQueries.detail(conversationId, messageId),
+    enabled: opened,
+  });
+  const toolCalls = data?.metadata?.tool_calls;
+
+  return (
+    <div className='mt-2 space-y-1'>
+      {toolNames.map((name, index) => {
+        const toolCall = toolCalls?.[index];
+
+        return (
+          <details
+            key={index}
+            className='group rounded border bg-muted/30 text-xs'
+            onToggle={(e) => e.currentTarget.open && setOpened(true)}
+          >
+            <summary className='flex cursor-pointer items-center gap-1.5 px-2 py-1.5'>
+              <ChevronRight className='h-3 w-3 text-muted-foreground group-open:hidden' />
+              <ChevronDown className='hidden h-3 w-3 text-muted-foreground group-open:block' />
+              <Wrench className='h-3 w-3 text-muted-foreground' />
+              <span className='font-medium'>{name}</span>
+            </summary>
+            <div className='border-t px-2 py-1.5'>
+              {isError ? (
+                <p className='text-destructive'>tool 호출 결과를 불러오지 못했습니다.</p>
+              ) : !toolCall ? (
+                <Skeleton className='h-12 w-full' />
+              ) : isSearchGuideToolCall(toolCall) ? (
+                <GuideSearchResult toolCall={toolCall} />
+              ) : (
+                <ToolCallDefaultResult toolCall={toolCall} />
+              )}
+            </div>
+          </details>
+        );
+      })}
+    </div>
+  );
+};
+
+export default ToolCallList;
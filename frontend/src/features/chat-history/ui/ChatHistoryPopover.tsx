@@ -1,7 +1,7 @@
 import { useState } from 'react';
 
 import { ErrorBoundary, Suspense } from '@suspensive/react';
-import { SuspenseQuery } from '@suspensive/react-query-5';
+import { SuspenseInfiniteQuery } from '@suspensive/react-query-5';
 import { useQueryClient } from '@tanstack/react-query';
 import { History } from 'lucide-react';
 
@@ -10,6 +10,7 @@ import type { Message } from '@/entities/message';
 import { convertToMessages, messageQueries } from '@/entities/message';
 import { GA_EVENTS, trackEvent } from '@/shared/lib/analytics';
 import { Button } from '@/shared/ui/Button';
+import LoadMoreButton from '@/shared/ui/LoadMoreButton';
 import {
   Popover,
   PopoverContent,
@@ -66,15 +67,23 @@ const ChatHistoryPopover = ({
             )}
           >
             <Suspense fallback={<ConversationList.Skeleton />}>
-              <SuspenseQuery {...conversationQueries.myList()}>
-                {({ data: conversations }) => (
-                  <ConversationList
-                    conversations={conversations}
-                    currentConversationId={currentConversationId}
-                    onSelectConversation={handleSelectConversation}
-                  />
+              <SuspenseInfiniteQuery {...conversationQueries.myList()}>
+                {({ data, hasNextPage, isFetchingNextPage, fetchNextPage }) => (
+                  <>
+                    <ConversationList
+                      conversations={data.pages.flatMap((page) => page.items)}
+                      currentConversationId={currentConversationId}
+                      onSelectConversation={handleSelectConversation}
+                    />
+                    <LoadMoreButton
+                      className='mt-1 w-full'
+                      hasNextPage={hasNextPage}
+                      isFetchingNextPage={isFetchingNextPage}
+                      onClick={() => fetchNextPage()}
+                    />
+                  </>
                 )}
-              </SuspenseQuery>
+              </SuspenseInfiniteQuery>
             </Suspense>
           </ErrorBoundary>
         </div>
@@ -1,4 +1,5 @@
 import { getToken } from '@/entities/seller';
+import ApiError from '@/shared/api/api-error';
 import type { components } from '@/shared/api/schema';
 import { streamSSE } from '@/shared/api/sse-client';
 import env from '@/shared/config/env';
@@ -7,6 +8,7 @@ export type ChatRequest = components['schemas']['ChatRequest'];
 
 export interface ChatCallbacks {
   onConversationId: (id: string) => void;
+  onQueued?: (position: number) => void;
   onContent: (token: string) => void;
   onToolCall?: (toolName: string) => void;
   onToolResult?: (toolName: string) => void;
@@ -14,46 +16,103 @@ export interface ChatCallbacks {
   onError: (error: Error) => void;
 }
 
+// 답변 도중 연결이 끊기면 마지막으로 받은 이벤트 id로 같은 턴을 이어 받는다
+const MAX_RESUME_ATTEMPTS = 3;
+const RESUME_DELAY_MS = 1000;
+
+const wait = (ms: number) => new Promise((resolve) => setTimeout(resolve, ms));
+
+// SSE id는 "<스트림 ID>:<순번>" 형식이다
+const streamIdOf = (eventId: string) => eventId.slice(0, eventId.lastIndexOf(':'));
+
+const cancelStream = (streamId: string, token: string | null) => {
+  // 판매자가 멈춘 턴은 서버가 재연결을 기다리지 않고 바로 중단하도록 알린다
+  void fetch(`${env.API_BASE_URL}/api/chat/streams/${streamId}`, {
+    method: 'DELETE',
+    headers: token ? { Authorization: `Bearer ${token}` } : undefined,
+  }).catch(() => {});
+};
+
 export const streamChat = async (
   request: ChatRequest,
   callbacks: ChatCallbacks,
   signal?: AbortSignal,
 ): Promise<void> => {
-  let isDoneReceived = false;
+  let isFinished = false;
+  let lastEventId: string | undefined;
 
   const token = getToken();
-  await streamSSE({
-    url: `${env.API_BASE_URL}/api/chat`,
-    body: request,
-    signal,
-    headers: token ? { Authorization: `Bearer ${token}` } : undefined,
-    onEvent: (event) => {
-      switch (event.type) {
-        case 'conversation_id':
-          callbacks.onConversationId(event.data);
-          break;
-        case 'content':
-          callbacks.onContent(event.data);
-          break;
-        case 'tool_call':
-          callbacks.onToolCall?.(event.data);
-          break;
-        case 'tool_result':
-          callbacks.onToolResult?.(event.data);
-          break;
-        case 'error':
-          callbacks.onError(new Error(event.data));
-          break;
-        case 'done':
-          isDoneReceived = true;
-          callbacks.onDone();
-          break;
-      }
-    },
-    onError: callbacks.onError,
+  signal?.addEventListener('abort', () => {
+    if (lastEventId && !isFinished) {
+      cancelStream(streamIdOf(lastEventId), token);
+    }
   });
 
-  if (!isDoneReceived && !signal?.aborted) {
-    callbacks.onError(new Error('Stream terminated unexpectedly'));
+  for (let attempt = 0; ; attempt++) {
+    let streamError: Error | undefined;
+    const headers: Record<string, string> = {};
+    if (token) {
+      headers.Authorization = `Bearer ${token}`;
+    }
+    if (lastEventId) {
+      headers['Last-Event-ID'] = lastEventId;
+    }
+
+    await streamSSE({
+      url: `${env.API_BASE_URL}/api/chat`,
+      body: request,
+      signal,
+      headers,
+      onEvent: (event) => {
+        if (event.id) {
+          lastEventId = event.id;
+        }
+        switch (event.type) {
+          case 'conversation_id':
+            callbacks.onConversationId(event.data);
+            break;
+          case 'queued':
+            callbacks.onQueued?.(Number(event.data));
+            break;
+          case 'content':
+            callbacks.onContent(event.data);
+            break;
+          case 'tool_call':
+            callbacks.onToolCall?.(event.data);
+            break;
+          case 'tool_result':
+            callbacks.onToolResult?.(event.data);
+            break;
+          case 'error':
+            isFinished = true;
+            callbacks.onError(new Error(event.data));
+            break;
+          case 'done':
+            isFinished = true;
+            callbacks.onDone();
+            break;
+        }
+      },
+      onError: (error) => {
+        streamError = error;
+      },
+    });
+
+    if (isFinished || signal?.aborted) {
+      return;
+    }
+    // HTTP 오류(만료된 스트림, 요청 과다 등)나 이벤트를 하나도 받지 못한 요청은 이어 받지 않는다
+    const canResume =
+      lastEventId !== undefined &&
+      !(streamError instanceof ApiError) &&
+      attempt < MAX_RESUME_ATTEMPTS;
+    if (!canResume) {
+      callbacks.onError(streamError ?? new Error('Stream terminated unexpectedly'));
+      return;
+    }
+    await wait(RESUME_DELAY_MS * (attempt + 1));
+    if (signal?.aborted) {
+      return;
+    }
   }
 };
@@ -148,6 +148,11 @@ export const useChat = (options?: UseChatOptions) => {
         {
           onConversationId: (id) => {
             dispatch({ type: 'SET_CONVERSATION_ID', payload: { id } });
+            dispatch({ type: 'SET_STATUS', payload: { statusMessage: PHASE_STATUS.THINKING } });
+          },
+          onQueued: (position) => {
+            const statusMessage = `요청이 많아 대기 중이에요 (${position}번째)`;
+            dispatch({ type: 'SET_STATUS', payload: { statusMessage } });
           },
           onContent: (token) => {
             dispatch({ type: 'SET_STATUS', payload: { statusMessage: null } });
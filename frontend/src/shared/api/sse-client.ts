@@ -1,6 +1,10 @@
+import ApiError from './api-error';
+
 export interface SSEEvent {
   type: string;
   data: string;
+  // 서버가 붙인 이벤트 id. 끊긴 스트림을 이어 받을 때 Last-Event-ID로 보낸다
+  id?: string;
 }
 
 export interface SSERequestOptions {
@@ -42,7 +46,9 @@ export const streamSSE = async ({
 
   if (!response.ok) {
     const text = await response.text().catch(() => '');
-    onError(new Error(`HTTP ${response.status}: ${text || response.statusText}`));
+    onError(
+      new ApiError(response.status, text, `HTTP ${response.status}: ${text || response.statusText}`),
+    );
     return;
   }
 
@@ -70,16 +76,22 @@ export const streamSSE = async ({
       buffer = events.pop() ?? '';
 
       for (const event of events) {
-        const line = event.trim();
-        if (!line.startsWith('data: ')) {
+        let id: string | undefined;
+        let jsonStr: string | undefined;
+        for (const line of event.trim().split('\n')) {
+          if (line.startsWith('id: ')) {
+            id = line.slice('id: '.length);
+          } else if (line.startsWith('data: ')) {
+            jsonStr = line.slice('data: '.length);
+          }
+        }
+        if (jsonStr === undefined) {
           continue;
         }
 
-        const jsonStr = line.slice('data: '.length);
-
         try {
           const parsed = JSON.parse(jsonStr) as SSEEvent;
-          onEvent(parsed);
+          onEvent(id === undefined ? parsed : { ...parsed, id });
         } catch {
           // JSON 파싱 실패 시 무시
         }
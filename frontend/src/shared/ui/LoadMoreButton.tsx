@@ -0,0 +1,27 @@
+import { Button } from './Button';
+
+interface LoadMoreButtonProps {
+  hasNextPage: boolean;
+  isFetchingNextPage: boolean;
+  onClick: () => void;
+  className?: string;
+}
+
+const LoadMoreButton = ({
+  hasNextPage,
+  isFetchingNextPage,
+  onClick,
+  className,
+}: LoadMoreButtonProps) => {
+  if (!hasNextPage) {
+    return null;
+  }
+
+  return (
+    <Button variant='outline' className={className} disabled={isFetchingNextPage} onClick={onClick}>
+      {isFetchingNextPage ? '불러오는 중...' : '더 보기'}
+    </Button>
+  );
+};
+
+export default LoadMoreButton;
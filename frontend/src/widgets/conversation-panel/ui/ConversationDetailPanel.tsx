@@ -1,5 +1,7 @@
+import { useState } from 'react';
+
 import { ErrorBoundary, Suspense } from '@suspensive/react';
-import { SuspenseQuery } from '@suspensive/react-query-5';
+import { SuspenseInfiniteQuery } from '@suspensive/react-query-5';
 import { ArrowLeft } from 'lucide-react';
 
 import { MessageTimeline, messageQueries } from '@/entities/message';
@@ -10,8 +12,13 @@ interface ConversationDetailPanelProps {
 }
 
 const ConversationDetailPanel = ({ id, onBack }: ConversationDetailPanelProps) => {
+  const [scrollParent, setScrollParent] = useState<HTMLDivElement | null>(null);
+
   return (
-    <div className='flex-1 overflow-auto rounded-t-2xl bg-background p-6 shadow-sm'>
+    <div
+      ref={setScrollParent}
+      className='flex-1 overflow-auto rounded-t-2xl bg-background p-6 shadow-sm'
+    >
       <button
         className='mb-4 flex items-center gap-1 text-sm text-muted-foreground hover:text-foreground'
         onClick={onBack}
@@ -26,9 +33,20 @@ const ConversationDetailPanel = ({ id, onBack }: ConversationDetailPanelProps) =
           fallback={({ error }) => <p className='text-destructive'>{error.message}</p>}
         >
           <Suspense fallback={<MessageTimeline.Skeleton />}>
-            <SuspenseQuery {...messageQueries.list(id)}>
-              {({ data: messages }) => <MessageTimeline messages={messages} />}
-            </SuspenseQuery>
+            {scrollParent && (
+              <SuspenseInfiniteQuery {...messageQueries.list(id)}>
+                {({ data, hasNextPage, isFetchingNextPage, fetchNextPage }) => (
+                  <MessageTimeline
+                    conversationId={id}
+                    messages={data.pages.flatMap((page) => page.items)}
+                    scrollParent={scrollParent}
+                    hasNextPage={hasNextPage}
+                    isFetchingNextPage={isFetchingNextPage}
+                    onEndReached={() => fetchNextPage()}
+                  />
+                )}
+              </SuspenseInfiniteQuery>
+            )}
           </Suspense>
         </ErrorBoundary>
       </div>
@@ -1,7 +1,8 @@
 import { ErrorBoundary, Suspense } from '@suspensive/react';
-import { SuspenseQuery } from '@suspensive/react-query-5';
+import { SuspenseInfiniteQuery } from '@suspensive/react-query-5';
 
 import { ConversationTable, conversationQueries } from '@/entities/conversation';
+import LoadMoreButton from '@/shared/ui/LoadMoreButton';
 
 const ConversationListPanel = () => {
   return (
@@ -14,9 +15,19 @@ const ConversationListPanel = () => {
           fallback={({ error }) => <p className='text-destructive'>{error.message}</p>}
         >
           <Suspense fallback={<ConversationTable.Skeleton />}>
-            <SuspenseQuery {...conversationQueries.list()}>
-              {({ data: conversations }) => <ConversationTable conversations={conversations} />}
-            </SuspenseQuery>
+            <SuspenseInfiniteQuery {...conversationQueries.list()}>
+              {({ data, hasNextPage, isFetchingNextPage, fetchNextPage }) => (
+                <>
+                  <ConversationTable conversations={data.pages.flatMap((page) => page.items)} />
+                  <LoadMoreButton
+                    className='mt-4 w-full'
+                    hasNextPage={hasNextPage}
+                    isFetchingNextPage={isFetchingNextPage}
+                    onClick={() => fetchNextPage()}
+                  />
+                </>
+              )}
+            </SuspenseInfiniteQuery>
           </Suspense>
         </ErrorBoundary>
       </div>
@@ -1,9 +1,10 @@
 import { ErrorBoundary, Suspense } from '@suspensive/react';
-import { SuspenseQuery } from '@suspensive/react-query-5';
+import { SuspenseInfiniteQuery, SuspenseQuery } from '@suspensive/react-query-5';
 import { ArrowLeft } from 'lucide-react';
 
 import { ConversationTable, conversationQueries } from '@/entities/conversation';
 import { SellerInfo, sellerQueries } from '@/entities/seller';
+import LoadMoreButton from '@/shared/ui/LoadMoreButton';
 
 interface SellerDetailPanelProps {
   id: string;
@@ -31,11 +32,22 @@ const SellerDetailPanel = ({ id, onBack }: SellerDetailPanelProps) => {
         <div className='mt-8'>
           <h3 className='mb-4 text-lg font-semibold'>대화 목록</h3>
           <Suspense fallback={<ConversationTable.Skeleton />}>
-            <SuspenseQuery {...conversationQueries.list(id)}>
-              {({ data: conversations }) => (
-                <ConversationTable conversations={conversations} isSellerVisible={false} />
+            <SuspenseInfiniteQuery {...conversationQueries.list(id)}>
+              {({ data, hasNextPage, isFetchingNextPage, fetchNextPage }) => (
+                <>
+                  <ConversationTable
+                    conversations={data.pages.flatMap((page) => page.items)}
+                    isSellerVisible={false}
+                  />
+                  <LoadMoreButton
+                    className='mt-4 w-full'
+                    hasNextPage={hasNextPage}
+                    isFetchingNextPage={isFetchingNextPage}
+                    onClick={() => fetchNextPage()}
+                  />
+                </>
               )}
-            </SuspenseQuery>
+            </SuspenseInfiniteQuery>
           </Suspense>
         </div>
       </ErrorBoundary>